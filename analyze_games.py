@@ -0,0 +1,152 @@
+"""
+Batch analysis of PDN game archives.
+
+Replays every game, runs MinMaxAgent on every position and prints one JSON
+object per move (JSON lines) with the engine's best move, the score of the
+best and the played move, and a blunder flag:
+
+    python analyze_games.py archive.pdn --depth 4 --workers 8 > analysis.jsonl
+    python analyze_games.py archive.pdn --solve-nodes 20000 > analysis.jsonl   (also prove won/lost positions)
+
+Games are streamed from the archive and only a small window of them is in
+flight at any time, so archives of any size can be processed.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utility.AnalysisCache import AnalysisCache
+from utility.EvalCache import EvalCache
+from utility.MinMaxAgent import MinMaxAgent
+from utility.PDN import PDNGame, read_games, iter_games, rc_to_square
+from utility.ProofNumberSearch import ProofNumberSearch, WIN, LOSS
+
+WIN_SCORE = 10000.0 # Stand-in for +/-inf (forced wins) so the output stays valid JSON
+
+def _clamp_score(score):
+    if math.isinf(score):
+        return WIN_SCORE if score > 0 else -WIN_SCORE
+    return round(score, 2)
+
+def _format_hop(move):
+    piece_rc, target_rc, captured_piece = move
+    return PDNGame.format_turn([rc_to_square(*piece_rc), rc_to_square(*target_rc)], bool(captured_piece))
+
+def _board_after(board, hops):
+    """A copy of board with a whole turn (all its hops) played."""
+    board = board.deep_copy()
+    for piece_rc, target_rc, captured_piece in hops:
+        captured = board.get_piece_at(captured_piece.row, captured_piece.col) if captured_piece else None
+        board.move_piece(piece_rc, target_rc, captured)
+    return board
+
+_worker_cache = None
+_worker_eval_cache = None # Leaf evaluations, kept across the games a process analyzes
+
+def _init_worker(cache_path):
+    """Opens the shared persistent cache once per worker process."""
+    global _worker_cache
+    if cache_path:
+        _worker_cache = AnalysisCache(cache_path)
+
+def analyze_game(index, game, depth, blunder_threshold, solve_nodes=0):
+    """
+    Analyzes one PDNGame. Runs inside a worker process; returns a list of JSON-ready dicts.
+    With solve_nodes, a proof-number solver with that node budget settles won and lost positions.
+    """
+    global _worker_eval_cache
+    if _worker_eval_cache is None:
+        _worker_eval_cache = EvalCache(1 << 18)
+    solver = ProofNumberSearch(solve_nodes) if solve_nodes else None
+    agents = {color: MinMaxAgent(color, depth, _worker_cache, solver=solver, eval_cache=_worker_eval_cache,
+                                 solver_share=None) # Analysis gives every solve the full budget
+              for color in ('Red', 'Black')}
+    records = []
+    try:
+        for ply, (board, color, hops) in enumerate(game.replay()):
+            agent = agents[color]
+            agent.runAI(board)
+            best_score, best_move = agent.get_best_move()
+
+            # The whole played turn is scored: captures may share their first hop
+            # and end differently, and a proven win may be kept by another turn
+            # than the solver's. A single hop that is the engine's move has its score.
+            played = hops[0]
+            if best_move and len(hops) == 1 and best_move[:2] == played[:2]:
+                played_score = best_score
+            else:
+                played_score = agent.score_turn(board, hops)
+            if agent.solved == WIN and not math.isinf(played_score):
+                result, _, _ = solver.solve(_board_after(board, hops), color)
+                if result == WIN:
+                    played_score = math.inf
+                elif result == LOSS:
+                    played_score = -math.inf
+
+            best_score, played_score = _clamp_score(best_score), _clamp_score(played_score)
+            loss = max(0.0, round(best_score - played_score, 2))
+            squares = [rc_to_square(*hops[0][0])] + [rc_to_square(*target_rc) for _, target_rc, _ in hops]
+            records.append({
+                'game': index,
+                'event': game.tags.get('Event', '?'),
+                'ply': ply + 1,
+                'color': color,
+                'move': PDNGame.format_turn(squares, bool(played[2])),
+                'best_move': _format_hop(best_move) if best_move else None,
+                'best_score': best_score,
+                'played_score': played_score,
+                'loss': loss,
+                'blunder': loss >= blunder_threshold,
+                'solved': agent.solved, # 'win' / 'loss' for the side to move if proven, else None
+            })
+    except ValueError as e:
+        records.append({'game': index, 'event': game.tags.get('Event', '?'), 'error': str(e)})
+    return records
+
+def analyze_games(games, depth=4, workers=None, blunder_threshold=75.0, window=None, cache_path=None, solve_nodes=0):
+    """
+    Analyzes an iterable of PDNGame objects across a process pool, yielding the
+    per-move records in game order. At most `window` games are in flight.
+    With cache_path, all workers share a persistent AnalysisCache file.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 2
+    if cache_path:
+        AnalysisCache(cache_path).close() # Create the file once before the workers race to
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path,)) as pool:
+        pending = deque()
+        for index, game in enumerate(games):
+            pending.append(pool.submit(analyze_game, index, game, depth, blunder_threshold, solve_nodes))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze every move of every game in a PDN archive.")
+    parser.add_argument('pdn', help="PDN file to analyze ('-' for stdin)")
+    parser.add_argument('--depth', type=int, default=4, help="MinMax search depth (default: 4)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--blunder', type=float, default=75.0, help="Score loss that flags a blunder (default: 75, 1.5 men)")
+    parser.add_argument('--cache', default=None, help="Persistent analysis cache file shared by all workers and runs")
+    parser.add_argument('--solve-nodes', type=int, default=0,
+                        help="Prove wins/losses with a proof-number solver of this node budget (default: off)")
+    parser.add_argument('--output', default='-', help="JSON lines output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    games = iter_games(sys.stdin) if args.pdn == '-' else read_games(args.pdn)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for record in analyze_games(games, args.depth, args.workers, args.blunder, cache_path=args.cache, solve_nodes=args.solve_nodes):
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
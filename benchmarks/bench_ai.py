@@ -0,0 +1,184 @@
+"""
+Regression benchmark for MinMaxAgent move latency.
+
+Runs runAI on a fixed corpus of opening, middlegame and endgame positions at
+several depths and configurations and reports, per case, the median
+time-to-move over repeated runs (after warm-up), the nodes searched, nodes
+per second and the peak memory allocated during one search:
+
+    python -m benchmarks.bench_ai                                 (compare with the baseline)
+    python -m benchmarks.bench_ai --save-baseline                 (record a new baseline)
+    python -m benchmarks.bench_ai --depths 3 4 --configs plain
+    python -m benchmarks.bench_ai --configs plain nnue             (hand-written vs neural evaluation; needs
+                                                                    weights trained by train_evaluator.py)
+    python -m benchmarks.bench_ai --configs tt evalcache           (with and without the leaf evaluation cache)
+
+Results are compared against benchmarks/baseline_ai.json; the command exits
+with status 1 if any case is slower (or searches more nodes, or allocates
+more) than the baseline by more than --threshold. Timings depend on the
+machine, so record the baseline on the machine the comparison runs on.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from utility.AnalysisCache import MemoryCache
+from utility.EvalCache import EvalCache
+from utility.Board import Board
+from utility.MinMaxAgent import MinMaxAgent
+from utility.GameController import game_agent
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline_ai.json')
+
+# (name, phase, FEN); fixed so results stay comparable between engine versions
+CORPUS = [
+    ('start', 'opening', 'R:R1-12:B21-32'),
+    ('opening-6', 'opening', 'R:R1,2,3,4,5,6,7,10,11,12,13,16:B19,20,21,22,23,25,26,27,29,30,31,32'),
+    ('opening-12', 'opening', 'R:R1,2,3,4,6,9,10,11,12,13,14,16:B18,19,20,21,22,23,24,26,29,30,31,32'),
+    ('middle-24', 'middlegame', 'B:R2,5,6,7,10,12,13,14,17:BK4,15,19,21,23,24,25,26,27,29,31'),
+    ('middle-36', 'middlegame', 'R:R2,6,9,10,13,14,17,K32:BK3,8,18,21,23,26,27,29,31'),
+    ('middle-50', 'middlegame', 'R:R2,6,9,10,13,14,17,K28:BK8,K16,18,21,23,26,27,29,31'),
+    ('kings-3v2', 'endgame', 'R:RK7,K14,K23:BK4,K29'),
+    ('kings-man', 'endgame', 'R:RK2,K3,8:BK27'),
+    ('men-race', 'endgame', 'B:RK10,11,12:BK21,24'),
+]
+
+def _neural_agent(color, depth):
+    from utility.NeuralEvaluator import NeuralEvaluator # Needs numpy; only loaded when asked for
+    global _neural_evaluator
+    if _neural_evaluator is None:
+        _neural_evaluator = NeuralEvaluator.load()
+    return MinMaxAgent(color, depth, evaluator=_neural_evaluator)
+
+_neural_evaluator = None
+
+# Agent configurations: name -> function(color, depth) returning a fresh agent
+CONFIGS = {
+    'plain': lambda color, depth: MinMaxAgent(color, depth),
+    'tt': lambda color, depth: MinMaxAgent(color, depth, MemoryCache()),
+    'evalcache': lambda color, depth: MinMaxAgent(color, depth, MemoryCache(), eval_cache=EvalCache()),
+    'nnue': _neural_agent, # Not in the default runs (see --configs)
+    'game': lambda color, depth: game_agent(color, depth), # As GameController plays (endgame solver included)
+}
+DEFAULT_CONFIGS = ['plain', 'tt']
+
+def run_case(fen, config, depth, repeat, warmup):
+    """Benchmarks one (position, config, depth). Returns a JSON-ready dict."""
+    board = Board.from_fen(fen)
+    make_agent = CONFIGS[config]
+
+    # Every run gets a fresh agent (and cache), so runs are independent; the
+    # collector is paused while timing so a stray collection does not land in one run
+    times = []
+    nodes = None
+    for i in range(warmup + repeat):
+        agent = make_agent(board.current_turn, depth)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            agent.runAI(board)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if i >= warmup:
+            times.append(elapsed)
+        nodes = agent.nodes
+
+    # Peak memory in a separate run: tracemalloc slows the search down
+    agent = make_agent(board.current_turn, depth)
+    tracemalloc.start()
+    agent.runAI(board)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        'median_ms': round(median * 1000, 3),
+        'min_ms': round(min(times) * 1000, 3),
+        'nodes': nodes,
+        'nps': round(nodes / median) if median else None,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+def run_suite(depths, configs, repeat, warmup, positions=None):
+    """Returns {'config/depth/position': result} for the whole matrix."""
+    results = {}
+    for config in configs:
+        for depth in depths:
+            for name, phase, fen in CORPUS:
+                if positions and name not in positions:
+                    continue
+                key = f"{config}/d{depth}/{name}"
+                results[key] = dict(run_case(fen, config, depth, repeat, warmup), phase=phase)
+                r = results[key]
+                print(f"{key:<28}{r['median_ms']:>11.2f}{r['nodes']:>10}{r['nps']:>10}{r['peak_kb']:>11.1f}", flush=True)
+    return results
+
+def compare(results, baseline, threshold, min_delta_ms=2.0):
+    """
+    Returns a list of regression messages (empty if none). Node counts are
+    deterministic and compared strictly; a time regression must also exceed
+    min_delta_ms, since a few milliseconds of jitter is relatively large for
+    the shallow cases.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for field in ('median_ms', 'nodes', 'peak_kb'):
+            old, new = base.get(field), result.get(field)
+            if field == 'median_ms' and new is not None and old is not None and new - old < min_delta_ms:
+                continue
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append(f"{key}: {field} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MinMaxAgent latency regression benchmark.")
+    parser.add_argument('--depths', type=int, nargs='+', default=[3, 4, 5])
+    parser.add_argument('--configs', nargs='+', default=DEFAULT_CONFIGS, choices=list(CONFIGS))
+    parser.add_argument('--positions', nargs='+', help="Only these corpus positions (by name)")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case (median is reported)")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed runs per case")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Allowed slowdown before failing (0.15 = 15%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help="Ignore time regressions smaller than this")
+    parser.add_argument('--output', help="Also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<28}{'median ms':>11}{'nodes':>10}{'nps':>10}{'peak KiB':>11}")
+    results = run_suite(args.depths, args.configs, args.repeat, args.warmup, args.positions)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for message in regressions:
+            print("  " + message)
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Compares the compact Board encodings against pickling the Piece object graph.
+
+    python -m benchmarks.bench_serialization
+"""
+import pickle
+import timeit
+
+from utility.Board import Board
+from utility.GameController import GameController
+
+def _object_graph_pickle(board):
+    # What pickle produced before Board.__reduce__: the full Piece grid and attributes
+    return pickle.dumps(board.__dict__, pickle.HIGHEST_PROTOCOL)
+
+def main(number=20000):
+    controller = GameController('AIvAI', ai_depth=1)
+    controller.run_game(max_plies=30) # A middlegame position with some kings/captures
+    board = controller.board
+
+    graph = _object_graph_pickle(board)
+    fen = board.to_fen()
+    cases = [
+        ("pickle object graph", len(graph),
+         lambda: pickle.loads(_object_graph_pickle(board))),
+        ("pickle Board (compact)", len(pickle.dumps(board, pickle.HIGHEST_PROTOCOL)),
+         lambda: pickle.loads(pickle.dumps(board, pickle.HIGHEST_PROTOCOL))),
+        ("to_bytes/from_bytes", len(board.to_bytes()),
+         lambda: Board.from_bytes(board.to_bytes())),
+        ("to_fen/from_fen", len(fen),
+         lambda: Board.from_fen(board.to_fen())),
+        ("deep_copy", None,
+         lambda: board.deep_copy()),
+    ]
+
+    print(f"Position: {fen}")
+    print(f"{'method':<26}{'bytes':>8}{'us/round trip':>16}")
+    for name, size, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"{name:<26}{size if size is not None else '-':>8}{seconds / number * 1e6:>16.2f}")
+
+if __name__ == "__main__":
+    main()
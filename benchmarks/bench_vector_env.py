@@ -0,0 +1,50 @@
+"""
+Self-play throughput of the batched VectorEnv against stepping Board objects.
+
+    python -m benchmarks.bench_vector_env --envs 4096 --steps 200
+"""
+import argparse
+import random
+import time
+
+from utility.Board import Board
+from utility.VectorEnv import VectorEnv
+
+def bench_vector_env(envs, steps):
+    env = VectorEnv(envs, seed=0)
+    env.step(env.random_actions()) # Warm up
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(env.random_actions())
+    return envs * steps / (time.perf_counter() - start)
+
+def bench_board(seconds=2.0):
+    rng = random.Random(0)
+    board, positions, jumping = Board(), 0, None
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        moves = board.get_all_legal_moves(board.current_turn)
+        if jumping is not None: # Same rules as VectorEnv: only the jumping piece continues
+            moves = [move for move in moves if move[0] == jumping]
+        if not moves:
+            board, jumping = Board(), None
+            continue
+        move = rng.choice(moves)
+        jumping = move[1] if board.move_piece(*move)[0] else None
+        positions += 1
+    return positions / (time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Random self-play positions per second.")
+    parser.add_argument('--envs', type=int, default=4096)
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    board_rate = bench_board()
+    vector_rate = bench_vector_env(args.envs, args.steps)
+    print(f"{'engine':<24}{'positions/s':>14}{'positions/hour':>18}")
+    print(f"{'Board (one game)':<24}{board_rate:>14,.0f}{board_rate * 3600:>18,.0f}")
+    print(f"{f'VectorEnv ({args.envs})':<24}{vector_rate:>14,.0f}{vector_rate * 3600:>18,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Host calibration for node-budgeted AI searches.
+
+Measures how many nodes per second MinMaxAgent searches on this machine, on
+the benchmark corpus (see bench_ai.py) with a fixed node budget per search,
+and turns that into node budgets that fit per-move latency targets:
+
+    python -m benchmarks.calibrate                                 (default SLOs: 100, 250, 1000 ms)
+    python -m benchmarks.calibrate --slo-ms 50 200 --configs evalcache
+    python -m benchmarks.calibrate --output calibration.json        (for the scheduler)
+
+A node budget gives the same moves on every host (see MinMaxAgent
+node_budget); only the time it takes differs. The suggested budget for an
+SLO uses the slowest positions' rate (--percentile), minus --headroom for
+load and noise, so most moves on this host finish within the target. One
+search runs on one core: hosts that run several searches at once should be
+calibrated under that load.
+
+Calibrate the agent configuration that is deployed: the default 'game' is
+the agent GameController plays with, including its endgame solver (whose
+nodes count against the budget and are slower than search nodes); the
+server's agents have no solver and match 'evalcache'.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.bench_ai import CONFIGS, CORPUS
+from utility.Board import Board
+
+CEILING_DEPTH = 30 # Depth ceiling of the calibration searches; the node budget ends them first
+
+def measure(fen, config, nodes, repeat, warmup):
+    """
+    Runs budgeted searches of one position. Returns (median seconds, nodes
+    searched); the node count is the same in every run.
+    """
+    board = Board.from_fen(fen)
+    times = []
+    searched = None
+    for i in range(warmup + repeat):
+        agent = CONFIGS[config](board.current_turn, CEILING_DEPTH)
+        agent.node_budget = nodes
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            agent.runAI(board)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if i >= warmup:
+            times.append(elapsed)
+        searched = agent.nodes
+    return statistics.median(times), searched
+
+def suggest_budget(nps, slo_ms, headroom):
+    """Node budget that takes (1 - headroom) of slo_ms at nps, rounded down to two significant digits."""
+    budget = int(nps * slo_ms / 1000 * (1 - headroom))
+    if budget < 100:
+        return max(budget, 1)
+    scale = 10 ** (len(str(budget)) - 2)
+    return budget // scale * scale
+
+def host_info():
+    return {
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'measured': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def calibrate(configs, nodes, repeat, warmup, slos, percentile, headroom, log=print):
+    """Returns a JSON-ready dict: host info and, per config, rates per position and budgets per SLO."""
+    report = {'host': host_info(), 'nodes_per_search': nodes, 'configs': {}}
+    for config in configs:
+        rates = {}
+        for name, _, fen in CORPUS:
+            seconds, searched = measure(fen, config, nodes, repeat, warmup)
+            rates[name] = round(searched / seconds)
+            if log:
+                log(f"{config + '/' + name:<20}{searched:>9}{seconds * 1000:>11.1f}{rates[name]:>10}")
+        ordered = sorted(rates.values())
+        slow = ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+        report['configs'][config] = {
+            'nps': rates,
+            'nps_median': round(statistics.median(ordered)),
+            'nps_slow': slow,
+            'budgets': {f'{slo:g}': suggest_budget(slow, slo, headroom) for slo in slos},
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure AI nodes per second on this host and suggest node budgets.")
+    parser.add_argument('--configs', nargs='+', default=['game'], choices=list(CONFIGS))
+    parser.add_argument('--nodes', type=int, default=20_000, help="Node budget of each measured search")
+    parser.add_argument('--slo-ms', type=float, nargs='+', default=[100, 250, 1000], help="Per-move latency targets")
+    parser.add_argument('--percentile', type=float, default=0.1,
+                        help="Rate percentile the budgets are based on (0.1 = slowest 10%% of positions)")
+    parser.add_argument('--headroom', type=float, default=0.2, help="Fraction of each SLO kept in reserve")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per position (median is used)")
+    parser.add_argument('--warmup', type=int, default=1, help="Untimed runs per position")
+    parser.add_argument('--output', help="Also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print(f"{'position':<20}{'nodes':>9}{'median ms':>11}{'nps':>10}")
+    report = calibrate(args.configs, args.nodes, args.repeat, args.warmup, args.slo_ms,
+                       args.percentile, args.headroom)
+    for config, result in report['configs'].items():
+        budgets = ", ".join(f"{slo} ms: {budget}" for slo, budget in result['budgets'].items())
+        print(f"\n{config}: {result['nps_median']} nodes/s median, {result['nps_slow']} on slow positions")
+        print(f"  node budgets per move ({args.headroom:.0%} headroom) -> {budgets}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# checkers/conftest.py
+# Lets the tests import the game packages (utility, server, ...) from the repository root.
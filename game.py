@@ -1,3 +1,6 @@
+import argparse
+import os
+
 import pygame
 
 from scenes.Scene import Scene
@@ -5,6 +8,7 @@ from scenes.Scene import Scene
 from scenes.GameScene import GameScene
 from scenes.GameOverScene import GameOverScene
 from scenes.MainMenuScene import MainMenuScene
+from utility.Profiler import profiler
 
 
 class GameStateManager:
@@ -13,54 +17,101 @@ class GameStateManager:
     def set_scene(self, new_scene):
         self.current_scene = new_scene
 
-pygame.init()
-screen_width = 800
-screen_height = 650
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Checkers4All!")
-
-# Initialize scenes
-main_menu_scene = MainMenuScene(screen)
-game_scene = GameScene(screen)
-game_over_scene = GameOverScene(screen)
-game_state_manager = GameStateManager(main_menu_scene)
-
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        
-        # Let the current scene handle the event and check for a scene change signal
-        scene_signal = game_state_manager.current_scene.handle_event(event)
-
-        if scene_signal == 'main_menu':
-            # Switch to main menu
-            game_state_manager.set_scene(main_menu_scene)
-        
-        # New signals from MainMenuScene
-        elif scene_signal == 'start_pvp':
-            # Start a new GameScene in PvP mode
-            new_game_scene = GameScene(screen, mode='PvP')
-            game_state_manager.set_scene(new_game_scene)
-            
-        elif scene_signal == 'start_pvai':
-            # Start a new GameScene in PvAI mode
-            new_game_scene = GameScene(screen, mode='PvAI')
-            game_state_manager.set_scene(new_game_scene)
-        elif scene_signal == 'game_over':
-            winner_message = game_state_manager.current_scene.status_message
-            game_over_scene = GameOverScene(screen, winner_message)
-            game_state_manager.set_scene(game_over_scene)
-
-        # Handle scene switching with SPACE key (original logic)
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                if isinstance(game_state_manager.current_scene, GameOverScene):
+# Frame pacing: cap active frames at FPS, and block on the event queue while the
+# current scene is idle (waiting for input) so the loop does not spin a core.
+FPS = 60
+IDLE_WAIT_MS = 1000 # Wake up at least this often even if no events arrive
+
+def main(argv=None):
+    """Creates the window and runs the scene loop. Nothing touches the display at import time."""
+    parser = argparse.ArgumentParser(description="Checkers4All!")
+    parser.add_argument('--profile', metavar='DIR', help="Record frame and AI timings to DIR (see utility/Profiler.py)")
+    parser.add_argument('--sample-ms', type=float, help="Also sample the AI search every N ms (flame graph stacks)")
+    parser.add_argument('--ai-nodes', type=int, default=os.environ.get('CHECKERS_AI_NODES'),
+                        help="Node budget per AI move instead of a fixed depth, for the same AI strength "
+                             "on any machine (or set CHECKERS_AI_NODES; see benchmarks/calibrate.py)")
+    args = parser.parse_args(argv)
+    if args.profile or args.sample_ms:
+        profiler.configure(args.profile, sample_interval_ms=args.sample_ms)
+
+    pygame.init()
+    screen_width = 800
+    screen_height = 650
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Checkers4All!")
+
+    clock = pygame.time.Clock()
+
+    # Initialize scenes
+    main_menu_scene = MainMenuScene(screen)
+    game_scene = GameScene(screen, ai_nodes=args.ai_nodes)
+    game_over_scene = GameOverScene(screen)
+    game_state_manager = GameStateManager(main_menu_scene)
+
+    running = True
+    last_scene = None
+    while running:
+        with profiler.section('wait'):
+            if game_state_manager.current_scene.is_idle():
+                first_event = pygame.event.wait(IDLE_WAIT_MS)
+                events = [first_event] if first_event.type != pygame.NOEVENT else []
+                events += pygame.event.get()
+            else:
+                events = pygame.event.get()
+
+        with profiler.section('event'):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    running = False
+
+                # Let the current scene handle the event and check for a scene change signal
+                scene_signal = game_state_manager.current_scene.handle_event(event)
+
+                if scene_signal == 'main_menu':
+                    # Switch to main menu
                     game_state_manager.set_scene(main_menu_scene)
 
-    game_state_manager.current_scene.update()
-    game_state_manager.current_scene.draw()
-    pygame.display.flip()
+                # New signals from MainMenuScene
+                elif scene_signal == 'start_pvp':
+                    # Start a new GameScene in PvP mode
+                    new_game_scene = GameScene(screen, mode='PvP', ai_nodes=args.ai_nodes)
+                    game_state_manager.set_scene(new_game_scene)
+
+                elif scene_signal == 'start_pvai':
+                    # Start a new GameScene in PvAI mode
+                    new_game_scene = GameScene(screen, mode='PvAI', ai_nodes=args.ai_nodes)
+                    game_state_manager.set_scene(new_game_scene)
+                elif scene_signal == 'game_over':
+                    winner_message = game_state_manager.current_scene.status_message
+                    game_over_scene = GameOverScene(screen, winner_message)
+                    game_state_manager.set_scene(game_over_scene)
+
+                # Handle scene switching with SPACE key (original logic)
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        if isinstance(game_state_manager.current_scene, GameOverScene):
+                            game_state_manager.set_scene(main_menu_scene)
+
+        current_scene = game_state_manager.current_scene
+        if current_scene is not last_scene:
+            # Scenes share the screen surface, so a new scene must repaint everything once
+            current_scene.invalidate()
+            last_scene = current_scene
+
+        with profiler.section('update'):
+            current_scene.update()
+        with profiler.section('draw'):
+            dirty_rects = current_scene.draw()
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+        profiler.end_frame(scene=type(current_scene).__name__, events=len(events))
+
+        clock.tick(FPS)
+
+    pygame.quit()
+    profiler.close()
 
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import pygame
+
+ASSET_DIRECTORY = os.path.join('assets', 'images')
+
+class AssetManager:
+    """
+    Process-wide cache of images and fonts shared by all scenes.
+
+    Images are loaded and converted once per file and scaled once per
+    requested size, so a new GameScene (or a different window size) only pays
+    for a transform it has not done before. Fonts are created once per
+    (name, size); scenes must not create pygame.font.Font objects per frame.
+    Everything is loaded lazily on first use (after the display exists, which
+    convert_alpha() needs) or up front with preload().
+    """
+
+    def __init__(self, directory=ASSET_DIRECTORY):
+        self.directory = directory
+        self._originals = {} # file name -> converted Surface at its native size
+        self._scaled = {}    # (file name, (w, h)) -> scaled Surface
+        self._fonts = {}     # (font name, size) -> Font
+        self._texts = {}     # (font name, size, text, color) -> rendered static text
+
+    def __repr__(self):
+        return (f"AssetManager({self.directory!r}, {len(self._originals)} images, "
+                f"{len(self._scaled)} scaled, {len(self._fonts)} fonts)")
+
+    def image(self, name, size=None):
+        """
+        Returns the image `name` (relative to the asset directory), scaled to
+        size=(w, h) if given. Raises pygame.error (like pygame.image.load) if
+        the file cannot be loaded.
+        """
+        original = self._originals.get(name)
+        if original is None:
+            original = pygame.image.load(os.path.join(self.directory, name)).convert_alpha()
+            self._originals[name] = original
+        if size is None or tuple(size) == original.get_size():
+            return original
+
+        key = (name, tuple(size))
+        scaled = self._scaled.get(key)
+        if scaled is None:
+            scaled = self._scaled[key] = pygame.transform.scale(original, key[1])
+        return scaled
+
+    def font(self, size, name=None):
+        """A shared Font (name None = pygame's default font)."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def text(self, text, size, color, name=None, antialias=True):
+        """A rendered static label, cached by text, font and color (for text that never changes)."""
+        key = (name, size, text, tuple(color), antialias)
+        surface = self._texts.get(key)
+        if surface is None:
+            surface = self._texts[key] = self.font(size, name).render(text, antialias, color)
+        return surface
+
+    def preload(self, images=(), fonts=()):
+        """
+        Loads assets ahead of time, e.g. at startup so the first scene switch is instant.
+
+        Args:
+            images: Iterable of (name, size or None).
+            fonts: Iterable of font sizes (default font).
+        Returns: List of image names that failed to load.
+        """
+        failed = []
+        for name, size in images:
+            try:
+                self.image(name, size)
+            except pygame.error:
+                failed.append(name)
+        for size in fonts:
+            self.font(size)
+        return failed
+
+    def clear(self):
+        """Drops every cached surface and font (e.g. after the display is re-created)."""
+        self._originals.clear()
+        self._scaled.clear()
+        self._fonts.clear()
+        self._texts.clear()
+
+# Shared by every scene in the process
+assets = AssetManager()
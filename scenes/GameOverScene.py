@@ -1,20 +1,21 @@
 import pygame
 from .Scene import Scene
+from .Assets import assets
 
 class GameOverScene(Scene):
     def __init__(self, screen, winner_message="No winner"):
         super().__init__(screen)
         self.winner_message = winner_message
-        self.font = pygame.font.Font(None, 74)
+        # The texts never change, so they are rendered once (fonts are shared, see Assets)
+        self.font = assets.font(74)
+        self.text = self.font.render(self.winner_message, True, (0, 0, 0))
+        self.text_rect = self.text.get_rect(center=self.screen.get_rect().center)
+        self.instruction_text = assets.text("Press SPACE to return to Main Menu", 36, (0, 0, 0))
+        self.instruction_rect = self.instruction_text.get_rect(center=(self.screen.get_rect().centerx, self.screen.get_rect().centery + 100))
+
     def draw(self):
         self.screen.fill((128, 128, 192))
-        font = pygame.font.Font(None, 74)
-        text = self.font.render(self.winner_message, True, (0, 0, 0))
-        text_rect = text.get_rect(center=self.screen.get_rect().center)
-        self.screen.blit(text, text_rect)
+        self.screen.blit(self.text, self.text_rect)
         
         # Instruction for the user
-        small_font = pygame.font.Font(None, 36)
-        instruction_text = small_font.render("Press SPACE to return to Main Menu", True, (0, 0, 0))
-        instruction_rect = instruction_text.get_rect(center=(self.screen.get_rect().centerx, self.screen.get_rect().centery + 100))
-        self.screen.blit(instruction_text, instruction_rect)
\ No newline at end of file
+        self.screen.blit(self.instruction_text, self.instruction_rect)
@@ -2,37 +2,43 @@
 import pygame
 import math, random, copy # math/random might not be needed if Board and AI are separated
 import sys
+import os, time
 
 from .Scene import Scene
-from utility.Board import Board # Assuming Board class is implemented in ..game.board
-from utility.MinMaxAgent import MinMaxAgent # Assuming MinMax algorithm is implemented in ..ai.minmax
-from utility.Timer import Timer # Assuming Timer is available (or utility.Timer from original)
+from utility.GameController import GameController # Headless board/AI/timer state
+from utility.PDN import PDNGame, rc_to_square, write_games
+from utility.AnalysisCache import AnalysisCache
+from .TextCache import CachedText
+from .Assets import assets
+
+SAVE_DIRECTORY = 'saved_games' # Where the S key writes PDN game records
+AI_DEPTH = 5          # Search depth of the AI
+BUDGET_MAX_DEPTH = 10 # Depth ceiling of the AI when it plays with a node budget instead
 
 class GameScene(Scene):
-    def __init__(self, screen, mode='PvP'):
+    def __init__(self, screen, mode='PvP', ai_nodes=None):
         super().__init__(screen)
         self.mode = mode
-        self.board_manager = Board() # Instantiate the Board Model
-        self.AITimer = Timer(500) # 500ms delay for AI
+        # Board Model, AI agent and AI delay timer (the AI optionally remembers
+        # results across sessions, see CHECKERS_ANALYSIS_CACHE). With ai_nodes
+        # the AI searches a fixed number of positions per move (game.py --ai-nodes)
+        self.controller = GameController(mode, BUDGET_MAX_DEPTH if ai_nodes else AI_DEPTH,
+                                         cache=AnalysisCache.from_environment(), ai_nodes=ai_nodes)
+        self.board_manager = self.controller.board
         print(f"Starting GameScene in {self.mode} mode.")
 
         # --- Image Loading (View) ---
+        # Loaded, converted and scaled once per process (see Assets), so
+        # starting another game does not touch the disk again.
         try:
-            self.board_image = pygame.image.load('assets/images/board.jpg').convert_alpha()
-            self.board_image = pygame.transform.scale(self.board_image, (560, 560))
-
-            self.red_piece_image = pygame.image.load('assets/images/red.png').convert_alpha()
-            self.black_piece_image = pygame.image.load('assets/images/black.png').convert_alpha()
+            self.board_image = assets.image('board.jpg', (560, 560))
 
-            self.red_king_image = pygame.image.load('assets/images/redKing.png').convert_alpha()
-            self.black_king_image = pygame.image.load('assets/images/blackKing.png').convert_alpha()
-            
             # Scale pieces to fit the squares
-            piece_size = 60
-            self.red_piece_image = pygame.transform.scale(self.red_piece_image, (piece_size, piece_size))
-            self.black_piece_image = pygame.transform.scale(self.black_piece_image, (piece_size, piece_size))
-            self.red_king_image = pygame.transform.scale(self.red_king_image, (piece_size, piece_size))
-            self.black_king_image = pygame.transform.scale(self.black_king_image, (piece_size, piece_size))
+            piece_size = (60, 60)
+            self.red_piece_image = assets.image('red.png', piece_size)
+            self.black_piece_image = assets.image('black.png', piece_size)
+            self.red_king_image = assets.image('redKing.png', piece_size)
+            self.black_king_image = assets.image('blackKing.png', piece_size)
 
             self.images_loaded = True
         except pygame.error as e:
@@ -48,10 +54,12 @@ class GameScene(Scene):
 
         self.MOVE_HIGHLIGHT = (0, 255, 0, 100) # Green transparent for valid moves
         self.SELECTION_HIGHLIGHT = (0, 0, 255) # Blue for selected piece
+        self.HINT_HIGHLIGHT = (255, 215, 0)    # Gold border for the hinted move
+        self.BACKGROUND_COLOR = (128, 128, 192)
 
         # Back Button Setup
         self.button_rect = pygame.Rect(10, 10, 120, 40)
-        self.font = pygame.font.Font(None, 36)
+        self.font = assets.font(36)
         self.button_text = self.font.render("<< Back", True, (255, 255, 255))
         self.text_rect = self.button_text.get_rect(center=self.button_rect.center)
         
@@ -60,13 +68,45 @@ class GameScene(Scene):
         self.valid_moves = {}      # Maps valid move (row, col) to captured piece (or None)
         
         # Text/UI
-        self.big_font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 28)
-        self.status_message = f"It's {self.board_manager.current_turn}'s turn. Select a piece."
-        self.game_over = False
+        self.big_font = assets.font(48)
+        self.small_font = assets.font(28)
 
-        #AI
-        self.ai_agent = MinMaxAgent("Black", 5)
+        # --- Taken Pieces Counter Layout ---
+        self.CIRCLE_RADIUS = 25
+        padding = 70
+        self.counter_x_start = self.OFFSET_X + self.BOARD_SIZE + 10
+        self.counter_y_start = self.OFFSET_Y + self.BOARD_SIZE // 2 - 100
+        self.red_center = (self.counter_x_start + self.CIRCLE_RADIUS, self.counter_y_start + padding)
+        self.black_center = (self.counter_x_start + self.CIRCLE_RADIUS, self.counter_y_start + padding + 2 * self.CIRCLE_RADIUS + 10)
+
+        # --- Rendering Cache ---
+        # Static parts of the screen are composed once; dynamic text is only
+        # re-rendered when its value changes; squares are repainted when dirty.
+        self.background = self._build_background()
+        self.move_highlight = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
+        pygame.draw.circle(self.move_highlight, self.MOVE_HIGHLIGHT, (self.SQUARE_SIZE // 2, self.SQUARE_SIZE // 2), self.SQUARE_SIZE // 4)
+        self.texts = {
+            'turn': CachedText(self.big_font),
+            'status': CachedText(self.small_font, (0, 0, 0)),
+            'red_count': CachedText(self.big_font, (255, 255, 255)),
+            'black_count': CachedText(self.big_font, (255, 255, 255)),
+        }
+        self._square_cache = {} # (r, c) -> last drawn _square_state
+        self._text_rects = {}   # slot -> rect the text was last blitted at
+        self._shown_hint = None # Last controller.hint reflected in the status line
+
+    # --- Game State (delegated to the controller) ---
+    @property
+    def status_message(self):
+        return self.controller.status_message
+
+    @status_message.setter
+    def status_message(self, value):
+        self.controller.status_message = value
+
+    @property
+    def game_over(self):
+        return self.controller.game_over
 
     # --- Coordinate Conversion (Stays here as it's screen-dependent) ---
     def _get_board_coords(self, pos):
@@ -89,52 +129,17 @@ class GameScene(Scene):
         center_y = self.OFFSET_Y + (row * self.SQUARE_SIZE) + (self.SQUARE_SIZE // 2)
         return center_x, center_y
 
-    # --- AI Control (Controller) ---
-    def finalize_ai_move(self):
-        """Executes the MinMax algorithm for the AI (Black) turn."""
-        if self.board_manager.current_turn == "Black" and not self.game_over:
-            depth = 5 
-            # Pass the board's internal state (2D list of Pieces) to the MinMax algorithm
-            # The minmax function should return (best_val, (piece_rc, target_rc, captured_piece))
-            best_val, best_move = self.ai_agent.get_best_move()
-
-            print(f"AI Best Move Value: {best_val}")
-            
-            if best_move:
-                piece_rc, target_rc, captured_piece = best_move
-                
-                # Execute the move on the board manager
-                must_multijump, status_msg = self.board_manager.move_piece(piece_rc, target_rc, captured_piece)
-                self.status_message = status_msg
-                
-                # Check for mandatory multi-jump (which is handled slightly differently for AI)
-                if must_multijump:
-                    # In a fully autonomous AI, a forced multi-jump is just another move
-                    # The minmax function should ideally handle multi-jumps recursively
-                    # For simplicity, we assume the initial minmax call returns the *first* move 
-                    # of a potential multi-jump chain, and the next 'update' cycle will call runAI again.
-                    # Or, the minmax function is structured to return the entire best chain.
-                    # Given the original code's structure, we'll re-run AI on the next update loop 
-                    # if a multi-jump is mandatory. The board_manager's move_piece should 
-                    # NOT switch the turn if a multi-jump is mandatory.
-
-                    # Re-check the game state after the move
-                    msg, is_over = self.board_manager.get_game_state()
-                    if is_over:
-                        self.game_over = True
-                        self.status_message = msg
-                else:
-                    # End of turn
-                    self.board_manager.current_turn = self.board_manager.current_turn
-                    msg, is_over = self.board_manager.get_game_state()
-                    if is_over:
-                        self.game_over = True
-                        self.status_message = msg
-                    elif not self.status_message.endswith("Kinged!"): # Preserve kinging message
-                        self.status_message = f"It's {self.board_manager.current_turn}'s turn."
-            else:
-                self.status_message = "uh oh! no valid AI moves :()"
-                self.board_manager.get_game_state() # Will set game_over
+    # --- Game Records ---
+    def save_game(self, directory=SAVE_DIRECTORY):
+        """Writes the game so far as a PDN file named after the current time."""
+        os.makedirs(directory, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(directory, f"game-{timestamp}.pdn")
+        record = self.controller.to_pdn(Date=time.strftime("%Y.%m.%d"))
+        write_games(path, [record], mode='w')
+        self.status_message = f"Game saved to {path}"
+        print(f"Saved game record to {path}")
+        return path
 
     # --- Event Handling (Controller) ---
     def handle_event(self, event):
@@ -143,9 +148,33 @@ class GameScene(Scene):
             if self.button_rect.collidepoint(event.pos):
                 return 'main_menu'
 
+        # Save the game record (S key), also allowed once the game is over
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+            self.save_game()
+            return None
+
+        # Take back / replay whole turns (Ctrl+Z, Ctrl+Y or Ctrl+Shift+Z)
+        if event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+            redo = event.key == pygame.K_y or (event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT)
+            if redo or event.key == pygame.K_z:
+                changed = self.controller.redo() if redo else self.controller.undo()
+                if changed:
+                    self.selected_piece = None
+                    self.valid_moves = {}
+                else:
+                    self.status_message = "Nothing to redo." if redo else "Nothing to undo."
+                return None
+
         if self.game_over:
             return 'game_over' # Ignore clicks if game is over or it's the AI's turn
 
+        # Hint for the human to move (H key), searched in the background
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+            if not self.controller.is_ai_turn():
+                self.controller.start_hint()
+                self.status_message = "Looking for a hint..."
+            return None
+
         # 2. Handle game board click (Human turn)
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             r, c = self._get_board_coords(event.pos)
@@ -160,9 +189,8 @@ class GameScene(Scene):
                         piece_rc = self.selected_piece
                         captured_piece = self.valid_moves[target_rc]
                         
-                        # Delegate movement to the Board Model
-                        must_multijump, status_msg = self.board_manager.move_piece(piece_rc, target_rc, captured_piece)
-                        self.status_message = status_msg
+                        # Delegate movement (and game over detection) to the controller
+                        must_multijump = self.controller.play_move(piece_rc, target_rc, captured_piece)
                         
                         if must_multijump:
                             # Re-select the piece and calculate new jumps
@@ -173,13 +201,6 @@ class GameScene(Scene):
                             # End of player's turn
                             self.selected_piece = None
                             self.valid_moves = {}
-                            self.board_manager.current_turn = self.board_manager.current_turn
-                        
-                        # Check for game over
-                        msg, is_over = self.board_manager.get_game_state()
-                        if is_over:
-                            self.game_over = True
-                            self.status_message = msg
 
                     # Clicked the selected piece again to deselect
                     elif target_rc == self.selected_piece:
@@ -192,7 +213,9 @@ class GameScene(Scene):
                         self.selected_piece = target_rc
                         self.valid_moves = self.board_manager.get_valid_moves(clicked_piece)
                         
-                        if not self.valid_moves:
+                        if not self.valid_moves and self.board_manager.must_capture(self.board_manager.current_turn):
+                            self.status_message = f"{self.board_manager.current_turn} must jump with another piece!"
+                        elif not self.valid_moves:
                             self.status_message = f"{self.board_manager.current_turn}'s piece at ({r},{c}) has no moves."
                         elif any(self.valid_moves.values()): # Check if any move is a jump
                             self.status_message = f"{self.board_manager.current_turn} must jump!"
@@ -206,7 +229,9 @@ class GameScene(Scene):
                         self.valid_moves = self.board_manager.get_valid_moves(clicked_piece)
                         
                         # Check for mandatory jump
-                        if not self.valid_moves:
+                        if not self.valid_moves and self.board_manager.must_capture(self.board_manager.current_turn):
+                            self.status_message = f"{self.board_manager.current_turn} must jump with another piece!"
+                        elif not self.valid_moves:
                             self.status_message = f"{self.board_manager.current_turn}'s piece at ({r},{c}) has no moves."
                         elif any(self.valid_moves.values()): # Check if any move is a jump
                             self.status_message = f"{self.board_manager.current_turn} must jump!"
@@ -215,134 +240,181 @@ class GameScene(Scene):
                     else:
                         self.status_message = f"It's {self.board_manager.current_turn}'s turn. Select a piece."
     
+    # --- Rendering Cache (View) ---
+    def _get_square_rect(self, r, c):
+        """Returns the screen rectangle covered by board square (r, c)."""
+        return pygame.Rect(
+            self.OFFSET_X + c * self.SQUARE_SIZE,
+            self.OFFSET_Y + r * self.SQUARE_SIZE,
+            self.SQUARE_SIZE,
+            self.SQUARE_SIZE
+        )
+
+    def _build_background(self):
+        """
+        Pre-composes everything that never changes during a game (background fill,
+        board image, back button and the taken-counter chrome) into one surface.
+        Dirty regions are repaired by blitting the matching area of this surface.
+        """
+        background = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT)).convert()
+        background.fill(self.BACKGROUND_COLOR)
+
+        if self.images_loaded:
+            background.blit(self.board_image, (self.OFFSET_X, self.OFFSET_Y))
+
+        # --- Back Button ---
+        pygame.draw.rect(background, (60, 60, 60), self.button_rect, border_radius=8)
+        background.blit(self.button_text, self.text_rect)
+
+        # --- Taken Pieces Counter (title, circles and labels) ---
+        title_render = self.small_font.render("Pieces Taken:", True, (0, 0, 0))
+        background.blit(title_render, (self.counter_x_start, self.counter_y_start))
+
+        for color, center, circle_color in (('Red', self.red_center, (200, 0, 0)),
+                                            ('Black', self.black_center, (50, 50, 50))):
+            pygame.draw.circle(background, circle_color, center, self.CIRCLE_RADIUS)
+            label = self.small_font.render(color, True, (0, 0, 0))
+            background.blit(label, (center[0] + self.CIRCLE_RADIUS + 10, center[1] - label.get_height() // 2))
+
+        return background
+
+    def _hint_squares(self):
+        """Squares visited by the hinted (best) move, or an empty tuple."""
+        hint = self.controller.hint
+        if not hint or not hint[1]:
+            return ()
+        first_move = hint[1][0][2][0]
+        return (first_move[0], first_move[1])
+
+    def _format_hint(self, hint):
+        depth, lines = hint
+        parts = []
+        for score, _, pv in lines:
+            move = pv[0]
+            text = PDNGame.format_turn([rc_to_square(*move[0]), rc_to_square(*move[1])], bool(move[2]))
+            parts.append(f"{text} ({score:+.0f})" if math.isfinite(score) else f"{text} ({'win' if score > 0 else 'loss'})")
+        return f"Hint (depth {depth}): " + ", ".join(parts)
+
+    def _square_state(self, r, c):
+        """Everything that determines how square (r, c) looks; used to detect dirty squares."""
+        piece = self.board_manager.board[r][c]
+        return (
+            piece.color if piece else None,
+            piece.king if piece else False,
+            self.selected_piece == (r, c),
+            (r, c) in self.valid_moves,
+            (r, c) in self._hint_squares(),
+        )
+
     # --- Update/Draw Methods (View) ---
     def update(self):
-        """Handles AI turn delay and execution."""
-        if self.mode == "PvAI" and self.board_manager.current_turn == "Black":
-            if not self.AITimer.running:
-                self.AITimer.start()
-            else:
-                self.ai_agent.runAI(self.board_manager)
-            if self.AITimer.is_finished():
-                self.AITimer.stop()
-                self.finalize_ai_move()
+        """Handles AI turn delay and execution, and shows new hint results."""
+        self.controller.update()
+
+        hint = self.controller.hint
+        if hint is not self._shown_hint:
+            self._shown_hint = hint
+            if hint:
+                self.status_message = self._format_hint(hint)
+
+    def is_idle(self):
+        """The scene only needs to tick continuously while the AI or a hint is thinking."""
+        return not self.controller.is_ai_turn() and not self.controller.hint_running()
 
     def draw_board(self):
-        """Draws the checkered pattern of the board."""
-        board_rect = pygame.Rect(self.OFFSET_X, self.OFFSET_Y, self.BOARD_SIZE, self.BOARD_SIZE)
-        self.screen.blit(self.board_image, board_rect.topleft)
+        """Restores the pre-composed background (board and static UI)."""
+        self.screen.blit(self.background, (0, 0))
 
-    def draw_pieces(self):
-        """Draws all pieces currently on the board using images."""
-        if not self.images_loaded:
-            return
+    def draw_square(self, r, c, state):
+        """Repaints a single board square: background, piece and indicators."""
+        color, king, selected, is_target, hinted = state
+        rect = self._get_square_rect(r, c)
+        self.screen.blit(self.background, rect, rect)
 
-        piece_size = self.red_piece_image.get_width() # Use the scaled size
-        
-        for r in range(8):
-            for c in range(8):
-                piece = self.board_manager.board[r][c]
-                if piece:
-                    center_x, center_y = self._get_pixel_coords(r, c)
-                    
-                    if piece.color == 'Red':
-                        piece_image = self.red_king_image if piece.king else self.red_piece_image
-                    else: # Black
-                        piece_image = self.black_king_image if piece.king else self.black_piece_image
-                        
-                    # Calculate the top-left corner for blitting
-                    top_left_x = center_x - (piece_size // 2)
-                    top_left_y = center_y - (piece_size // 2)
+        # Piece
+        if color and self.images_loaded:
+            if color == 'Red':
+                piece_image = self.red_king_image if king else self.red_piece_image
+            else: # Black
+                piece_image = self.black_king_image if king else self.black_piece_image
+            self.screen.blit(piece_image, piece_image.get_rect(center=rect.center))
 
-                    # Blit the image onto the screen
-                    self.screen.blit(piece_image, (top_left_x, top_left_y))
+        # Hinted move (gold border), drawn under the selection border
+        if hinted:
+            pygame.draw.rect(self.screen, self.HINT_HIGHLIGHT, rect, 3)
 
-    def draw_indicators(self):
-        """Draws selection highlight and valid move indicators."""
-        
-        # Draw selected piece highlight
-        if self.selected_piece:
-            r, c = self.selected_piece
-            # Highlight the square
-            rect = pygame.Rect(
-                self.OFFSET_X + c * self.SQUARE_SIZE,
-                self.OFFSET_Y + r * self.SQUARE_SIZE,
-                self.SQUARE_SIZE,
-                self.SQUARE_SIZE
-            )
-            pygame.draw.rect(self.screen, self.SELECTION_HIGHLIGHT, rect, 5) # Draw blue border
-
-        # Draw valid move indicators
-        if self.valid_moves:
-            # Create a surface for semi-transparency
-            s = pygame.Surface((self.SQUARE_SIZE, self.SQUARE_SIZE), pygame.SRCALPHA)
-            pygame.draw.circle(s, self.MOVE_HIGHLIGHT, (self.SQUARE_SIZE // 2, self.SQUARE_SIZE // 2), self.SQUARE_SIZE // 4)
-
-            for r, c in self.valid_moves.keys():
-                top_left_x = self.OFFSET_X + c * self.SQUARE_SIZE
-                top_left_y = self.OFFSET_Y + r * self.SQUARE_SIZE
-                self.screen.blit(s, (top_left_x, top_left_y))
+        # Selected piece highlight (blue border)
+        if selected:
+            pygame.draw.rect(self.screen, self.SELECTION_HIGHLIGHT, rect, 5)
+
+        # Valid move indicator (pre-rendered semi-transparent circle)
+        if is_target:
+            self.screen.blit(self.move_highlight, rect.topleft)
+
+        return rect
+
+    def draw_pieces(self):
+        """Repaints every square whose contents changed since the last frame."""
+        dirty = []
+        for r in range(8):
+            for c in range(8):
+                state = self._square_state(r, c)
+                if self._square_cache.get((r, c)) != state:
+                    self._square_cache[(r, c)] = state
+                    dirty.append(self.draw_square(r, c, state))
+        return dirty
 
     def draw_ui_elements(self):
-        """Draws the status message, turn indicator, and taken pieces counter."""
-        
-        # --- Back Button ---
-        pygame.draw.rect(self.screen, (60, 60, 60), self.button_rect, border_radius=8)
-        self.screen.blit(self.button_text, self.text_rect)
-        
-        # --- Status / Turn Indicator ---
+        """Re-renders the turn indicator, status message and taken counters if their values changed."""
+        turn = self.board_manager.current_turn
+        turn_color = (200, 0, 0) if turn == 'Red' else (50, 50, 50)
+        board_center_x = self.OFFSET_X + (self.BOARD_SIZE // 2)
         status_y = self.OFFSET_Y - 30
-        turn_color = (200, 0, 0) if self.board_manager.current_turn == 'Red' else (50, 50, 50)
-        
-        # Draw a bold turn message
-        turn_message = f"Turn: {self.board_manager.current_turn}"
-        turn_render = self.big_font.render(turn_message, True, turn_color)
-        turn_rect = turn_render.get_rect(center=(self.OFFSET_X + (self.BOARD_SIZE//2), status_y))
-        self.screen.blit(turn_render, turn_rect)
-
-        # Draw the main game status message (below the turn)
-        msg_render = self.small_font.render(self.status_message, True, (0, 0, 0))
-        msg_rect = msg_render.get_rect(center=(self.OFFSET_X + (self.BOARD_SIZE//2), status_y + 20))
-        self.screen.blit(msg_render, msg_rect)
-
-        # --- Taken Pieces Counter (Circles) ---
-        counter_x_start = self.OFFSET_X + self.BOARD_SIZE + 10
-        counter_y_start = self.OFFSET_Y + self.BOARD_SIZE/2 - 100
-        circle_radius = 25
-        padding = 70
-        
-        # Title
-        title_render = self.small_font.render("Pieces Taken:", True, (0, 0, 0))
-        self.screen.blit(title_render, (counter_x_start, counter_y_start))
-        
-        # --- Draw Red Taken Circle ---
-        red_center = (counter_x_start + circle_radius, counter_y_start + padding)
-        pygame.draw.circle(self.screen, (200, 0, 0), red_center, circle_radius) 
-        red_count_text = self.big_font.render(str(self.board_manager.taken_pieces['Red']), True, (255, 255, 255))
-        red_count_rect = red_count_text.get_rect(center=red_center)
-        self.screen.blit(red_count_text, red_count_rect)
-
-        red_label = self.small_font.render("Red", True, (0, 0, 0))
-        self.screen.blit(red_label, (red_center[0] + circle_radius + 10, red_center[1] - red_label.get_height() // 2))
-
-        # --- Draw Black Taken Circle ---
-        black_center = (counter_x_start + circle_radius, counter_y_start + padding + 2 * circle_radius + 10)
-        pygame.draw.circle(self.screen, (50, 50, 50), black_center, circle_radius)
-        black_count_text = self.big_font.render(str(self.board_manager.taken_pieces['Black']), True, (255, 255, 255))
-        black_count_rect = black_count_text.get_rect(center=black_center)
-        self.screen.blit(black_count_text, black_count_rect)
-        
-        black_label = self.small_font.render("Black", True, (0, 0, 0))
-        self.screen.blit(black_label, (black_center[0] + circle_radius + 10, black_center[1] - black_label.get_height() // 2))
+
+        # (slot, value, color, anchor) for every text element that can change
+        updates = (
+            ('turn', f"Turn: {turn}", turn_color, {'center': (board_center_x, status_y)}),
+            ('status', self.status_message, None, {'center': (board_center_x, status_y + 20)}),
+            ('red_count', self.board_manager.taken_pieces['Red'], None, {'center': self.red_center}),
+            ('black_count', self.board_manager.taken_pieces['Black'], None, {'center': self.black_center}),
+        )
+
+        restore = []
+        for slot, value, color, anchor in updates:
+            text = self.texts[slot]
+            if text.set(value, color):
+                old_rect = self._text_rects.get(slot)
+                if old_rect:
+                    restore.append(old_rect)
+                self._text_rects[slot] = text.get_rect(**anchor)
+                restore.append(self._text_rects[slot])
+
+        if not restore:
+            return []
+
+        # Text rects can overlap (turn/status), so repaint the background under every
+        # changed rect first and then re-blit every text that touches a repaired area.
+        for rect in restore:
+            self.screen.blit(self.background, rect, rect)
+        for slot, rect in self._text_rects.items():
+            if rect.collidelist(restore) != -1:
+                self.screen.blit(self.texts[slot].surface, rect)
+        return restore
 
     def draw(self):
-        """Draws all game elements to the screen."""
-        self.screen.fill((128, 128, 192))
-        
-        # Game Elements
-        self.draw_board()
-        self.draw_pieces()
-        self.draw_indicators()
-        
-        # UI Elements
-        self.draw_ui_elements()
\ No newline at end of file
+        """
+        Draws the game, repainting only what changed since the previous frame.
+        Returns the list of dirty rects, or None after a full repaint.
+        """
+        full_redraw = self._needs_full_redraw
+        if full_redraw:
+            self.draw_board()
+            self._square_cache = {}
+            self._text_rects = {}
+            for text in self.texts.values():
+                text.surface = None # Force re-blit on the fresh background
+            self._needs_full_redraw = False
+
+        dirty = self.draw_pieces()
+        dirty += self.draw_ui_elements()
+        return None if full_redraw else dirty
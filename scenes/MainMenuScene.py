@@ -1,5 +1,6 @@
 import pygame
 from .Scene import Scene
+from .Assets import assets
 
 class MainMenuScene(Scene):
     def __init__(self, screen):
@@ -8,8 +9,8 @@ class MainMenuScene(Scene):
         self.SCREEN_WIDTH = screen.get_width()
         self.SCREEN_HEIGHT = screen.get_height()
         
-        self.font_large = pygame.font.Font(None, 80)
-        self.font_medium = pygame.font.Font(None, 48)
+        self.font_large = assets.font(80)
+        self.font_medium = assets.font(48)
         
         # --- Title Setup ---
         self.title_text = self.font_large.render("Pygame Checkers", True, (255, 255, 255))
@@ -38,6 +39,10 @@ class MainMenuScene(Scene):
         self.pvp_current_color = self.button_color
         self.pvai_current_color = self.button_color
 
+        # Instructions (static, rendered once instead of every frame)
+        self.instruction_text = assets.text("Select a mode to begin playing Checkers.", 30, (180, 180, 255))
+        self.instruction_rect = self.instruction_text.get_rect(center=(self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT - 50))
+
     def handle_event(self, event):
         # Update hover state
         if event.type == pygame.MOUSEMOTION:
@@ -75,10 +80,7 @@ class MainMenuScene(Scene):
         self.screen.blit(self.pvai_text, self.pvai_text_rect)
         
         # Instructions
-        small_font = pygame.font.Font(None, 30)
-        instruction_text = small_font.render("Select a mode to begin playing Checkers.", True, (180, 180, 255))
-        instruction_rect = instruction_text.get_rect(center=(self.SCREEN_WIDTH // 2, self.SCREEN_HEIGHT - 50))
-        self.screen.blit(instruction_text, instruction_rect)
+        self.screen.blit(self.instruction_text, self.instruction_rect)
 
     def update(self):
         # Menu state is static, no update logic needed here
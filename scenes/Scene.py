@@ -3,6 +3,7 @@ import pygame
 class Scene:
     def __init__(self, screen):
         self.screen = screen
+        self._needs_full_redraw = True # First frame of a scene always repaints everything
 
     def handle_event(self, event):
         pass
@@ -10,5 +11,23 @@ class Scene:
     def update(self):
         pass
 
+    def invalidate(self):
+        """Forces the next draw() to repaint the whole screen (e.g. after a scene switch)."""
+        self._needs_full_redraw = True
+
+    def is_idle(self):
+        """
+        Returns True when the scene only changes in response to input, so the
+        main loop can block on the event queue instead of spinning.
+        """
+        return True
+
     def draw(self):
-        pass
\ No newline at end of file
+        """
+        Draws the scene.
+
+        Returns:
+            A list of dirty pygame.Rect objects to pass to pygame.display.update(),
+            or None if the whole screen should be flipped.
+        """
+        pass
@@ -0,0 +1,38 @@
+import pygame
+
+class CachedText:
+    """
+    A text surface that is only re-rendered when its string or color changes.
+
+    Font.render() is one of the more expensive calls in a frame, so UI labels
+    keep one CachedText each and only pay for rendering when the value they
+    display actually changes.
+    """
+
+    def __init__(self, font, color=(0, 0, 0), antialias=True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.text = None
+        self.surface = None
+
+    def set(self, text, color=None):
+        """
+        Updates the displayed text.
+
+        Returns:
+            True if the surface was re-rendered, False if the cached one is still valid.
+        """
+        text = str(text)
+        color = color if color is not None else self.color
+        if self.surface is not None and text == self.text and color == self.color:
+            return False
+
+        self.text = text
+        self.color = color
+        self.surface = self.font.render(text, self.antialias, color)
+        return True
+
+    def get_rect(self, **kwargs):
+        """Same as Surface.get_rect() for the current surface."""
+        return self.surface.get_rect(**kwargs)
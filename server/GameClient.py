@@ -0,0 +1,172 @@
+# checkers/server/game_client.py
+"""
+Asyncio client for GameServer, plus a small load test:
+
+    python -m server.GameClient --games 200 --depth 3
+    python -m server.GameClient --games 200 --nodes 20000    (fixed effort, see benchmarks/calibrate.py)
+
+plays that many concurrent games with random human moves against a server
+(starting a local one if --port is not given) and prints the server stats.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+
+from .GameServer import GameServer, MAX_LINE_BYTES
+from .Spectator import apply_frame, decode_frame
+
+
+class GameClient:
+    """One TCP connection to a GameServer; can hold several sessions."""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self._responses = asyncio.Queue() # Replies to our requests, in order
+        self._pushed = {}                 # session -> asyncio.Queue of ai_move pushes
+        self._frames = {}                 # session -> asyncio.Queue of watched frames (None: watch ended)
+        self._reader_task = None
+
+    async def connect(self, host='127.0.0.1', port=8765):
+        self.reader, self.writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        self._reader_task = asyncio.create_task(self._read_loop())
+        return self
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            await self.writer.wait_closed()
+        if self._reader_task:
+            self._reader_task.cancel()
+
+    async def _read_loop(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                await self._responses.put({'op': 'error', 'error': 'disconnected'})
+                return
+            message = json.loads(line)
+            if message.get('op') in ('frame', 'watch_end'):
+                frame = base64.b64decode(message['frame']) if message['op'] == 'frame' else None
+                self._frames.setdefault(message['session'], asyncio.Queue()).put_nowait(frame)
+            elif message.get('op') == 'ai_move' or (message.get('op') == 'error' and 'session' in message):
+                self._session_queue(message['session']).put_nowait(message)
+            else:
+                await self._responses.put(message)
+
+    def _session_queue(self, session):
+        return self._pushed.setdefault(session, asyncio.Queue())
+
+    async def request(self, op, **fields):
+        """Sends one request and returns the server's reply."""
+        fields['op'] = op
+        self.writer.write(json.dumps(fields).encode() + b'\n')
+        await self.writer.drain()
+        return await self._responses.get()
+
+    async def new_game(self, depth=4, ai_color='Black', nodes=None):
+        """nodes: optional node budget per AI move (depth is then its ceiling)."""
+        if nodes:
+            return await self.request('new', depth=depth, ai_color=ai_color, nodes=nodes)
+        return await self.request('new', depth=depth, ai_color=ai_color)
+
+    async def move(self, session, move):
+        return await self.request('move', session=session, move=move)
+
+    async def wait_ai_move(self, session, timeout=None):
+        """Waits for the server to push the AI's reply move for session."""
+        return await asyncio.wait_for(self._session_queue(session).get(), timeout)
+
+    async def watch(self, session):
+        """
+        Watches a session (any client's). Yields (decoded frame, board) per
+        frame, board being the game rebuilt from the frames, until the session
+        closes. Raises RuntimeError if the server refuses.
+        """
+        reply = await self.request('watch', session=session)
+        if reply['op'] == 'error':
+            raise RuntimeError(reply['error'])
+        frames = self._frames.setdefault(session, asyncio.Queue())
+        board = None
+        try:
+            while True:
+                data = await frames.get()
+                if data is None:
+                    return
+                frame = decode_frame(data)
+                board = apply_frame(board, frame)
+                yield frame, board
+        finally:
+            self._frames.pop(session, None)
+
+    async def stats(self):
+        return await self.request('stats')
+
+
+# --- Load Test ---
+async def play_random_game(client, depth, max_plies=200, rng=random, nodes=None):
+    """Plays one game with random legal human moves. Returns the final state."""
+    state = await client.new_game(depth, nodes=nodes)
+    session = state['session']
+    for _ in range(max_plies):
+        if state.get('over') or state['op'] == 'error':
+            break
+        if state['turn'] != 'Red':
+            state = await client.wait_ai_move(session)
+            continue
+        move = rng.choice(state['legal'])
+        reply = await client.move(session, move)
+        while reply.get('busy'): # Backpressure: the move was not applied, retry later
+            await asyncio.sleep(0.05)
+            reply = await client.move(session, move)
+        state = reply
+    await client.request('close', session=session)
+    return state
+
+async def _load_test(args):
+    server = None
+    port = args.port
+    if port is None:
+        server = await GameServer(port=0, workers=args.workers).start()
+        port = server.port
+
+    async def one_game(seed):
+        client = await GameClient().connect(args.host, port)
+        try:
+            return await play_random_game(client, args.depth, args.max_plies, random.Random(seed), args.nodes)
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one_game(i) for i in range(args.games)))
+    elapsed = time.perf_counter() - start
+
+    probe = await GameClient().connect(args.host, port)
+    stats = await probe.stats()
+    await probe.close()
+    if server:
+        await server.close()
+
+    print(f"{len(results)} games in {elapsed:.1f}s, "
+          f"{sum(1 for r in results if r.get('over'))} finished, "
+          f"{sum(1 for r in results if r.get('op') == 'error')} errors")
+    stats.pop('per_session', None)
+    print(json.dumps(stats, indent=2))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many concurrent random games against a checkers server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="Server port (default: start a local server)")
+    parser.add_argument('--workers', type=int, default=None, help="AI workers for the local server")
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--nodes', type=int, default=None, help="AI node budget per move (depth is then its ceiling)")
+    parser.add_argument('--max-plies', type=int, default=200)
+    args = parser.parse_args(argv)
+    asyncio.run(_load_test(args))
+
+if __name__ == "__main__":
+    main()
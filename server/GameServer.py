@@ -0,0 +1,600 @@
+# checkers/server/game_server.py
+"""
+Asyncio game server hosting many Player vs AI sessions at once.
+
+Clients connect over plain TCP and exchange one JSON object per line. Every
+request carries an "op" and (except "new" and "stats") a "session" id:
+
+    {"op": "new", "depth": 4, "ai_color": "Black"}   -> {"op": "state", ...}
+    {"op": "new", "nodes": 20000}                     (fixed effort: same moves on any host)
+    {"op": "move", "session": 1, "move": "22-18"}     -> {"op": "state", ...}
+                                                       later {"op": "ai_move", ...}
+    {"op": "state", "session": 1}                     -> {"op": "state", ...}
+    {"op": "close", "session": 1}                     -> {"op": "closed", ...}
+    {"op": "watch", "session": 1}                     -> {"op": "watching", ...}
+                                                       then {"op": "frame", "session": 1, "frame": base64}
+                                                       ... {"op": "watch_end", "session": 1}
+    {"op": "unwatch", "session": 1}                   -> {"op": "unwatched", ...}
+    {"op": "stats"}                                   -> {"op": "stats", ...}
+
+Moves use PDN square numbers (see utility/PDN.py); "22x15" is one jump and
+"22x15x6" a whole multi-jump. AI searches never run on the event loop: each
+AI turn is a job for a bounded process pool. Jobs are dispatched round-robin
+(one outstanding job per session), new moves are rejected with "busy" when
+the queue is full, and a client that disconnects has its queued jobs dropped.
+
+Any connection may watch any running session: it gets the game as compact
+spectator frames (see server/Spectator.py), starting with a keyframe.
+
+    python -m server.GameServer --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utility.Board import Board
+from utility.GameController import GameController
+from utility.MinMaxAgent import MinMaxAgent
+from utility.PDN import rc_to_square, square_to_rc
+from utility.ResultCache import SharedResultCache
+from utility.EvalCache import EvalCache
+from .Spectator import SpectatorFeed
+
+MAX_LINE_BYTES = 64 * 1024
+MAX_SESSIONS_PER_CLIENT = 32
+MAX_WATCHES_PER_CLIENT = 32
+MAX_DEPTH = 8
+MAX_NODES = 1_000_000 # Node budget limit per AI move (see MinMaxAgent node_budget)
+
+
+class ServerBusy(Exception):
+    """Raised when the AI queue is full; the client should retry later."""
+
+
+class ProtocolError(Exception):
+    """Raised for malformed or illegal requests; reported back to the client."""
+
+
+# --- Worker Process Side ---
+_worker_result_cache = None
+_worker_eval_cache = None
+
+def _init_worker(result_cache_name):
+    """Attaches each worker process to the server's shared result cache."""
+    global _worker_result_cache, _worker_eval_cache
+    _worker_eval_cache = EvalCache(1 << 18) # Leaf evaluations, kept across all the worker's searches
+    if result_cache_name:
+        _worker_result_cache = SharedResultCache(name=result_cache_name)
+
+def search_ai_turn(board_bytes, color, depth, nodes=None):
+    """
+    Plays a whole AI turn (including multi-jump hops) on a copy of the position.
+    Runs in a worker process; the position travels as the 13 byte encoding.
+    With nodes, every hop is searched with that node budget and depth as its ceiling.
+    Returns: (score, [(piece_rc, target_rc), ...], search_ms)
+    """
+    start = time.perf_counter()
+    board = Board.from_bytes(board_bytes)
+    agent = MinMaxAgent(color, depth, result_cache=_worker_result_cache, node_budget=nodes,
+                        eval_cache=_worker_eval_cache)
+    hops = []
+    score = None
+    while board.current_turn == color and len(hops) < 12:
+        # A multi-jump is continued by the piece that just jumped, the same rule as for humans
+        agent.runAI(board, hops[-1][1] if hops else None)
+        score, move = agent.get_best_move()
+        if not move:
+            break
+        piece_rc, target_rc, captured_piece = move
+        board.move_piece(piece_rc, target_rc, captured_piece)
+        hops.append((piece_rc, target_rc))
+    if score is not None and abs(score) == float('inf'):
+        score = 'win' if score > 0 else 'loss'
+    return score, hops, (time.perf_counter() - start) * 1000
+
+
+# --- Metrics ---
+class LatencyStats:
+    """A rolling window of latency samples in milliseconds."""
+
+    def __init__(self, window=256):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {'count': self.count}
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'p50_ms': round(statistics.median(ordered), 2),
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            'max_ms': round(ordered[-1], 2),
+        }
+
+
+# --- Sessions ---
+def _find_hop(board, jumping_rc, piece_rc, target_rc):
+    """
+    The legal move tuple of board for a hop; jumping_rc is the piece that must
+    continue a multi-jump, if any. Raises ProtocolError if the hop is illegal.
+    """
+    if jumping_rc is None or piece_rc == jumping_rc:
+        for move in board.get_all_legal_moves(board.current_turn):
+            if move[0] == piece_rc and move[1] == target_rc:
+                return move
+    raise ProtocolError(f"Illegal move {rc_to_square(*piece_rc)}-{rc_to_square(*target_rc)}")
+
+class Session:
+    """One PvAI game held in memory by the server."""
+
+    def __init__(self, session_id, client, depth, ai_color, nodes=None):
+        self.id = session_id
+        self.client = client
+        self.depth = depth
+        self.nodes = nodes # Node budget per AI move, or None for a plain depth search
+        self.ai_color = ai_color
+        self.controller = GameController('PvP') # Moves are applied here; the AI runs in the pool
+        self.job = None          # asyncio.Future of the queued/running AI turn
+        self.move_received = None # perf_counter() of the move that triggered the AI turn
+        self.closed = False
+        self.feed = None         # SpectatorFeed, created when the first watcher arrives
+
+        self.latency = LatencyStats() # Human move received -> AI move sent
+        self.queue_wait = LatencyStats()
+        self.search_time = LatencyStats()
+
+    @property
+    def board(self):
+        return self.controller.board
+
+    def spectator_feed(self):
+        """The session's SpectatorFeed; frames are wrapped as JSON lines once, for all watchers."""
+        if self.feed is None:
+            prefix = f'{{"op": "frame", "session": {self.id}, "frame": "'.encode()
+            self.feed = SpectatorFeed(self.board, lambda frame: prefix + base64.b64encode(frame) + b'"}\n')
+        return self.feed
+
+    def state(self, op='state', **extra):
+        board = self.board
+        message = {
+            'op': op,
+            'session': self.id,
+            'fen': board.to_fen(),
+            'turn': board.current_turn,
+            'status': self.controller.status_message,
+            'over': self.controller.game_over,
+            'result': self.controller.result(),
+            'legal': [] if self.controller.game_over else self.legal_moves(),
+        }
+        message.update(extra)
+        return message
+
+    def legal_moves(self):
+        """Legal hops for the side to move as PDN strings ('9-14', '15x22')."""
+        moves = self.controller.legal_moves()
+        jumping_rc = self.controller.jumping_piece()
+        if jumping_rc is not None: # Mid multi-jump: only the jumping piece may continue
+            moves = [m for m in moves if m[0] == jumping_rc]
+        return [f"{rc_to_square(*p)}{'x' if c else '-'}{rc_to_square(*t)}" for p, t, c in moves]
+
+    def apply_hop(self, piece_rc, target_rc):
+        """
+        Plays one hop (human or AI) after checking it is legal. Raises ProtocolError
+        otherwise. A multi-jump must be continued by the same piece (as in GameScene).
+        """
+        move = _find_hop(self.board, self.controller.jumping_piece(), piece_rc, target_rc)
+        self.controller.play_move(*move)
+
+    def apply_hops(self, hops):
+        """
+        Plays a move of one or more hops [(piece_rc, target_rc), ...], e.g. a whole
+        multi-jump, or nothing at all: every hop is checked on a copy of the board
+        first, and ProtocolError is raised before the first hop is played.
+        """
+        board = self.board.deep_copy()
+        jumping_rc = self.controller.jumping_piece()
+        for piece_rc, target_rc in hops:
+            must_multijump, _ = board.move_piece(*_find_hop(board, jumping_rc, piece_rc, target_rc))
+            jumping_rc = target_rc if must_multijump else None
+        for piece_rc, target_rc in hops:
+            self.apply_hop(piece_rc, target_rc)
+
+    def metrics(self):
+        return {
+            'session': self.id,
+            'plies': sum(len(turn) for turn in self.controller.turns),
+            'over': self.controller.game_over,
+            'latency': self.latency.summary(),
+            'queue_wait': self.queue_wait.summary(),
+            'search': self.search_time.summary(),
+            'spectators': self.feed.stats() if self.feed else None,
+        }
+
+
+# --- AI Scheduling ---
+class AIScheduler:
+    """
+    Hands AI turns to a process pool without ever blocking the event loop.
+
+    Sessions wait in a FIFO (each session has at most one job, so this is
+    round-robin between sessions) and at most `workers` jobs run at once.
+    When more than `max_queued` sessions are waiting, submit() raises ServerBusy.
+    """
+
+    def __init__(self, workers=None, max_queued=None, result_cache_mb=32):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queued = max_queued or self.workers * 16
+        # Positions repeat a lot between games (openings especially), so all
+        # workers share one cache of finished searches
+        self.result_cache = SharedResultCache(size_mb=result_cache_mb) if result_cache_mb else None
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(self.result_cache.name if self.result_cache else None,))
+        self.waiting = deque() # (session, future, enqueued_at)
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self._wakeup = asyncio.Event()
+        self._dispatcher = None
+
+    def start(self):
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        if self._dispatcher:
+            self._dispatcher.cancel()
+        for session, future, _ in self.waiting:
+            future.cancel()
+        self.waiting.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.result_cache:
+            self.result_cache.close()
+
+    def is_full(self):
+        return len(self.waiting) >= self.max_queued
+
+    def submit(self, session):
+        """Queues an AI turn for the session. Returns a future with search_ai_turn's result."""
+        if self.is_full():
+            self.rejected += 1
+            raise ServerBusy("AI queue is full, try again shortly")
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.append((session, future, time.perf_counter()))
+        self._wakeup.set()
+        return future
+
+    def cancel(self, session):
+        """Drops the session's queued job (a job already running is left to finish and ignored)."""
+        for entry in list(self.waiting):
+            if entry[0] is session:
+                self.waiting.remove(entry)
+                entry[1].cancel()
+                self.cancelled += 1
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self.waiting or self.running >= self.workers:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            session, future, enqueued_at = self.waiting.popleft()
+            if future.cancelled() or session.closed:
+                continue
+            session.queue_wait.add((time.perf_counter() - enqueued_at) * 1000)
+            self.running += 1
+            job = loop.run_in_executor(self.pool, search_ai_turn,
+                                       session.board.to_bytes(), session.ai_color, session.depth, session.nodes)
+            job.add_done_callback(lambda job, future=future: self._finished(job, future))
+
+    def _finished(self, job, future):
+        self.running -= 1
+        self.completed += 1
+        self._wakeup.set()
+        if future.cancelled():
+            return
+        if job.exception() is not None:
+            future.set_exception(job.exception())
+        else:
+            future.set_result(job.result())
+
+    def stats(self):
+        return {'workers': self.workers, 'queued': len(self.waiting), 'running': self.running,
+                'completed': self.completed, 'rejected': self.rejected, 'cancelled': self.cancelled,
+                'result_cache': self.result_cache.stats() if self.result_cache else None}
+
+
+# --- Server ---
+class GameServer:
+    """Accepts client connections and routes their requests to sessions."""
+
+    def __init__(self, host='127.0.0.1', port=8765, workers=None, max_queued=None, default_depth=4,
+                 result_cache_mb=32, default_nodes=None):
+        self.host = host
+        self.port = port
+        self.default_depth = default_depth
+        self.default_nodes = default_nodes
+        self.scheduler = AIScheduler(workers, max_queued, result_cache_mb)
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._server = None
+        self._handlers = {} # Connection handler task -> _Client, awaited on close()
+        self.latency = LatencyStats(1024) # All sessions
+        self.started = time.monotonic()
+
+    async def start(self):
+        self.scheduler.start()
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_LINE_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1] # Resolve port 0 to the real port
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+        # Closing the transports makes every handler see EOF and clean up its sessions
+        for client in list(self._handlers.values()):
+            client.writer.close()
+        if self._handlers:
+            await asyncio.wait(list(self._handlers), timeout=5)
+        if self._server:
+            await self._server.wait_closed()
+        await self.scheduler.close()
+
+    def stats(self):
+        return {
+            'op': 'stats',
+            'uptime_s': round(time.monotonic() - self.started, 1),
+            'sessions': len(self.sessions),
+            'scheduler': self.scheduler.stats(),
+            'latency': self.latency.summary(),
+            'per_session': [s.metrics() for s in self.sessions.values()],
+        }
+
+    # --- Connection Handling ---
+    async def _handle_client(self, reader, writer):
+        client = _Client(writer)
+        task = asyncio.current_task()
+        self._handlers[task] = client
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await client.send({'op': 'error', 'error': 'line too long'})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("request must be a JSON object")
+                    response = self._handle_request(client, request)
+                except (ProtocolError, ServerBusy, ValueError, KeyError, TypeError) as e:
+                    response = {'op': 'error', 'error': str(e) or type(e).__name__}
+                    if isinstance(e, ServerBusy):
+                        response['busy'] = True
+                await client.send(response)
+        except ConnectionError:
+            pass
+        finally:
+            # Disconnect: cancel queued AI work and forget the client's sessions
+            for session in list(client.sessions.values()):
+                self._close_session(session)
+            for subscription, forward in list(client.watching.values()):
+                subscription.close()
+                forward.cancel()
+            writer.close()
+            self._handlers.pop(task, None)
+
+    def _handle_request(self, client, request):
+        op = request.get('op')
+        if op == 'stats':
+            return self.stats()
+        if op == 'new':
+            return self._new_session(client, request)
+        if op == 'watch':
+            return self._watch(client, request)
+        if op == 'unwatch':
+            watch = client.watching.get(request.get('session'))
+            if watch is None:
+                raise ProtocolError(f"not watching session {request.get('session')!r}")
+            watch[0].close()
+            return {'op': 'unwatched', 'session': request['session']}
+
+        session = client.sessions.get(request.get('session'))
+        if session is None:
+            raise ProtocolError(f"unknown session {request.get('session')!r}")
+        if op == 'state':
+            return session.state()
+        if op == 'move':
+            return self._human_move(session, request)
+        if op == 'close':
+            self._close_session(session)
+            return {'op': 'closed', 'session': session.id}
+        if op == 'metrics':
+            return dict(session.metrics(), op='metrics')
+        raise ProtocolError(f"unknown op {op!r}")
+
+    def _new_session(self, client, request):
+        if len(client.sessions) >= MAX_SESSIONS_PER_CLIENT:
+            raise ProtocolError("too many sessions on this connection")
+        nodes = request.get('nodes', self.default_nodes)
+        if nodes is not None:
+            nodes = int(nodes)
+            if not 1 <= nodes <= MAX_NODES:
+                raise ProtocolError(f"nodes must be between 1 and {MAX_NODES}")
+        # With a node budget the depth is only a ceiling
+        depth = int(request.get('depth', MAX_DEPTH if nodes else self.default_depth))
+        if not 1 <= depth <= MAX_DEPTH:
+            raise ProtocolError(f"depth must be between 1 and {MAX_DEPTH}")
+        ai_color = request.get('ai_color', 'Black')
+        if ai_color not in ('Red', 'Black'):
+            raise ProtocolError("ai_color must be 'Red' or 'Black'")
+        if ai_color == 'Red' and self.scheduler.is_full():
+            self.scheduler.rejected += 1
+            raise ServerBusy("AI queue is full, try again shortly")
+
+        session = Session(next(self._ids), client, depth, ai_color, nodes)
+        client.sessions[session.id] = session
+        self.sessions[session.id] = session
+        if session.board.current_turn == ai_color:
+            session.move_received = time.perf_counter()
+            self._queue_ai_turn(session)
+        return session.state()
+
+    def _watch(self, client, request):
+        session = self.sessions.get(request.get('session'))
+        if session is None:
+            raise ProtocolError(f"unknown session {request.get('session')!r}")
+        if session.id in client.watching:
+            raise ProtocolError(f"already watching session {session.id}")
+        if len(client.watching) >= MAX_WATCHES_PER_CLIENT:
+            raise ProtocolError("too many watched sessions on this connection")
+        feed = session.spectator_feed()
+        subscription = feed.subscribe()
+        forward = asyncio.ensure_future(self._forward_frames(client, session.id, subscription))
+        client.watching[session.id] = (subscription, forward)
+        return {'op': 'watching', 'session': session.id, 'watchers': len(feed.publisher)}
+
+    async def _forward_frames(self, client, session_id, subscription):
+        """Writes a watcher's frames as fast as its connection takes them (see Spectator.Publisher)."""
+        try:
+            async for line in subscription:
+                await client.send_raw(line)
+            await client.send({'op': 'watch_end', 'session': session_id})
+        finally:
+            client.watching.pop(session_id, None)
+
+    def _human_move(self, session, request):
+        controller = session.controller
+        if controller.game_over:
+            raise ProtocolError("game is over")
+        if controller.board.current_turn == session.ai_color or session.job is not None:
+            raise ProtocolError("not your turn")
+
+        if self.scheduler.is_full():
+            # Refuse before touching the board so the client can simply resend the move
+            self.scheduler.rejected += 1
+            raise ServerBusy("AI queue is full, try again shortly")
+
+        text = str(request['move'])
+        squares = [int(sq) for sq in text.replace('x', '-').split('-')]
+        if len(squares) < 2 or not all(1 <= sq <= 32 for sq in squares):
+            raise ProtocolError(f"malformed move {text!r}")
+        session.apply_hops([(square_to_rc(start), square_to_rc(end)) for start, end in zip(squares, squares[1:])])
+
+        if not controller.game_over and controller.board.current_turn == session.ai_color:
+            session.move_received = time.perf_counter()
+            self._queue_ai_turn(session)
+        return session.state()
+
+    def _queue_ai_turn(self, session):
+        session.job = self.scheduler.submit(session)
+        session.job.add_done_callback(lambda job: asyncio.ensure_future(self._ai_turn_done(session, job)))
+
+    async def _ai_turn_done(self, session, job):
+        session.job = None
+        if job.cancelled() or session.closed:
+            return
+        if job.exception() is not None:
+            await session.client.send({'op': 'error', 'session': session.id, 'error': f"AI failed: {job.exception()}"})
+            return
+
+        score, hops, search_ms = job.result()
+        try:
+            session.apply_hops(hops)
+        except ProtocolError as e:
+            await session.client.send({'op': 'error', 'session': session.id, 'error': f"AI failed: {e}"})
+            return
+        if not hops:
+            session.controller._check_game_over()
+
+        latency_ms = (time.perf_counter() - session.move_received) * 1000
+        session.latency.add(latency_ms)
+        session.search_time.add(search_ms)
+        self.latency.add(latency_ms)
+
+        squares = [rc_to_square(*hops[0][0])] + [rc_to_square(*t) for _, t in hops] if hops else []
+        separator = 'x' if hops and abs(hops[0][1][0] - hops[0][0][0]) == 2 else '-'
+        await session.client.send(session.state(
+            'ai_move', move=separator.join(map(str, squares)), score=score,
+            latency_ms=round(latency_ms, 2), search_ms=round(search_ms, 2)))
+
+    def _close_session(self, session):
+        if session.closed:
+            return
+        session.closed = True
+        self.scheduler.cancel(session)
+        if session.feed:
+            session.feed.close() # Watchers get their last frames and a watch_end
+        session.client.sessions.pop(session.id, None)
+        self.sessions.pop(session.id, None)
+
+
+class _Client:
+    """A connected client: its writer (serialized with a lock) and its sessions."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.sessions = {}
+        self.watching = {} # session id -> (Subscription, forwarding task)
+        self._lock = asyncio.Lock()
+
+    async def send(self, message):
+        await self.send_raw(json.dumps(message).encode() + b'\n')
+
+    async def send_raw(self, line):
+        """Writes one already encoded JSON line (shared between watchers)."""
+        if self.writer.is_closing():
+            return
+        async with self._lock:
+            self.writer.write(line)
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                pass
+
+
+async def _run(args):
+    server = await GameServer(args.host, args.port, args.workers, args.max_queued, args.depth, args.result_cache_mb,
+                              args.nodes).start()
+    print(f"Checkers server listening on {server.host}:{server.port} with {server.scheduler.workers} AI workers")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many Player vs AI checkers games over TCP (JSON lines).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="AI worker processes (default: CPU count)")
+    parser.add_argument('--max-queued', type=int, default=None, help="Queued AI turns before clients get 'busy'")
+    parser.add_argument('--depth', type=int, default=4, help="Default AI depth for new sessions")
+    parser.add_argument('--nodes', type=int, default=None,
+                        help="Default AI node budget per move for new sessions (see benchmarks/calibrate.py)")
+    parser.add_argument('--result-cache-mb', type=float, default=32, help="Shared AI result cache size (0 disables)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# checkers/server/spectator.py
+"""
+Spectator streaming of live games: compact frames fanned out over asyncio.
+
+A SpectatorFeed listens to one Board (Board.add_move_listener) and turns
+every move_piece into a frame. Most frames are deltas, 9 bytes:
+
+    b'D', seq (uint32), from square, to square, captured square (255 = none), flags
+    flags: 1 = the moved man was kinged, 2 = the same side jumps again
+
+(square indices 0-31 of Board.SQUARES, i.e. 32 - PDN square). Every
+KEYFRAME_INTERVAL-th frame, and after a takeback (unmake_move), the feed
+sends a keyframe instead: b'K', seq, then the 13 byte Board.to_bytes()
+position, 18 bytes in all. seq counts the feed's events, so a watcher can
+spot a gap; a keyframe carries the seq of the last event it includes.
+
+Frames go through a Publisher with one bounded queue per subscriber. Each
+frame is encoded (and wrapped for the transport) once, however many watch,
+and publishing is a put_nowait per subscriber. A subscriber whose queue is
+full is not waited for: its backlog is dropped and replaced by a single
+keyframe of the current position, which is all it needs to catch up. A
+slow watcher therefore never holds up the game or the other watchers, and
+never falls more than one queue behind.
+
+Watchers rebuild the game with apply_frame():
+
+    board = None
+    async for data in subscription:
+        board = apply_frame(board, decode_frame(data))
+
+Everything runs on the event loop thread; Board events from other threads
+must be handed over with loop.call_soon_threadsafe.
+"""
+import asyncio
+import struct
+
+from utility.Board import Board, POSITION_BYTES, SQUARES
+
+KEYFRAME_INTERVAL = 64 # Frames between periodic keyframes
+QUEUE_SIZE = 32        # Frames a subscriber may fall behind before it is reset with a keyframe
+NO_CAPTURE = 0xFF
+PROMOTED, CONTINUES = 1, 2 # Delta flag bits
+
+_DELTA = struct.Struct('<cIBBBB')
+_KEYFRAME_HEADER = struct.Struct('<cI')
+DELTA_BYTES = _DELTA.size
+KEYFRAME_BYTES = _KEYFRAME_HEADER.size + POSITION_BYTES
+
+
+# --- Frames ---
+def encode_delta(seq, move):
+    """A delta frame for a Board move event (from_index, to_index, captured_index, promoted, must_multijump)."""
+    from_index, to_index, captured_index, promoted, must_multijump = move
+    flags = (PROMOTED if promoted else 0) | (CONTINUES if must_multijump else 0)
+    return _DELTA.pack(b'D', seq, from_index, to_index,
+                       NO_CAPTURE if captured_index is None else captured_index, flags)
+
+def encode_keyframe(seq, board):
+    return _KEYFRAME_HEADER.pack(b'K', seq) + board.to_bytes()
+
+def decode_frame(data):
+    """
+    Returns ('delta', seq, from_index, to_index, captured_index or None, promoted, continues)
+    or ('keyframe', seq, Board). Raises ValueError for anything else.
+    """
+    if len(data) == DELTA_BYTES and data[:1] == b'D':
+        _, seq, from_index, to_index, captured, flags = _DELTA.unpack(data)
+        return ('delta', seq, from_index, to_index, None if captured == NO_CAPTURE else captured,
+                bool(flags & PROMOTED), bool(flags & CONTINUES))
+    if len(data) == KEYFRAME_BYTES and data[:1] == b'K':
+        _, seq = _KEYFRAME_HEADER.unpack_from(data)
+        return 'keyframe', seq, Board.from_bytes(data[_KEYFRAME_HEADER.size:])
+    raise ValueError(f"not a spectator frame: {bytes(data[:16])!r}")
+
+def apply_frame(board, frame):
+    """
+    Applies a decoded frame to the watcher's board and returns the board to
+    use from now on (a new one for keyframes). Deltas need a board, so a
+    watcher starts with the keyframe every subscription begins with.
+    """
+    if frame[0] == 'keyframe':
+        return frame[2]
+    if board is None:
+        raise ValueError("delta before the first keyframe")
+    _, _, from_index, to_index, captured_index, _, _ = frame
+    captured = board.get_piece_at(*SQUARES[captured_index]) if captured_index is not None else None
+    board.move_piece(SQUARES[from_index], SQUARES[to_index], captured)
+    return board
+
+
+# --- Fan-out ---
+class Subscription:
+    """One watcher's bounded queue of messages; iterate it with async for."""
+
+    def __init__(self, publisher, size):
+        self.publisher = publisher
+        self.size = size
+        self.queue = asyncio.Queue(size + 1) # The extra slot is for the end marker
+        self.dropped = 0    # Times the backlog was replaced by a keyframe
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        message = await self.queue.get()
+        if message is None: # Publisher closed
+            raise StopAsyncIteration
+        return message
+
+    def full(self):
+        return self.queue.qsize() >= self.size
+
+    def _reset(self, keyframe):
+        """Drops the backlog and queues keyframe instead."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(keyframe)
+
+    def close(self):
+        """Stops watching; the iteration ends after the queued messages."""
+        self.publisher.unsubscribe(self)
+
+
+class Publisher:
+    """Fans messages out to subscribers without ever waiting for one of them."""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.published = 0
+        self.dropped = 0 # Backlogs replaced by a keyframe, over all subscribers
+
+    def __len__(self):
+        return len(self.subscribers)
+
+    def subscribe(self, first_message):
+        """A new Subscription that starts with first_message (normally a keyframe)."""
+        subscription = Subscription(self, self.queue_size)
+        subscription.queue.put_nowait(first_message)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscribers:
+            self.subscribers.discard(subscription)
+            subscription.closed = True
+            subscription.queue.put_nowait(None)
+
+    def publish(self, message, keyframe):
+        """
+        Queues message for every subscriber. Subscribers with a full queue get
+        keyframe() instead of their backlog; it is built at most once per call.
+        """
+        self.published += 1
+        reset = None
+        for subscription in self.subscribers:
+            if subscription.full():
+                if reset is None:
+                    reset = keyframe()
+                subscription._reset(reset)
+                subscription.dropped += 1
+                self.dropped += 1
+            else:
+                subscription.queue.put_nowait(message)
+
+    def close(self):
+        for subscription in list(self.subscribers):
+            self.unsubscribe(subscription)
+
+
+class SpectatorFeed:
+    """
+    Streams one Board's moves to any number of watchers.
+
+        feed = SpectatorFeed(board, wrap=lambda frame: ...)   # wrap: frame bytes -> transport message
+        subscription = feed.subscribe()
+        ...
+        feed.close()                                          # detaches from the board, ends subscriptions
+    """
+
+    def __init__(self, board, wrap=None, keyframe_interval=KEYFRAME_INTERVAL, queue_size=QUEUE_SIZE):
+        self.board = board
+        self.wrap = wrap or (lambda frame: frame)
+        self.keyframe_interval = keyframe_interval
+        self.publisher = Publisher(queue_size)
+        self.seq = 0         # Events seen so far
+        self._since_keyframe = 0
+        board.add_move_listener(self._on_move)
+
+    def __repr__(self):
+        return f"SpectatorFeed({len(self.publisher)} watchers, seq {self.seq})"
+
+    def subscribe(self):
+        return self.publisher.subscribe(self.keyframe())
+
+    def keyframe(self):
+        """The current position as a wrapped keyframe message."""
+        return self.wrap(encode_keyframe(self.seq, self.board))
+
+    def _on_move(self, board, move):
+        self.seq += 1
+        self._since_keyframe += 1
+        if move is None or self._since_keyframe >= self.keyframe_interval:
+            self._since_keyframe = 0
+            message = self.keyframe()
+            self.publisher.publish(message, lambda: message)
+        else:
+            self.publisher.publish(self.wrap(encode_delta(self.seq, move)), self.keyframe)
+
+    def stats(self):
+        return {'watchers': len(self.publisher), 'frames': self.publisher.published,
+                'dropped': self.publisher.dropped}
+
+    def close(self):
+        self.board.remove_move_listener(self._on_move)
+        self.publisher.close()
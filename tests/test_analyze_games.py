@@ -0,0 +1,20 @@
+import pytest
+
+from analyze_games import analyze_game
+from utility.PDN import iter_games
+
+
+def _analyze(fen, movetext, depth=2):
+    game, = iter_games([f'[FEN "{fen}"]', '', f'{movetext} *'])
+    return analyze_game(0, game, depth, blunder_threshold=75.0, solve_nodes=50_000)
+
+
+@pytest.mark.parametrize('fen, move', [
+    ('R:R2,3,4,13,16,27:B8,19,25', '4x11'),
+    ('R:R1,2,5,7,8,18,19:B23,29', '18x27'),
+])
+def test_another_winning_capture_is_no_blunder(fen, move):
+    record, = _analyze(fen, move)
+    assert record['solved'] == 'win'
+    assert record['best_score'] == record['played_score']
+    assert not record['blunder']
@@ -0,0 +1,98 @@
+import pickle
+import random
+
+import pytest
+
+from utility.Board import Board, CAPTURE_SHIFT, SQUARES
+from utility.Symmetry import canonical_board, mirror_masks
+
+
+def _positions(count, seed=0):
+    """Positions of random games (start of a turn or in the middle of a multi-jump)."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        for _ in range(rng.randint(0, 120)):
+            moves = board.get_all_legal_moves(board.current_turn)
+            if not moves:
+                break
+            board.move_piece(*rng.choice(moves))
+        positions.append(board)
+    return positions
+
+
+def _state(board):
+    return (board.to_fen(), board.to_masks(), board.current_turn, dict(board.taken_pieces),
+            board.zobrist_key, board.mirror_key, board.capture_mask)
+
+
+def _brute_force_capture_mask(board):
+    mask = 0
+    for i, (r, c) in enumerate(SQUARES):
+        piece = board.get_piece_at(r, c)
+        if piece and board._check_jump_moves(piece):
+            mask |= 1 << (CAPTURE_SHIFT[piece.color] + i)
+    return mask
+
+
+@pytest.mark.parametrize('board', _positions(40))
+def test_incremental_state_matches_a_full_recompute(board):
+    assert board.capture_mask == _brute_force_capture_mask(board)
+    assert board.capture_mask == Board.from_masks(*board.to_masks(), board.current_turn).capture_mask
+    assert board.zobrist_key == board.compute_key()
+    assert board.mirror_key == board.compute_mirror_key()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_make_unmake_round_trips(seed):
+    rng = random.Random(seed)
+    board = Board()
+    history = []
+    for _ in range(150):
+        moves = board.get_all_legal_moves(board.current_turn)
+        if not moves:
+            break
+        before = _state(board)
+        _, _, undo = board.make_move(*rng.choice(moves))
+        history.append((before, undo))
+        assert board.capture_mask == _brute_force_capture_mask(board)
+        if rng.random() < 0.2: # Take back a hop now and then, like a search does
+            before, undo = history.pop()
+            board.unmake_move(undo)
+            assert _state(board) == before
+    while history:
+        before, undo = history.pop()
+        board.unmake_move(undo)
+        assert _state(board) == before
+    assert _state(board) == _state(Board())
+
+
+@pytest.mark.parametrize('board', _positions(40, seed=1))
+def test_serialization_round_trips(board):
+    for copy in (Board.from_bytes(board.to_bytes()), Board.from_fen(board.to_fen()),
+                 pickle.loads(pickle.dumps(board)), board.deep_copy()):
+        assert copy.to_masks() == board.to_masks()
+        assert copy.current_turn == board.current_turn
+        assert (copy.zobrist_key, copy.mirror_key, copy.capture_mask) == \
+               (board.zobrist_key, board.mirror_key, board.capture_mask)
+        assert len(copy.get_all_legal_moves(copy.current_turn)) == len(board.get_all_legal_moves(board.current_turn))
+
+
+def test_deep_copies_are_independent():
+    board = next(b for b in _positions(10, seed=2) if b.get_all_legal_moves(b.current_turn))
+    state = _state(board)
+    copy = board.deep_copy()
+    copy.move_piece(*copy.get_all_legal_moves(copy.current_turn)[0])
+    assert _state(board) == state
+
+
+@pytest.mark.parametrize('board', _positions(40, seed=3))
+def test_mirror_keys_are_symmetric(board):
+    black, red, kings, black_to_move = mirror_masks(*board.to_masks(), board.current_turn == 'Black')
+    mirror = Board.from_masks(black, red, kings, 'Black' if black_to_move else 'Red')
+    assert mirror.zobrist_key == board.mirror_key
+    assert mirror.mirror_key == board.zobrist_key
+    canonical, mirrored = canonical_board(board)
+    assert canonical.current_turn == 'Red'
+    assert mirrored == (board.current_turn == 'Black')
@@ -0,0 +1,45 @@
+import pytest
+
+from utility.AnalysisCache import EXACT, LOWER, AnalysisCache, MemoryCache
+from utility.Board import Board
+from utility.MinMaxAgent import MinMaxAgent
+from utility.Symmetry import mirror_masks
+
+from test_board import _positions
+
+
+def _playable(count, seed):
+    return [board for board in _positions(count * 2, seed) if board.get_all_legal_moves(board.current_turn)][:count]
+
+
+def test_analysis_cache_persists(tmp_path):
+    path = str(tmp_path / 'cache.bin')
+    with AnalysisCache(path, size_mb=1) as cache:
+        cache.store(12345, 6, 1.5, EXACT, ((5, 0), (4, 1)))
+        cache.store(12345, 3, -7.0, LOWER) # Shallower: the deeper result stays
+    with AnalysisCache(path) as cache:
+        assert cache.probe(12345) == (6, 1.5, EXACT, ((5, 0), (4, 1)))
+        assert cache.probe(54321) is None
+
+
+@pytest.mark.parametrize('board', _playable(10, seed=5))
+def test_cached_search_matches_uncached(board, tmp_path):
+    plain = MinMaxAgent(board.current_turn, 3)
+    plain.runAI(board)
+    with AnalysisCache(str(tmp_path / 'cache.bin'), size_mb=1) as cache:
+        cached = MinMaxAgent(board.current_turn, 3, cache)
+        for _ in range(2): # The second search starts from a table full of its own results
+            cached.runAI(board)
+            assert cached.get_best_move()[0] == plain.get_best_move()[0]
+
+
+@pytest.mark.parametrize('board', _playable(10, seed=6))
+def test_mirrored_positions_share_keys_and_scores(board):
+    black, red, kings, black_to_move = mirror_masks(*board.to_masks(), board.current_turn == 'Black')
+    mirror = Board.from_masks(black, red, kings, 'Black' if black_to_move else 'Red')
+    agent = MinMaxAgent(board.current_turn, 3, MemoryCache())
+    mirror_agent = MinMaxAgent(mirror.current_turn, 3, MemoryCache())
+    assert agent._cache_key(board) == mirror_agent._cache_key(mirror)
+    agent.runAI(board)
+    mirror_agent.runAI(mirror)
+    assert agent.get_best_move()[0] == mirror_agent.get_best_move()[0]
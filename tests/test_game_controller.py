@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from utility.GameController import GameController
+
+from test_minmax_agent import _jump_continues_beside_other_captures, _multi_jump_positions
+
+
+def _random_opening(controller, plies, rng):
+    """Plays random legal hops, continuing multi-jumps with the jumping piece."""
+    for _ in range(plies):
+        moves = controller.legal_moves()
+        if controller.jumping_piece() is not None:
+            moves = [move for move in moves if move[0] == controller.jumping_piece()]
+        if controller.game_over or not moves:
+            return
+        controller.play_move(*rng.choice(moves))
+
+
+def _ai_game(seed, depth=2, max_plies=120):
+    controller = GameController('AIvAI', ai_depth=depth)
+    _random_opening(controller, 6, random.Random(seed))
+    controller.run_game(max_plies=max_plies)
+    return controller
+
+
+@pytest.mark.parametrize('seed', range(12))
+def test_ai_multi_jumps_continue_with_the_same_piece(seed):
+    for hops in _ai_game(seed).turns:
+        for previous, hop in zip(hops, hops[1:]):
+            assert hop[0] == previous[1], f"turn {hops} continues with another piece"
+
+
+def test_hint_in_a_multi_jump_moves_the_jumping_piece():
+    controller = GameController('PvP')
+    controller.board = _multi_jump_positions(1)[0]
+    move = next(m for m in controller.legal_moves() if _jump_continues_beside_other_captures(controller.board, m))
+    assert controller.play_move(*move)
+    controller.start_hint(depth=3)
+    controller._hint_thread.join()
+    _, lines = controller.hint
+    assert lines and all(line_move[0] == move[1] for _, line_move, _ in lines)
@@ -0,0 +1,31 @@
+import pytest
+
+from server.GameServer import ProtocolError, Session
+
+from test_minmax_agent import _jump_continues_beside_other_captures, _multi_jump_positions
+
+
+def _session_in_multi_jump_position():
+    session = Session(1, None, depth=2, ai_color=None)
+    session.controller.board = _multi_jump_positions(1, seed=4)[0]
+    move = next(m for m in session.controller.legal_moves()
+                if _jump_continues_beside_other_captures(session.board, m))
+    return session, move
+
+
+def test_illegal_later_hop_plays_nothing():
+    session, move = _session_in_multi_jump_position()
+    fen = session.board.to_fen()
+    with pytest.raises(ProtocolError):
+        session.apply_hops([(move[0], move[1]), (move[1], move[0])]) # Cannot jump back
+    assert session.board.to_fen() == fen
+    assert session.controller.turns == []
+
+
+def test_multi_jump_continues_with_the_same_piece():
+    session, move = _session_in_multi_jump_position()
+    session.apply_hops([(move[0], move[1])])
+    other = next(m for m in session.controller.legal_moves() if m[0] != move[1])
+    with pytest.raises(ProtocolError):
+        session.apply_hops([(other[0], other[1])])
+    assert session.controller.jumping_piece() == move[1]
@@ -0,0 +1,129 @@
+import math
+import random
+
+import pytest
+
+from utility.AnalysisCache import MemoryCache
+from utility.Board import Board
+from utility.MinMaxAgent import MinMaxAgent
+from utility.ProofNumberSearch import WIN
+from utility.ResultCache import ResultCache
+from utility.Symmetry import canonical_board, mirror_rc
+
+
+def _play_turn(board, rng):
+    """Plays a random turn, continuing a multi-jump with the jumping piece."""
+    color = board.current_turn
+    move = rng.choice(board.get_all_legal_moves(color))
+    while board.move_piece(*move)[0]:
+        move = rng.choice([m for m in board.get_all_legal_moves(color) if m[0] == move[1]])
+
+
+def _jump_continues_beside_other_captures(board, move):
+    """True if move starts a multi-jump while other pieces could capture as well."""
+    child = board.deep_copy()
+    if not child.move_piece(*move)[0]:
+        return False
+    return any(other[0] != move[1] for other in child.get_all_legal_moves(child.current_turn))
+
+
+def _multi_jump_positions(count, seed=0):
+    """
+    Positions from random games with a capture that continues as a multi-jump
+    while other pieces of the side to move could capture too, where moving
+    another piece mid-jump would be tempting.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        for _ in range(80):
+            moves = board.get_all_legal_moves(board.current_turn)
+            if not moves or len(positions) == count:
+                break
+            if any(_jump_continues_beside_other_captures(board, move) for move in moves):
+                positions.append(board.deep_copy())
+            _play_turn(board, rng)
+    return positions
+
+
+def _assert_chains_connected(board, hops):
+    """hops (piece_rc, target_rc, captured_rc) from board: multi-jumps keep their piece."""
+    board = board.deep_copy()
+    jumping = None
+    for piece_rc, target_rc, captured_rc in hops:
+        assert jumping is None or piece_rc == jumping, f"{hops} continues a jump with another piece"
+        captured = board.get_piece_at(*captured_rc) if captured_rc else None
+        must_multijump, _ = board.move_piece(piece_rc, target_rc, captured)
+        jumping = target_rc if must_multijump else None
+
+
+def _reference_minmax(agent, board, depth, piece_rc=None):
+    """Plain minimax with _minmax's depth and terminal rules, continuing jumps with the same piece."""
+    if depth == 0:
+        return agent.eval_score(board)
+    if board.get_game_state()[1]:
+        return math.inf if board.current_turn != agent.color else -math.inf
+    moves = board.get_all_legal_moves(board.current_turn)
+    if piece_rc is not None:
+        moves = [move for move in moves if move[0] == piece_rc]
+    if not moves:
+        return -math.inf if board.current_turn == agent.color else math.inf
+    scores = []
+    for move in moves:
+        child = agent._simulate(board, move)
+        if child.current_turn == board.current_turn:
+            scores.append(_reference_minmax(agent, child, depth, move[1]))
+        else:
+            scores.append(_reference_minmax(agent, child, depth - 1))
+    return max(scores) if board.current_turn == agent.color else min(scores)
+
+
+@pytest.mark.parametrize('board', _multi_jump_positions(12))
+def test_search_matches_plain_minimax(board):
+    agent = MinMaxAgent(board.current_turn, 3)
+    score, _ = agent._minmax(board, 3, True, root=True)
+    assert score == _reference_minmax(agent, board, 3)
+
+
+@pytest.mark.parametrize('board', _multi_jump_positions(6, seed=3))
+def test_cached_search_matches_plain_minimax(board):
+    agent = MinMaxAgent(board.current_turn, 3, MemoryCache())
+    for depth in (1, 2, 3): # Shallower results in the table must not answer for deeper searches
+        score, _ = agent._minmax(board, depth, True, root=True)
+    assert score == _reference_minmax(agent, board, 3)
+
+
+@pytest.mark.parametrize('board', _multi_jump_positions(8))
+def test_analysis_lines_keep_the_jumping_piece(board):
+    agent = MinMaxAgent(board.current_turn, 4)
+    for _, _, pv in agent.analyze(board, num_pv=3):
+        _assert_chains_connected(board, pv)
+
+
+@pytest.mark.parametrize('board', _multi_jump_positions(8, seed=1))
+def test_restricted_search_moves_the_jumping_piece(board):
+    move = next(m for m in board.get_all_legal_moves(board.current_turn) if _jump_continues_beside_other_captures(board, m))
+    board.move_piece(*move)
+    agent = MinMaxAgent(board.current_turn, 3)
+    agent.runAI(board, move[1])
+    assert agent.get_best_move()[1][0] == move[1]
+
+
+def test_mid_jump_keys_are_distinct_and_color_symmetric():
+    board = next(b for b in _multi_jump_positions(20, seed=2) if b.current_turn == 'Black')
+    move = next(m for m in board.get_all_legal_moves('Black') if _jump_continues_beside_other_captures(board, m))
+    board.move_piece(*move)
+    mirror, _ = canonical_board(board) # Red to move, pieces rotated and colors swapped
+    red, black = MinMaxAgent('Red', 1), MinMaxAgent('Black', 1)
+    assert black._cache_key(board, move[1]) != black._cache_key(board)
+    assert black._cache_key(board, move[1]) == red._cache_key(mirror, mirror_rc(move[1]))
+
+
+def test_result_cache_hit_forgets_the_previous_proof():
+    board = Board()
+    agent = MinMaxAgent('Red', 2, result_cache=ResultCache())
+    agent.runAI(board)
+    agent.solved = WIN # As left behind by a proven earlier position
+    agent.runAI(board) # Answered from the result cache
+    assert agent.solved is None
@@ -0,0 +1,34 @@
+import pytest
+
+from utility.Board import Board
+from utility.PDN import PDNGame, iter_games, square_to_rc
+
+from test_game_controller import _ai_game
+
+
+def _replayed(record):
+    board = Board()
+    for _ in record.replay(board):
+        pass
+    return board
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_exported_games_replay(seed):
+    controller = _ai_game(seed)
+    record, = iter_games(controller.to_pdn().to_pdn().splitlines())
+    assert _replayed(record).to_fen() == controller.board.to_fen()
+
+
+def test_from_hops_rejects_a_jump_continued_by_another_piece():
+    hops = [((1, 6), (3, 4), (2, 5)), ((3, 0), (5, 2), (4, 1))]
+    with pytest.raises(ValueError):
+        PDNGame.from_hops([hops])
+
+
+def test_standard_numbering():
+    record, = iter_games(['[GameType "20"]', '', '1. 11-15 23-19 2. 8-11 22-17 *'])
+    board = _replayed(record)
+    assert board.get_piece_at(*square_to_rc(15)).color == 'Red'
+    assert board.get_piece_at(*square_to_rc(17)).color == 'Black'
+    assert board.current_turn == 'Red'
@@ -0,0 +1,17 @@
+from utility.Board import Board
+from utility.ProofNumberSearch import ProofNumberSearch, WIN
+
+
+def test_no_proof_through_another_piece_mid_jump():
+    # Red's only quick "win" continues a capture with a different piece halfway;
+    # with the same-piece rule there is no win within 14 plies
+    board = Board.from_fen('R:R1,13,K15:B5,11,17,25')
+    result, move, _ = ProofNumberSearch(5_000).solve(board)
+    assert result != WIN and move is None
+
+
+def test_proves_a_simple_win():
+    board = Board.from_fen('R:R10,11,12,14,K31:B17,26,28,30')
+    result, move, _ = ProofNumberSearch(20_000).solve(board)
+    assert result == WIN
+    assert move in board.get_all_legal_moves('Red')
@@ -0,0 +1,35 @@
+import random
+
+from server.Spectator import SpectatorFeed, apply_frame, decode_frame
+from utility.Board import Board
+
+
+def _drain(subscription, board):
+    while not subscription.queue.empty():
+        message = subscription.queue.get_nowait()
+        if message is not None:
+            board = apply_frame(board, decode_frame(message))
+    return board
+
+
+def test_watchers_rebuild_the_game():
+    rng = random.Random(0)
+    board = Board()
+    feed = SpectatorFeed(board, keyframe_interval=16, queue_size=8)
+    fast, slow = feed.subscribe(), feed.subscribe()
+    fast_board = None
+    undos = []
+    for _ in range(200):
+        moves = board.get_all_legal_moves(board.current_turn)
+        if not moves:
+            break
+        if undos and rng.random() < 0.1: # A takeback is sent as a keyframe
+            board.unmake_move(undos.pop())
+        else:
+            undos.append(board.make_move(*rng.choice(moves))[2])
+        fast_board = _drain(fast, fast_board)
+        assert fast_board.to_bytes() == board.to_bytes()
+    # The slow watcher's backlog was replaced by keyframes, but it still catches up
+    assert slow.dropped > 0
+    assert _drain(slow, None).to_bytes() == board.to_bytes()
+    feed.close()
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from utility.Board import Board
+
+VectorEnv = pytest.importorskip('utility.VectorEnv').VectorEnv
+
+
+@pytest.mark.parametrize('canonical', [False, True])
+def test_random_games_agree_with_board(canonical):
+    env = VectorEnv(16, canonical=canonical, autoreset=False, seed=0)
+    boards = [Board() for _ in range(env.num_envs)]
+    jumping = [None] * env.num_envs
+    for _ in range(300):
+        if env.done.all():
+            break
+        mask = env.legal_mask()
+        for n, board in enumerate(boards):
+            if env.done[n]:
+                continue
+            moves = board.get_all_legal_moves(board.current_turn)
+            if jumping[n] is not None:
+                moves = [move for move in moves if move[0] == jumping[n]]
+            assert sorted(env.move_of(n, a) for a in np.flatnonzero(mask[n])) == sorted(m[:2] for m in moves)
+
+        actions = env.random_actions()
+        for n, board in enumerate(boards):
+            if env.done[n]:
+                continue
+            piece_rc, target_rc = env.move_of(n, actions[n])
+            move = next(m for m in board.get_all_legal_moves(board.current_turn) if m[:2] == (piece_rc, target_rc))
+            jumping[n] = target_rc if board.move_piece(*move)[0] else None
+        _, _, terminated, _, _ = env.step(actions)
+
+        for n, board in enumerate(boards):
+            assert (int(env.black[n]), int(env.red[n]), int(env.kings[n])) == board.to_masks()
+            assert env.black_to_move[n] == (board.current_turn == 'Black')
+            if terminated[n]:
+                assert board.get_game_state()[1]
+
+
+def test_board_round_trip():
+    env = VectorEnv(4, seed=1)
+    for _ in range(20):
+        env.step(env.random_actions())
+    board = env.to_board(2)
+    env.set_board(0, board)
+    assert env.to_board(0).to_fen() == board.to_fen()
@@ -0,0 +1,231 @@
+"""
+Trains the NeuralEvaluator network on self-play positions.
+
+Lets a shallow MinMaxAgent with the hand-written PhasedEvaluator (the
+"teacher") play games against itself, with random openings and occasional
+random moves for variety, and records every position with the teacher's
+search score and the game result. The network is fitted to those labels with
+Adam in plain NumPy, then its first layer is quantized to int16 and the
+weights written in the format NeuralEvaluator.load() reads:
+
+    python train_evaluator.py --games 1000 --out models/nnue.npz
+    python train_evaluator.py --games 1000 --save-data selfplay.npz --out models/nnue.npz
+    python train_evaluator.py --data selfplay.npz --epochs 60 --out models/nnue.npz
+
+Labels are win probabilities from Red's point of view:
+
+    target = result_weight * result + (1 - result_weight) * sigmoid(teacher_score / SCALE)
+
+with result 1 / 0.5 / 0 for a Red win / draw / Black win, and the network's
+score s is trained through sigmoid(s / SCALE), so it comes out in the same
+units as the hand-written evaluation (a man is about 50).
+
+This is a scaffold for experiments: networks trained this way have so far
+played weaker than the teacher, so no weights are shipped and the
+hand-written evaluation stays the default.
+
+Requires numpy (pip install numpy).
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utility.AnalysisCache import MemoryCache
+from utility.Board import Board
+from utility.MinMaxAgent import MinMaxAgent
+from utility.NeuralEvaluator import DEFAULT_WEIGHTS, NeuralEvaluator, feature_matrix
+
+SCALE = 200.0      # Score units per logit of win probability
+WIN_SCORE = 1000.0 # Stand-in for +/-inf (forced wins) in teacher labels
+
+# --- Self-play positions ---
+
+def self_play_game(seed, depth=3, epsilon=0.1, random_plies=6, max_plies=200):
+    """
+    Plays one game of the teacher (MinMaxAgent with the hand-written evaluation)
+    against itself and returns its positions as (black, red, kings, black_to_move,
+    teacher score from Red's point of view, result). Runs in a worker process.
+
+    The opening is 0 to random_plies random moves and afterwards each move is
+    random with probability epsilon, so games (and positions) differ.
+    """
+    rng = np.random.default_rng(seed)
+    cache = MemoryCache()
+    agents = {color: MinMaxAgent(color, depth, cache) for color in ('Red', 'Black')}
+    board = Board()
+    positions = []
+    opening = int(rng.integers(0, random_plies + 1))
+    jumping = None # The piece that must continue a multi-jump
+    result = 0.5 # Draw unless someone wins within max_plies
+    for ply in range(max_plies):
+        color = board.current_turn
+        moves = board.get_all_legal_moves(color)
+        if jumping is not None:
+            moves = [move for move in moves if move[0] == jumping]
+        if not moves:
+            result = 0.0 if color == 'Red' else 1.0
+            break
+        if ply < opening:
+            move = moves[rng.integers(len(moves))]
+        else:
+            agent = agents[color]
+            agent.runAI(board, jumping)
+            score, move = agent.get_best_move()
+            if jumping is None: # Only positions at the start of a turn are recorded
+                score = math.copysign(WIN_SCORE, score) if math.isinf(score) else score
+                positions.append((*board.to_masks(), color == 'Black', score if color == 'Red' else -score))
+            if rng.random() < epsilon:
+                move = moves[rng.integers(len(moves))]
+        mid_jump, _ = board.move_piece(*move)
+        jumping = move[1] if mid_jump else None
+    return [position + (result,) for position in positions]
+
+def self_play(games, depth=3, epsilon=0.1, workers=None, seed=0):
+    """
+    Plays `games` self-play games across a process pool. Returns a dict of
+    arrays: black, red, kings (uint32 masks), black_to_move (bool), teacher
+    (float32 search score) and result (1 / 0.5 / 0), all from Red's point of view.
+    """
+    seeds = [seed * 1_000_003 + game for game in range(games)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        rows = [row for game in pool.map(self_play_game, seeds, [depth] * games, [epsilon] * games,
+                                         chunksize=16) for row in game]
+    black, red, kings, black_to_move, teacher, result = zip(*rows)
+    return {'black': np.array(black, dtype=np.uint32), 'red': np.array(red, dtype=np.uint32),
+            'kings': np.array(kings, dtype=np.uint32), 'black_to_move': np.array(black_to_move, dtype=bool),
+            'teacher': np.array(teacher, dtype=np.float32), 'result': np.array(result, dtype=np.float32)}
+
+# --- Training ---
+
+class Network:
+    """Float32 training copy of the NeuralEvaluator architecture (clipped ReLU activations)."""
+
+    def __init__(self, hidden=64, hidden2=16, seed=0):
+        rng = np.random.default_rng(seed)
+        self.params = {
+            'w1': rng.normal(0, 1 / math.sqrt(24), (128, hidden)).astype(np.float32),
+            'b1': np.full(hidden, 0.1, dtype=np.float32),
+            'w2': rng.normal(0, 1 / math.sqrt(hidden), (hidden, hidden2)).astype(np.float32),
+            'b2': np.full(hidden2, 0.1, dtype=np.float32),
+            'w3': rng.normal(0, 10.0, hidden2).astype(np.float32),
+        }
+
+    def forward(self, inputs):
+        """inputs (N, 2, 128) -> (scores (N,), cache for backward)."""
+        p = self.params
+        a1 = inputs @ p['w1'] + p['b1']
+        h1 = np.clip(a1, 0.0, 1.0)
+        a2 = h1 @ p['w2'] + p['b2']
+        h2 = np.clip(a2, 0.0, 1.0)
+        towers = h2 @ p['w3']
+        return towers[:, 0] - towers[:, 1], (inputs, a1, h1, a2, h2)
+
+    def backward(self, grad_scores, cache):
+        """Gradients of all parameters given dLoss/dScore (N,)."""
+        inputs, a1, h1, a2, h2 = cache
+        p = self.params
+        grad_towers = np.stack([grad_scores, -grad_scores], axis=1)                 # (N, 2)
+        grads = {'w3': np.einsum('np,nph->h', grad_towers, h2)}
+        grad_a2 = grad_towers[:, :, None] * p['w3'] * ((a2 > 0) & (a2 < 1))           # (N, 2, H2)
+        grads['w2'] = np.einsum('nph,npk->hk', h1, grad_a2)
+        grads['b2'] = grad_a2.sum(axis=(0, 1))
+        grad_a1 = (grad_a2 @ p['w2'].T) * ((a1 > 0) & (a1 < 1))                       # (N, 2, H1)
+        grads['w1'] = np.einsum('npf,nph->fh', inputs, grad_a1)
+        grads['b1'] = grad_a1.sum(axis=(0, 1))
+        return grads
+
+    def loss(self, inputs, targets):
+        scores, _ = self.forward(inputs)
+        return float(np.mean((_sigmoid(scores / SCALE) - targets) ** 2))
+
+    def quantize(self, qa=255):
+        """The NeuralEvaluator with this network's weights (first layer as int16, scaled by qa)."""
+        p = self.params
+        w1 = np.clip(np.round(p['w1'] * qa), -32768, 32767).astype(np.int16)
+        b1 = np.clip(np.round(p['b1'] * qa), -32768, 32767).astype(np.int16)
+        return NeuralEvaluator(w1, b1, p['w2'], p['b2'], p['w3'], qa)
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def train(network, inputs, targets, epochs=40, batch_size=256, lr=2e-3, seed=0, log=print):
+    """Minibatch Adam on the squared error of the predicted win probability."""
+    rng = np.random.default_rng(seed)
+    moments = {name: (np.zeros_like(value), np.zeros_like(value)) for name, value in network.params.items()}
+    beta1, beta2, step = 0.9, 0.999, 0
+    split = max(1, len(targets) // 10) # Hold out 10% to watch for overfitting
+    valid_inputs, valid_targets = inputs[:split], targets[:split]
+    train_inputs, train_targets = inputs[split:], targets[split:]
+
+    for epoch in range(1, epochs + 1):
+        order = rng.permutation(len(train_targets))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            scores, cache = network.forward(train_inputs[batch])
+            predicted = _sigmoid(scores / SCALE)
+            grad_scores = 2 * (predicted - train_targets[batch]) * predicted * (1 - predicted) / SCALE / len(batch)
+            step += 1
+            for name, grad in network.backward(grad_scores, cache).items():
+                m, v = moments[name]
+                m *= beta1
+                m += (1 - beta1) * grad
+                v *= beta2
+                v += (1 - beta2) * grad * grad
+                m_hat, v_hat = m / (1 - beta1 ** step), v / (1 - beta2 ** step)
+                network.params[name] -= (lr * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+        if log and (epoch == 1 or epoch % 5 == 0 or epoch == epochs):
+            log(f"epoch {epoch:3d}: train {network.loss(train_inputs, train_targets):.5f}, "
+                f"validation {network.loss(valid_inputs, valid_targets):.5f}")
+    return network
+
+def targets_of(data, result_weight):
+    teacher = _sigmoid(data['teacher'].astype(np.float64) / SCALE)
+    return (result_weight * data['result'] + (1 - result_weight) * teacher).astype(np.float32)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the NeuralEvaluator network on self-play positions.")
+    parser.add_argument('--games', type=int, default=1000, help="Self-play games to collect positions from")
+    parser.add_argument('--teacher-depth', type=int, default=3, help="Search depth of the self-playing MinMaxAgent")
+    parser.add_argument('--epsilon', type=float, default=0.1, help="Probability of a random move in self-play")
+    parser.add_argument('--workers', type=int, default=None, help="Self-play processes (default: CPU count)")
+    parser.add_argument('--data', help="Train on positions saved by --save-data instead of playing new games")
+    parser.add_argument('--save-data', help="Save the labelled positions to this .npz file")
+    parser.add_argument('--result-weight', type=float, default=0.1, help="Weight of the game result in the target")
+    parser.add_argument('--hidden', type=int, nargs=2, default=[64, 16], metavar=('H1', 'H2'))
+    parser.add_argument('--epochs', type=int, default=40)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--lr', type=float, default=2e-3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=DEFAULT_WEIGHTS, help="Weights file to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.data:
+        with np.load(args.data) as saved:
+            data = {name: saved[name] for name in saved.files}
+    else:
+        data = self_play(args.games, args.teacher_depth, args.epsilon, args.workers, args.seed)
+        print(f"{len(data['result'])} positions from {args.games} games at depth {args.teacher_depth} "
+              f"({time.perf_counter() - start:.1f}s)")
+        if args.save_data:
+            np.savez_compressed(args.save_data, **data)
+
+    order = np.random.default_rng(args.seed).permutation(len(data['result']))
+    inputs = feature_matrix(data['black'][order], data['red'][order], data['kings'][order]).astype(np.float32)
+    targets = targets_of(data, args.result_weight)[order]
+
+    network = train(Network(*args.hidden, seed=args.seed), inputs, targets,
+                    args.epochs, args.batch_size, args.lr, args.seed)
+    evaluator = network.quantize()
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    evaluator.save(args.out)
+    print(f"Wrote {evaluator!r} to {args.out} ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
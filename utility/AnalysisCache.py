@@ -0,0 +1,213 @@
+# checkers/ai/analysis_cache.py
+"""
+Persistent, memory-mapped transposition table shared between sessions.
+
+The cache is a fixed-size file of 24 byte slots grouped into buckets of four.
+Every slot stores (key check, score, depth, bound, best move, age):
+
+    <Q check> <d score> <B depth> <B bound> <B from> <B to> <H age> <2x pad>
+
+Writes are lockless: the check field is key ^ data_lo ^ data_hi, so a reader
+that sees a half-written slot (two processes writing at once) computes the
+wrong key and simply treats it as a miss. Any number of processes may open
+the same file for reading and writing.
+
+Each time the file is opened its generation counter is bumped. Replacement
+inside a bucket prefers empty slots, then entries from older generations and
+then shallower entries, so deep results survive while stale ones age out.
+
+MemoryCache offers the same probe/store interface backed by a plain dict, for
+short-lived tables such as one analysis session.
+"""
+import mmap
+import os
+import struct
+
+from .Board import SQUARE_INDEX, SQUARES
+
+EXACT, LOWER, UPPER = 0, 1, 2 # Bound types: exact score, score >= value, score <= value
+NO_SQUARE = 0xFF
+
+_MAGIC = b'CKTT'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHQQ') # magic, version, slot size, slot count, generation
+_HEADER_SIZE = 64                  # Header is padded so slots stay 8-byte aligned
+_SLOT = struct.Struct('<QdBBBBH2x')
+_DATA = struct.Struct('<QQ')       # The two data words that are folded into the check
+SLOT_SIZE = _SLOT.size
+BUCKET_SLOTS = 4
+_MASK64 = (1 << 64) - 1
+
+AGE_WEIGHT = 2 # One generation of age costs as much as this many plies of depth
+
+class AnalysisCache:
+    """
+    A transposition table backed by a memory-mapped file.
+
+    probe(key) -> (depth, score, bound, move) or None
+    store(key, depth, score, bound, move)
+    where move is (piece_rc, target_rc) or None.
+    """
+
+    def __init__(self, path, size_mb=64):
+        """
+        Opens (or creates) the cache file.
+
+        Args:
+            path: File to use. Created with size_mb megabytes if it does not exist.
+            size_mb: Size for new files. Existing files keep their own size.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        if not os.path.exists(path) or os.path.getsize(path) < _HEADER_SIZE:
+            buckets = max(1, (size_mb * 1024 * 1024 - _HEADER_SIZE) // (SLOT_SIZE * BUCKET_SLOTS))
+            slot_count = buckets * BUCKET_SLOTS
+            with open(path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, SLOT_SIZE, slot_count, 0).ljust(_HEADER_SIZE, b'\0'))
+                f.truncate(_HEADER_SIZE + slot_count * SLOT_SIZE)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, version, slot_size, slot_count, generation = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION or slot_size != SLOT_SIZE:
+            self.close()
+            raise ValueError(f"{path} is not a compatible analysis cache file")
+
+        self.slot_count = slot_count
+        self.bucket_count = slot_count // BUCKET_SLOTS
+        # New session: results written from now on are "younger" than older sessions'
+        self.generation = (generation + 1) & 0xFFFF
+        _HEADER.pack_into(self._map, 0, magic, version, slot_size, slot_count, self.generation)
+
+    def __repr__(self):
+        return f"AnalysisCache({self.path!r}, {self.slot_count} slots, hit rate {self.hit_rate():.1%})"
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Opens the cache named by CHECKERS_ANALYSIS_CACHE (size for new files from
+        CHECKERS_ANALYSIS_CACHE_MB, default 64). Returns None when the variable is unset.
+        """
+        path = os.environ.get('CHECKERS_ANALYSIS_CACHE')
+        if not path:
+            return None
+        return cls(path, int(os.environ.get('CHECKERS_ANALYSIS_CACHE_MB', 64)))
+
+    def close(self):
+        """Flushes and closes the mapping."""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # --- Slot Access ---
+    def _bucket_offset(self, key):
+        return _HEADER_SIZE + (key % self.bucket_count) * BUCKET_SLOTS * SLOT_SIZE
+
+    def _read(self, offset):
+        """Returns (key, score, depth, bound, from, to, age) of a slot, or None if empty/torn."""
+        check, score, depth, bound, frm, to, age = _SLOT.unpack_from(self._map, offset)
+        if check == 0 and depth == 0:
+            return None
+        lo, hi = _DATA.unpack_from(self._map, offset + 8)
+        return check ^ lo ^ hi, score, depth, bound, frm, to, age
+
+    def probe(self, key):
+        key &= _MASK64
+        offset = self._bucket_offset(key)
+        for i in range(BUCKET_SLOTS):
+            slot = self._read(offset + i * SLOT_SIZE)
+            if slot and slot[0] == key:
+                _, score, depth, bound, frm, to, _ = slot
+                self.hits += 1
+                move = (SQUARES[frm], SQUARES[to]) if frm != NO_SQUARE else None
+                return depth, score, bound, move
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        key &= _MASK64
+        offset = self._bucket_offset(key)
+
+        # Pick the slot to (over)write: same key, else empty, else least valuable
+        victim, victim_value = None, None
+        for i in range(BUCKET_SLOTS):
+            slot_offset = offset + i * SLOT_SIZE
+            slot = self._read(slot_offset)
+            if slot is None:
+                value = float('-inf') # Empty slots are always the first choice
+            elif slot[0] == key:
+                if slot[2] > depth:
+                    return # Keep the deeper result for this position
+                victim = slot_offset
+                break
+            else:
+                age = (self.generation - slot[6]) & 0xFFFF
+                value = slot[2] - AGE_WEIGHT * age
+            if victim_value is None or value < victim_value:
+                victim, victim_value = slot_offset, value
+
+        frm, to = (SQUARE_INDEX[move[0]], SQUARE_INDEX[move[1]]) if move else (NO_SQUARE, NO_SQUARE)
+        # Pack with a zero check first, then fold the data words into the check
+        _SLOT.pack_into(self._map, victim, 0, score, min(depth, 255), bound, frm, to, self.generation)
+        lo, hi = _DATA.unpack_from(self._map, victim + 8)
+        struct.pack_into('<Q', self._map, victim, key ^ lo ^ hi)
+        self.stores += 1
+
+
+class MemoryCache:
+    """
+    An in-process transposition table with the AnalysisCache interface.
+    When max_entries is reached the table is simply cleared.
+    """
+
+    def __init__(self, max_entries=1_000_000):
+        self.max_entries = max_entries
+        self._entries = {} # key -> (depth, score, bound, move)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"MemoryCache({len(self._entries)} entries, hit rate {self.hit_rate():.1%})"
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._entries.clear()
+
+    def probe(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key, depth, score, bound, move=None):
+        old = self._entries.get(key)
+        if old is not None and old[0] > depth:
+            return # Keep the deeper result for this position
+        if old is None and len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (depth, score, bound, move)
+        self.stores += 1
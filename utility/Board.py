@@ -1,14 +1,86 @@
 # checkers/game/board.py
-import copy
+import struct
 from .Piece import Piece # Assumes Piece is available in the same directory
+from . import Zobrist
+from .Symmetry import mirror_masks
+
+# Dark squares in reading order from Black's side: index i (0-31), row 0 holds indices 0-3.
+# Standard PDN numbers squares from the first mover's side, and Red moves first,
+# so PDN square s is index 32 - s (Red's men start on 1-12, Black's on 21-32).
+SQUARES = [(r, c) for r in range(8) for c in range(8) if (r + c) % 2 != 0]
+SQUARE_INDEX = {rc: i for i, rc in enumerate(SQUARES)}
+
+# Compact encoding: Black mask, Red mask, King mask (uint32, bit i = SQUARES[i])
+# followed by the side to move (0 = Red, 1 = Black). 13 bytes in total.
+_POSITION_STRUCT = struct.Struct('<IIIB')
+POSITION_BYTES = _POSITION_STRUCT.size
+
+def _build_capture_tables():
+    """
+    JUMP_TABLE[(color, king)][i]: (over_rc, landing_rc, over_bit) of every jump a
+    piece of that kind on square i could make (same directions as _check_jump_moves).
+    CAPTURE_NEIGHBORHOOD[i]: squares whose jumps start at, go over or land on i.
+    MOVE_NEIGHBORHOOD[(from_index, to_index)]: the squares to recheck after a step
+    or jump between the two squares (the neighborhoods of from, to and the jumped
+    square), as (index, row, col).
+    """
+    all_dirs = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+    kinds = {('Red', False): ((-1, 1), (-1, -1)), ('Black', False): ((1, 1), (1, -1)),
+             ('Red', True): all_dirs, ('Black', True): all_dirs}
+    table = {kind: [] for kind in kinds}
+    neighborhood = [{i} for i in range(32)]
+    for i, (r, c) in enumerate(SQUARES):
+        for kind, dirs in kinds.items():
+            jumps = []
+            for dr, dc in dirs:
+                over, landing = (r + dr, c + dc), (r + 2 * dr, c + 2 * dc)
+                if landing in SQUARE_INDEX:
+                    jumps.append((over, landing, 1 << SQUARE_INDEX[over]))
+                    neighborhood[SQUARE_INDEX[over]].add(i)
+                    neighborhood[SQUARE_INDEX[landing]].add(i)
+            table[kind].append(tuple(jumps))
+    neighborhood = [frozenset(squares) for squares in neighborhood]
+    moves = {}
+    for i, (r, c) in enumerate(SQUARES):
+        for dr, dc in all_dirs:
+            for step in (1, 2):
+                target = SQUARE_INDEX.get((r + step * dr, c + step * dc))
+                if target is not None:
+                    squares = neighborhood[i] | neighborhood[target]
+                    if step == 2:
+                        squares |= neighborhood[SQUARE_INDEX[(r + dr, c + dc)]]
+                    moves[(i, target)] = tuple((j,) + SQUARES[j] for j in sorted(squares))
+    return table, neighborhood, moves
+
+JUMP_TABLE, CAPTURE_NEIGHBORHOOD, MOVE_NEIGHBORHOOD = _build_capture_tables()
+ALL_SQUARES = tuple((i, r, c) for i, (r, c) in enumerate(SQUARES))
+
+# Board.capture_mask: bit i (Red) or bit 32 + i (Black) is set when the piece on
+# SQUARES[i] can capture
+CAPTURE_SHIFT = {'Red': 0, 'Black': 32}
+_CAPTURE_BIT = {color: [1 << (shift + i) for i in range(32)] for color, shift in CAPTURE_SHIFT.items()}
+_CLEAR_SQUARE = [~((1 << i) | (1 << (32 + i))) & (1 << 64) - 1 for i in range(32)]
 
 class Board:
     """Manages the 8x8 checkers board state and game rules."""
+
+    # Callbacks listener(board, move) after every move_piece (and make_move), with
+    # move = (from_index, to_index, captured_index or None, promoted, must_multijump)
+    # in square indices, or move = None after unmake_move. Only boards that got
+    # add_move_listener() have a list of their own; copies never inherit it, so
+    # search boards pay nothing.
+    move_listeners = ()
     
     def __init__(self):
         self.board = self._init_board()
         self.current_turn = 'Red' # Red starts first
         self.taken_pieces = {'Red': 0, 'Black': 0}
+        # Pieces that can capture, as one int (see CAPTURE_SHIFT). Kept up to date
+        # by move_piece / unmake_move, which only recheck the pieces within jumping
+        # distance of the move; being an int, copies of the board share it for free.
+        self.capture_mask = self._compute_captures()
+        self.zobrist_key = self.compute_key() # Kept up to date incrementally by move_piece
+        self.mirror_key = self.compute_mirror_key() # Same for the color-swapped mirror image
 
     def __repr__(self):
         """A simple representation of the board for debugging."""
@@ -37,24 +109,162 @@ class Board:
         Returns a completely independent copy of the current Board state,
         including all Piece objects, for MinMax simulation.
         """
-        # Create a new Board instance
-        new_board_state = Board() 
+        # Create a new Board instance without building the starting position
+        new_board_state = Board.__new__(Board)
         
-        # Deep copy the piece data structure (list of lists)
-        new_board_state.board = copy.deepcopy(self.board)
+        # Copy the piece grid by hand; copy.deepcopy is several times slower
+        # because it has to track the whole object graph.
+        grid = []
+        for row in self.board:
+            new_row = []
+            for piece in row:
+                if piece:
+                    new_piece = Piece(piece.row, piece.col, piece.color)
+                    if piece.king:
+                        new_piece.make_king()
+                    piece = new_piece
+                new_row.append(piece)
+            grid.append(new_row)
+        new_board_state.board = grid
         
         # Copy scalar attributes
         new_board_state.current_turn = self.current_turn
         new_board_state.taken_pieces = self.taken_pieces.copy()
-        
-        # It is crucial to update the row/col references in the new pieces
-        # to point to the correct Piece objects in the new board state, 
-        # though deepcopy of the 2D list of mutable objects handles this correctly.
-        # However, because Piece objects store their own (r, c), a standard
-        # deepcopy will create new Piece objects with correct internal (r, c)
-        # and the board array will reference the new ones.
+        new_board_state.capture_mask = self.capture_mask
+        new_board_state.zobrist_key = self.zobrist_key
+        new_board_state.mirror_key = self.mirror_key
         return new_board_state
 
+    # --- Move Events ---
+    def add_move_listener(self, listener):
+        """Calls listener(board, move) after every move on this board (see move_listeners)."""
+        if not self.move_listeners:
+            self.move_listeners = []
+        self.move_listeners.append(listener)
+
+    def remove_move_listener(self, listener):
+        if listener in self.move_listeners:
+            self.move_listeners.remove(listener)
+
+    def _notify(self, move):
+        for listener in list(self.move_listeners):
+            listener(self, move)
+
+    # --- Hashing ---
+    def compute_key(self):
+        """Computes the 64-bit Zobrist key of the position from scratch."""
+        black, red, kings = self.to_masks()
+        return Zobrist.hash_masks(black, red, kings, self.current_turn == 'Black')
+
+    def compute_mirror_key(self):
+        """Computes the key of the mirrored position (see Symmetry) from scratch."""
+        return Zobrist.hash_masks(*mirror_masks(*self.to_masks(), self.current_turn == 'Black'))
+
+    # --- Serialization ---
+    def to_masks(self):
+        """Returns (black_mask, red_mask, king_mask) with bit i set for SQUARES[i] (PDN square 32 - i)."""
+        black = red = kings = 0
+        board = self.board
+        for i, (r, c) in enumerate(SQUARES):
+            piece = board[r][c]
+            if piece:
+                bit = 1 << i
+                if piece.color == 'Black':
+                    black |= bit
+                else:
+                    red |= bit
+                if piece.king:
+                    kings |= bit
+        return black, red, kings
+
+    @classmethod
+    def from_masks(cls, black, red, kings, current_turn='Red'):
+        """Builds a Board from square bitmasks (see to_masks)."""
+        new_board = cls.__new__(cls)
+        grid = [[None] * 8 for _ in range(8)]
+        for i, (r, c) in enumerate(SQUARES):
+            bit = 1 << i
+            if (black | red) & bit:
+                piece = Piece(r, c, 'Black' if black & bit else 'Red')
+                if kings & bit:
+                    piece.make_king()
+                grid[r][c] = piece
+        new_board.board = grid
+        new_board.current_turn = current_turn
+        # Captures are not part of a position; derive them from the missing pieces
+        new_board.taken_pieces = {'Red': 12 - bin(red).count('1'), 'Black': 12 - bin(black).count('1')}
+        new_board.capture_mask = new_board._compute_captures()
+        new_board.zobrist_key = Zobrist.hash_masks(black, red, kings, current_turn == 'Black')
+        new_board.mirror_key = Zobrist.hash_masks(*mirror_masks(black, red, kings, current_turn == 'Black'))
+        return new_board
+
+    def to_bytes(self):
+        """Compact canonical encoding of the position: 13 bytes (3 x uint32 masks + side to move)."""
+        black, red, kings = self.to_masks()
+        return _POSITION_STRUCT.pack(black, red, kings, 1 if self.current_turn == 'Black' else 0)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuilds a Board from to_bytes() output."""
+        black, red, kings, side = _POSITION_STRUCT.unpack(data)
+        return cls.from_masks(black, red, kings, 'Black' if side else 'Red')
+
+    def __reduce__(self):
+        # Pickle (e.g. through process pools) as the 13 byte encoding instead of the object graph
+        return (Board.from_bytes, (self.to_bytes(),))
+
+    def to_fen(self):
+        """
+        FEN-style text of the position, using the PDN FEN layout and square
+        numbers with R/B colors: 'R:R1,2,K5:B21,22,K30' (side to move, then
+        each color's squares, K = king).
+        """
+        black, red, kings = self.to_masks()
+        fields = [self.current_turn[0]]
+        for letter, mask in (('R', red), ('B', black)):
+            squares = [('K' if kings & (1 << i) else '') + str(32 - i) for i in range(31, -1, -1) if mask & (1 << i)]
+            fields.append(letter + ','.join(squares))
+        return ':'.join(fields)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Parses to_fen() output. Square ranges ('1-12') are accepted too, and so
+        is standard PDN FEN with W/B colors: there B is the first mover (Red)
+        and W the second (Black). Raises ValueError on malformed input.
+        """
+        fen = fen.strip().rstrip('.')
+        fields = fen.split(':')
+        if any(field[:1].upper() == 'W' for field in fields):
+            colors = {'B': 'Red', 'W': 'Black'}
+        else:
+            colors = {'R': 'Red', 'B': 'Black'}
+        if len(fields) != 3 or fields[0].upper() not in colors:
+            raise ValueError(f"Malformed FEN: {fen!r}")
+
+        masks = {'Red': 0, 'Black': 0}
+        kings = 0
+        for field in fields[1:]:
+            color = colors.get(field[:1].upper())
+            if color is None:
+                raise ValueError(f"Malformed FEN field: {field!r}")
+            for item in filter(None, field[1:].split(',')):
+                is_king = item.startswith('K')
+                item = item.lstrip('K')
+                first, _, last = item.partition('-')
+                try:
+                    squares = range(int(first), int(last or first) + 1)
+                except ValueError:
+                    raise ValueError(f"Malformed FEN square: {item!r}") from None
+                for square in squares:
+                    if not 1 <= square <= 32:
+                        raise ValueError(f"FEN square out of range: {square}")
+                    masks[color] |= 1 << (32 - square)
+                    if is_king:
+                        kings |= 1 << (32 - square)
+
+        return cls.from_masks(masks['Black'], masks['Red'], kings, colors[fields[0].upper()])
+
 
     # --- Utility Methods ---
     def _is_on_board(self, r, c):
@@ -76,6 +286,39 @@ class Board:
                     pieces.append(piece)
         return pieces
 
+    # --- Capture Tracking ---
+    def capturers(self, color):
+        """Mask of color's pieces that can capture (bit i = SQUARES[i])."""
+        return (self.capture_mask >> CAPTURE_SHIFT[color]) & 0xFFFFFFFF
+
+    def must_capture(self, color):
+        """True if color has a capture available (and so must capture), in O(1)."""
+        return (self.capture_mask >> CAPTURE_SHIFT[color]) & 0xFFFFFFFF != 0
+
+    def _compute_captures(self):
+        """The capture mask (see __init__) of the current grid, from scratch."""
+        self.capture_mask = 0
+        self._refresh_captures(ALL_SQUARES)
+        return self.capture_mask
+
+    def _refresh_captures(self, squares):
+        """Rechecks the jumps of the pieces on squares, given as (index, row, col)."""
+        grid = self.board
+        mask = self.capture_mask
+        for i, r, c in squares:
+            mask &= _CLEAR_SQUARE[i]
+            piece = grid[r][c]
+            if piece is None:
+                continue
+            color = piece.color
+            for (o_r, o_c), (l_r, l_c), _ in JUMP_TABLE[(color, piece.king)][i]:
+                if grid[l_r][l_c] is None:
+                    over = grid[o_r][o_c]
+                    if over is not None and over.color != color:
+                        mask |= _CAPTURE_BIT[color][i]
+                        break
+        self.capture_mask = mask
+
     # --- Movement/Rule Methods ---
 
     def _check_jump_moves(self, piece):
@@ -114,11 +357,8 @@ class Board:
             return jump_moves
         
         # 2. Check if a *different* piece must jump (mandatory jump rule)
-        player_pieces = self._get_player_pieces(piece.color)
-        for other_piece in player_pieces:
-            # We must check ALL pieces for jumps
-            if self._check_jump_moves(other_piece):
-                return {} # A different piece has a mandatory jump, so this piece cannot move non-jump
+        if self.must_capture(piece.color):
+            return {} # A different piece has a mandatory jump, so this piece cannot move non-jump
 
         # 3. If no jumps are available anywhere, check for simple non-jump moves
         moves = {}
@@ -153,8 +393,14 @@ class Board:
         self.board[t_r][t_c] = piece
         self.board[p_r][p_c] = None
         piece.row, piece.col = t_r, t_c # IMPORTANT: Update piece's internal coordinates
+        from_index, to_index = SQUARE_INDEX[(p_r, p_c)], SQUARE_INDEX[(t_r, t_c)]
+        piece_keys = Zobrist.PIECE_KEYS[(piece.color, piece.king)]
+        self.zobrist_key ^= piece_keys[from_index] ^ piece_keys[to_index]
+        mirror_keys = Zobrist.MIRROR_KEYS[(piece.color, piece.king)]
+        self.mirror_key ^= mirror_keys[from_index] ^ mirror_keys[to_index]
         
         status_message = ""
+        mid_index = None
 
         # 2. Handle capture if a jump occurred
         if captured_piece:
@@ -163,30 +409,142 @@ class Board:
             # For simplicity, we just check the square we jumped over.
             mid_r = (p_r + t_r) // 2
             mid_c = (p_c + t_c) // 2
+            jumped = self.board[mid_r][mid_c]
+            if jumped:
+                mid_index = SQUARE_INDEX[(mid_r, mid_c)]
+                self.zobrist_key ^= Zobrist.PIECE_KEYS[(jumped.color, jumped.king)][mid_index]
+                self.mirror_key ^= Zobrist.MIRROR_KEYS[(jumped.color, jumped.king)][mid_index]
             self.board[mid_r][mid_c] = None # Remove the captured piece
             
             opponent_color = 'Black' if piece.color == 'Red' else 'Red'
             self.taken_pieces[opponent_color] += 1
+            self._refresh_captures(MOVE_NEIGHBORHOOD[(from_index, to_index)])
             
             # Check for multi-jump opportunity
-            if self._check_jump_moves(piece):
+            if self.capture_mask & _CAPTURE_BIT[piece.color][to_index]:
                 status_message = f"{piece.color} must make another jump!"
+                if self.move_listeners:
+                    self._notify((from_index, to_index, mid_index, False, True))
                 return True, status_message # Multi-jump: turn does NOT switch
-        
+        else:
+            self._refresh_captures(MOVE_NEIGHBORHOOD[(from_index, to_index)])
+
         # 3. Handle Kinging
+        promoted = False
         if not piece.king:
             # Red kings at row 0, Black kings at row 7
             if (piece.color == 'Red' and t_r == 0) or (piece.color == 'Black' and t_r == 7):
                 piece.make_king()
+                self.zobrist_key ^= Zobrist.PIECE_KEYS[(piece.color, False)][to_index] ^ Zobrist.PIECE_KEYS[(piece.color, True)][to_index]
+                self.mirror_key ^= Zobrist.MIRROR_KEYS[(piece.color, False)][to_index] ^ Zobrist.MIRROR_KEYS[(piece.color, True)][to_index]
                 status_message = f"{piece.color} Kinged!"
+                promoted = True
+                self._refresh_captures(((to_index, t_r, t_c),)) # A king jumps in more directions
         
         # 4. End turn and switch player
         self.current_turn = 'Black' if self.current_turn == 'Red' else 'Red'
+        self.zobrist_key ^= Zobrist.BLACK_TO_MOVE
+        self.mirror_key ^= Zobrist.BLACK_TO_MOVE # The mirror's side to move flips as well
         if not status_message:
              status_message = f"It's {self.current_turn}'s turn."
+        if self.move_listeners:
+            self._notify((from_index, to_index, mid_index, promoted, False))
              
         return False, status_message # No multi-jump, turn switched
 
+    def masks_after(self, piece_rc, target_rc, captured_piece=None, masks=None):
+        """
+        The to_masks() of the position after a move, without copying or
+        changing the board (e.g. to evaluate search leaves in a batch).
+        masks: this board's to_masks(), if the caller already has them.
+        Returns: (black, red, kings, must_multijump)
+        """
+        black, red, kings = masks or self.to_masks()
+        piece = self.board[piece_rc[0]][piece_rc[1]]
+        from_bit, to_bit = 1 << SQUARE_INDEX[piece_rc], 1 << SQUARE_INDEX[target_rc]
+        own, opponent = (black, red) if piece.color == 'Black' else (red, black)
+        own ^= from_bit | to_bit
+        if piece.king:
+            kings ^= from_bit | to_bit
+
+        if captured_piece:
+            mid_rc = ((piece_rc[0] + target_rc[0]) // 2, (piece_rc[1] + target_rc[1]) // 2)
+            mid_bit = 1 << SQUARE_INDEX[mid_rc]
+            opponent &= ~mid_bit
+            kings &= ~mid_bit
+            # Same test as _check_jump_moves, on the masks
+            t_r, t_c = target_rc
+            occupied = own | opponent
+            for dr, dc in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                if not piece.king and dr != (-1 if piece.color == 'Red' else 1):
+                    continue
+                landing = SQUARE_INDEX.get((t_r + 2 * dr, t_c + 2 * dc))
+                if landing is not None and not occupied >> landing & 1 and opponent >> SQUARE_INDEX[(t_r + dr, t_c + dc)] & 1:
+                    black, red = (own, opponent) if piece.color == 'Black' else (opponent, own)
+                    return black, red, kings, True
+
+        # Kinging (only when the turn ends, as in move_piece)
+        if not piece.king and target_rc[0] == (0 if piece.color == 'Red' else 7):
+            kings |= to_bit
+        black, red = (own, opponent) if piece.color == 'Black' else (opponent, own)
+        return black, red, kings, False
+
+    # --- Make/Unmake (undo records) ---
+
+    def make_move(self, piece_rc, target_rc, captured_piece=None):
+        """
+        Same as move_piece, but also returns a compact undo record that
+        unmake_move() uses to restore the previous position in O(1).
+        Returns: (must_multijump, status_message, undo)
+        """
+        piece = self.board[piece_rc[0]][piece_rc[1]]
+        if not piece:
+            return False, "", None
+        was_king = piece.king
+        jumped = None
+        if captured_piece:
+            jumped = self.board[(piece_rc[0] + target_rc[0]) // 2][(piece_rc[1] + target_rc[1]) // 2]
+        previous_keys, previous_turn = (self.zobrist_key, self.mirror_key), self.current_turn
+
+        must_multijump, status_message = self.move_piece(piece_rc, target_rc, captured_piece)
+
+        # (from square, to square, captured code, kinged, black was to move, previous keys)
+        # captured code: 0 = no capture, else 1 + is_black + 2 * is_king of the jumped piece
+        captured_code = 0
+        if jumped:
+            captured_code = 1 + (jumped.color == 'Black') + 2 * jumped.king
+        undo = (SQUARE_INDEX[piece_rc], SQUARE_INDEX[target_rc], captured_code,
+                piece.king and not was_king, previous_turn == 'Black', previous_keys)
+        return must_multijump, status_message, undo
+
+    def unmake_move(self, undo):
+        """Takes back the move that produced the undo record (must be the last one made)."""
+        from_index, to_index, captured_code, kinged, black_to_move, previous_keys = undo
+        p_r, p_c = SQUARES[from_index]
+        t_r, t_c = SQUARES[to_index]
+
+        piece = self.board[t_r][t_c]
+        self.board[p_r][p_c] = piece
+        self.board[t_r][t_c] = None
+        piece.row, piece.col = p_r, p_c
+        if kinged:
+            piece.unmake_king()
+
+        if captured_code:
+            color = 'Black' if (captured_code - 1) & 1 else 'Red'
+            mid_r, mid_c = (p_r + t_r) // 2, (p_c + t_c) // 2
+            restored = Piece(mid_r, mid_c, color)
+            if (captured_code - 1) & 2:
+                restored.make_king()
+            self.board[mid_r][mid_c] = restored
+            self.taken_pieces[color] -= 1
+        self._refresh_captures(MOVE_NEIGHBORHOOD[(from_index, to_index)])
+
+        self.current_turn = 'Black' if black_to_move else 'Red'
+        self.zobrist_key, self.mirror_key = previous_keys
+        if self.move_listeners:
+            self._notify(None) # Not a move: listeners resynchronize from the position
+
     def get_game_state(self):
         """
         Checks for game over conditions.
@@ -199,10 +557,10 @@ class Board:
         if self.taken_pieces['Black'] == 12:
             return 'Red Wins!', True
 
-        # Check if the current player has no legal moves
-        current_player_pieces = self._get_player_pieces(self.current_turn)
-        # Check if ANY piece for the current player has ANY valid move
-        has_valid_move = any(self.get_valid_moves(piece) for piece in current_player_pieces)
+        # Check if the current player has no legal moves: a capture is always one,
+        # otherwise ANY piece for the current player must have a simple move
+        has_valid_move = self.must_capture(self.current_turn) or any(
+            self.get_valid_moves(piece) for piece in self._get_player_pieces(self.current_turn))
         
         if not has_valid_move:
             winner = 'Black' if self.current_turn == 'Red' else 'Red'
@@ -218,18 +576,22 @@ class Board:
         (piece_rc, target_rc, captured_piece)
         """
         all_moves = []
-        player_pieces = self._get_player_pieces(color)
-
-        # 1. Check for mandatory jumps first (standard checkers rule)
-        all_jumps = []
-        for piece in player_pieces:
-            jumps = self._check_jump_moves(piece) 
-            for target_rc, captured_piece in jumps.items():
-                all_jumps.append(((piece.row, piece.col), target_rc, captured_piece))
 
-        if all_jumps:
+        # 1. Check for mandatory jumps first (standard checkers rule); only the
+        # pieces in the capture mask can jump, in board order as before
+        capturers = self.capturers(color)
+        if capturers:
+            all_jumps = []
+            while capturers:
+                low = capturers & -capturers
+                capturers ^= low
+                r, c = SQUARES[low.bit_length() - 1]
+                piece = self.board[r][c]
+                for target_rc, captured_piece in self._check_jump_moves(piece).items():
+                    all_jumps.append(((r, c), target_rc, captured_piece))
             # If jumps are available, only return jumps
             return all_jumps
+        player_pieces = self._get_player_pieces(color)
         
         # 2. If no jumps are available, check for simple non-jump moves
         for piece in player_pieces:
@@ -0,0 +1,36 @@
+import time
+
+class MonotonicClock:
+    """
+    A millisecond clock built on time.monotonic().
+
+    Drop-in replacement for pygame.time.get_ticks() so that timers and the game
+    controller can run without pygame (batch workers, servers, scripts).
+    """
+
+    def __init__(self):
+        self._origin = time.monotonic()
+
+    def get_ticks(self) -> int:
+        """Returns the milliseconds elapsed since the clock was created."""
+        return int((time.monotonic() - self._origin) * 1000)
+
+
+class ManualClock:
+    """
+    A clock that only moves when told to.
+
+    Useful for running timer-driven code (like the AI move delay) programmatically
+    without actually waiting.
+    """
+
+    def __init__(self, start_ms: int = 0):
+        self.now = start_ms
+
+    def advance(self, ms: int):
+        """Moves the clock forward by ms milliseconds."""
+        self.now += ms
+
+    def get_ticks(self) -> int:
+        """Returns the current time in milliseconds."""
+        return self.now
@@ -0,0 +1,86 @@
+# checkers/ai/eval_cache.py
+"""
+Direct-mapped cache of leaf evaluations, keyed by Zobrist key.
+
+Transpositions and iterative re-searches reach the same leaves again and
+again; each time the evaluation scans the whole board (and its threat and
+endgame terms) anew. EvalCache remembers the score of the last position seen
+in each of its slots:
+
+    slot = key & (size - 1)          (size is a power of two)
+
+A slot holds (key, score) and a position replaces whatever was in its slot,
+so lookups and stores are O(1) and the memory is fixed. The full 64-bit key
+is compared, so a different position in the slot is a miss, not a wrong
+score. Entries are single tuples, so threads sharing a cache (e.g. hints and
+the game's AI) never see a key with another position's score.
+
+It is separate from the transposition table: it stores static evaluations
+only, no search results, depths or bounds. Scores are kept from Red's point
+of view (Evaluator scores are color-symmetric), so the agents of both colors
+share entries. The cache remembers the signature of the evaluator that
+filled it and empties itself when asked to score with another one, e.g.
+after new weights were loaded; evaluators without a signature are not cached.
+
+    cache = EvalCache(size=1 << 18)
+    agent = MinMaxAgent('Black', 5, eval_cache=cache)
+"""
+
+DEFAULT_SIZE = 1 << 16 # Slots; about 5 MB with the cached score objects
+
+class EvalCache:
+    """Fixed-size, direct-mapped evaluation cache (see the module docstring)."""
+
+    def __init__(self, size=DEFAULT_SIZE):
+        """
+        Args:
+            size: Number of slots, rounded up to a power of two.
+        """
+        self.size = 1 << max(0, size - 1).bit_length()
+        self._mask = self.size - 1
+        self._slots = [None] * self.size # (key, score from Red's point of view) or None
+        self.signature = None            # Signature of the evaluator the entries belong to
+        self.hits = 0
+        self.misses = 0
+        self.replaced = 0                # Stores that evicted another position
+        self.invalidations = 0
+
+    def __repr__(self):
+        return f"EvalCache({self.size} slots, hit rate {self.hit_rate():.1%})"
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'size': self.size, 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hit_rate(), 4), 'replaced': self.replaced,
+                'invalidations': self.invalidations}
+
+    def clear(self):
+        self._slots = [None] * self.size
+
+    def evaluate(self, board, color, evaluator):
+        """evaluator.evaluate(board, color), answered from the cache when possible."""
+        if evaluator.signature != self.signature:
+            if evaluator.signature is None:
+                return evaluator.evaluate(board, color)
+            # Scores of another evaluation (or other weights): start over
+            if self.signature is not None:
+                self.clear()
+                self.invalidations += 1
+            self.signature = evaluator.signature
+
+        key = board.zobrist_key
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            score = entry[1]
+        else:
+            self.misses += 1
+            if entry is not None:
+                self.replaced += 1
+            score = evaluator.evaluate(board, 'Red')
+            self._slots[index] = (key, score)
+        return score if color == 'Red' else -score
@@ -0,0 +1,205 @@
+# checkers/ai/evaluation.py
+"""
+Table-driven, phase-aware position evaluation.
+
+PhasedEvaluator scores a position with two sets of piece-square tables, one
+for the opening/middlegame and one for the endgame, and blends them by the
+number of pieces left (24 pieces = pure middlegame, none = pure endgame):
+
+    score = eg + (mg - eg) * phase,   phase = pieces / 24
+
+Middlegame tables reward advancement, the centre and keeping the back rank;
+endgame tables reward running men to the king row and centralized kings.
+The threat scan (pieces en prise) only runs while the board is crowded
+enough for it to matter, and sparse positions add an endgame term: king
+mobility, plus pulling the stronger side's kings towards the enemy pieces so
+won endgames are actually converted.
+
+All tables are built for Red and mirrored for Black (square i <-> 31 - i, see
+Symmetry), so the evaluation is exactly color-symmetric, which the canonical
+cache keys of MinMaxAgent rely on. Scores are from Red's point of view
+internally; evaluate(board, color) returns them from color's point of view.
+
+Evaluator is the interface MinMaxAgent expects; other implementations (e.g.
+NeuralEvaluator) must be color-symmetric in the same way.
+"""
+from abc import ABC, abstractmethod
+
+from .Board import Board, SQUARES, SQUARE_INDEX, JUMP_TABLE, CAPTURE_SHIFT
+
+# --- Weights ---
+MAN_VALUE = 50.0
+KING_VALUE = 100.0
+MG_ADVANCEMENT = 2.0    # Per row advanced
+EG_ADVANCEMENT = 4.0    # Men should run for the king row once the board empties
+CENTER_BONUS = 5.0      # Rows/cols 2-5
+BACK_RANK_BONUS = 8.0   # Men guarding their own king row in the middlegame
+EG_KING_CENTER = 3.0    # Per step closer to the centre
+THREAT_PENALTY = 20.0   # Per own piece the opponent can capture
+JUMP_BONUS = 10.0       # Per own piece that can capture
+KING_MOBILITY = 2.0     # Per empty square next to a king (endgame)
+CHASE_WEIGHT = 6.0      # Per square of distance between a stronger side's king and the nearest enemy
+TRADE_BONUS = 2.0       # Per captured piece while ahead in material (simplify when winning)
+
+THREAT_MIN_PHASE = 0.33 # Below 8 pieces the threat scan is skipped
+FULL_BOARD = 24
+
+# Piece kinds index the tables: 0 Red man, 1 Red king, 2 Black man, 3 Black king
+KIND = {('Red', False): 0, ('Red', True): 1, ('Black', False): 2, ('Black', True): 3}
+SIGN = (1.0, 1.0, -1.0, -1.0)
+
+
+def _red_tables():
+    """(mg, eg) tables for the Red man and king, indexed by square."""
+    mg_man, eg_man, mg_king, eg_king = [], [], [], []
+    for r, c in SQUARES:
+        central = CENTER_BONUS if 2 <= r <= 5 and 2 <= c <= 5 else 0.0
+        advanced = 7 - r # Red moves up towards row 0
+        mg_man.append(MAN_VALUE + MG_ADVANCEMENT * advanced + central + (BACK_RANK_BONUS if r == 7 else 0.0))
+        eg_man.append(MAN_VALUE + EG_ADVANCEMENT * advanced)
+        mg_king.append(KING_VALUE + central)
+        centre_distance = max(abs(2 * r - 7), abs(2 * c - 7)) // 2 # 0 (centre) - 3 (edge)
+        eg_king.append(KING_VALUE + EG_KING_CENTER * (3 - centre_distance))
+    return (mg_man, mg_king), (eg_man, eg_king)
+
+def _build_tables():
+    """MG[kind][square] and EG[kind][square], signed so Red is positive."""
+    (mg_man, mg_king), (eg_man, eg_king) = _red_tables()
+    mg, eg = [], []
+    for red_mg, red_eg in ((mg_man, eg_man), (mg_king, eg_king)):
+        mg.append(red_mg)
+        eg.append(red_eg)
+    for red_mg, red_eg in ((mg_man, eg_man), (mg_king, eg_king)):
+        # Black's table is Red's mirrored: square i <-> 31 - i, negated
+        mg.append([-v for v in reversed(red_mg)])
+        eg.append([-v for v in reversed(red_eg)])
+    return mg, eg
+
+MG_TABLE, EG_TABLE = _build_tables()
+
+def _build_neighbors():
+    """NEIGHBORS[sq]: adjacent squares."""
+    index = {rc: i for i, rc in enumerate(SQUARES)}
+    return [[index[(r + dr, c + dc)] for dr in (-1, 1) for dc in (-1, 1) if (r + dr, c + dc) in index]
+            for r, c in SQUARES]
+
+NEIGHBORS = _build_neighbors()
+
+def _build_jumps():
+    """JUMPS[kind][sq]: (over bit, landing bit) of every jump from sq (Board.JUMP_TABLE as bits)."""
+    jumps = [None] * 4
+    for (color, king), table in JUMP_TABLE.items():
+        jumps[KIND[(color, king)]] = [tuple((over_bit, 1 << SQUARE_INDEX[landing]) for _, landing, over_bit in square)
+                                      for square in table]
+    return jumps
+
+JUMPS = _build_jumps()
+# Manhattan distance between two squares, for the endgame chase term (it keeps
+# rewarding a king that closes in diagonally, unlike the king-move distance)
+DISTANCE = [[abs(r1 - r2) + abs(c1 - c2) for r2, c2 in SQUARES] for r1, c1 in SQUARES]
+_SQUARE_LIST = list(enumerate(SQUARES))
+
+
+class Evaluator(ABC):
+    """
+    Interface of a position evaluation for MinMaxAgent.
+
+    Subclasses must implement evaluate() (a subclass without it cannot be
+    instantiated) and set a signature string that changes
+    whenever their scores change (it salts the transposition table keys).
+    Evaluators whose evaluate_batch() is cheaper per position than evaluate()
+    set batched = True, and the search then scores sibling leaves together,
+    straight from their masks without building a Board for each.
+    """
+
+    signature = None
+    batched = False
+
+    @abstractmethod
+    def evaluate(self, board, color):
+        """Score of board from color's point of view."""
+
+    def evaluate_batch(self, positions, color):
+        """Scores of several (black, red, kings) mask triples (see Board.to_masks) from color's point of view."""
+        return [self.evaluate(Board.from_masks(*masks), color) for masks in positions]
+
+
+class PhasedEvaluator(Evaluator):
+    """Piece-square tables blended by phase, with threat and endgame terms."""
+
+    signature = "phased-1" # Part of the cache key salt; change with any weight or table change
+
+    def evaluate(self, board, color):
+        """Score of board from color's point of view."""
+        grid = board.board
+        mg = eg = 0.0
+        red = black = 0   # Occupancy bitboards (bit i = square i)
+        pieces = []       # (square, kind)
+        for i, (r, c) in _SQUARE_LIST:
+            piece = grid[r][c]
+            if piece is not None:
+                kind = KIND[(piece.color, piece.king)]
+                mg += MG_TABLE[kind][i]
+                eg += EG_TABLE[kind][i]
+                pieces.append((i, kind))
+                if kind < 2:
+                    red |= 1 << i
+                else:
+                    black |= 1 << i
+
+        phase = len(pieces) / FULL_BOARD
+        score = eg + (mg - eg) * phase
+
+        if phase >= THREAT_MIN_PHASE:
+            score += self._threats(board, red, black) * phase
+        if phase < 1.0:
+            score += self._endgame(pieces, red, black) * (1.0 - phase)
+        return score if color == 'Red' else -score
+
+    @staticmethod
+    def _threats(board, red, black):
+        """
+        Pieces en prise (penalty) and pieces able to capture (bonus), Red positive.
+        Only the pieces in the board's capture mask (see Board.capture_mask) can
+        jump, so only their jumps are looked at.
+        """
+        grid = board.board
+        occupied = red | black
+        threatened = 0 # Bits of pieces some enemy can jump
+        counts = {}
+        for color, enemies in (('Red', black), ('Black', red)):
+            capturers = (board.capture_mask >> CAPTURE_SHIFT[color]) & 0xFFFFFFFF
+            counts[color] = bin(capturers).count('1')
+            while capturers:
+                low = capturers & -capturers
+                capturers ^= low
+                i = low.bit_length() - 1
+                r, c = SQUARES[i]
+                for over_bit, landing_bit in JUMPS[KIND[(color, grid[r][c].king)]][i]:
+                    if over_bit & enemies and not landing_bit & occupied:
+                        threatened |= over_bit
+        score = JUMP_BONUS * (counts['Red'] - counts['Black'])
+        score -= THREAT_PENALTY * bin(threatened & red).count('1')
+        score += THREAT_PENALTY * bin(threatened & black).count('1')
+        return score
+
+    @staticmethod
+    def _endgame(pieces, red, black):
+        """King mobility, chasing with the stronger side's kings and trading down when ahead, Red positive."""
+        occupied = red | black
+        red_count, black_count = bin(red).count('1'), bin(black).count('1')
+        ahead = (red_count > black_count) - (red_count < black_count) # +1 Red ahead, -1 Black ahead
+        score = 0.0
+        for square, kind in pieces:
+            if kind & 1: # King
+                mobility = sum(1 for n in NEIGHBORS[square] if not occupied >> n & 1)
+                score += KING_MOBILITY * mobility * SIGN[kind]
+                if ahead and SIGN[kind] == ahead:
+                    nearest = min((DISTANCE[square][i] for i, k in pieces if (k < 2) != (kind < 2)), default=0)
+                    score -= CHASE_WEIGHT * nearest * ahead
+        if ahead:
+            score += TRADE_BONUS * (FULL_BOARD - red_count - black_count) * ahead
+        return score
+
+
+DEFAULT_EVALUATOR = PhasedEvaluator()
@@ -0,0 +1,320 @@
+# checkers/game/controller.py
+import threading
+
+from .Board import Board
+from .MinMaxAgent import MinMaxAgent, SearchAborted
+from .AnalysisCache import MemoryCache
+from .Timer import Timer
+from .Clock import MonotonicClock
+from .PDN import PDNGame
+from .Profiler import profiler
+from .ProofNumberSearch import ProofNumberSearch
+from .EvalCache import EvalCache
+
+HINT_DEPTH = 7 # Hints deepen up to this many full moves in the background
+SOLVER_NODES = 5_000 # Node budget of the AI's endgame solver per move (see MinMaxAgent._side_search)
+
+def game_agent(color, depth, cache=None, solver=None, node_budget=None, eval_cache=None):
+    """
+    The agent GameController plays an AI side with (benchmarks/calibrate.py
+    measures this configuration). solver and eval_cache may be shared between
+    agents; fresh ones are created if not given.
+    """
+    return MinMaxAgent(color, depth, cache, solver=solver or ProofNumberSearch(SOLVER_NODES),
+                       node_budget=node_budget, eval_cache=eval_cache if eval_cache is not None else EvalCache())
+
+class GameController:
+    """
+    Headless game loop state: owns the Board, the AI agents and the AI move delay.
+
+    GameScene drives one of these from the pygame loop, but it has no pygame
+    dependency, so whole games can also be played programmatically:
+
+        controller = GameController(mode='AIvAI', ai_depth=3)
+        result = controller.run_game()
+    """
+
+    def __init__(self, mode='PvP', ai_depth=5, ai_delay_ms=500, clock=None, agents=None, cache=None,
+                 ai_nodes=None):
+        """
+        Args:
+            mode: 'PvP', 'PvAI' (AI plays Black) or 'AIvAI'.
+            ai_depth: Search depth for the agents created for the mode.
+            ai_delay_ms: Delay before an AI move is played (used by update()).
+            clock: Any object with get_ticks() in ms. Defaults to a MonotonicClock.
+            agents: Optional dict {color: agent} overriding the agents implied by mode.
+            cache: Optional transposition table (e.g. AnalysisCache) for the created agents.
+            ai_nodes: Optional node budget per AI move for the created agents (ai_depth
+                      is then the depth ceiling), for the same play on any hardware.
+        """
+        self.mode = mode
+        self.board = Board()
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.ai_timer = Timer(ai_delay_ms, self.clock)
+        self._ai_turn_started = None # Clock time the current AI turn's search started
+        # Leaf evaluations shared by all agents of the game (and the hints), so
+        # positions seen in earlier moves' searches are not evaluated again
+        self.eval_cache = EvalCache()
+
+        if agents is None:
+            agents = {}
+            solver = ProofNumberSearch(SOLVER_NODES) # Shared: its table keeps proofs between moves
+            if mode in ('PvAI', 'AIvAI'):
+                agents['Black'] = game_agent('Black', ai_depth, cache, solver, ai_nodes, self.eval_cache)
+            if mode == 'AIvAI':
+                agents['Red'] = game_agent('Red', ai_depth, cache, solver, ai_nodes, self.eval_cache)
+        self.agents = agents
+
+        self.status_message = f"It's {self.board.current_turn}'s turn. Select a piece."
+        self.game_over = False
+
+        # Move history: one entry per turn, each a list of hops
+        # (piece_rc, target_rc, captured_rc or None). Multi-jumps share a turn.
+        # _undo holds the matching Board undo records (constant size per hop);
+        # _redo holds turns taken back by undo(), most recent last.
+        self.turns = []
+        self._turn_open = False
+        self._undo = []
+        self._redo = []
+
+        # Hints: one analysis agent per color sharing an in-memory table (keys are
+        # color-symmetric), kept between hints so repeated requests start from earlier results
+        self.hint = None          # (depth, lines) for the current position, see MinMaxAgent.analyze
+        self._hint_agents = {}
+        self._hint_table = MemoryCache()
+        self._hint_thread = None
+        self._hint_agent = None
+
+    def __repr__(self):
+        return f"GameController(Mode: {self.mode}, {self.board!r}, Over: {self.game_over})"
+
+    # --- Queries ---
+    def is_ai_turn(self):
+        """True if the side to move is played by an agent and the game is still running."""
+        return not self.game_over and self.board.current_turn in self.agents
+
+    def result(self):
+        """The PDN result string: '1-0' (Red won), '0-1' (Black won) or '*' (still running)."""
+        if not self.game_over:
+            return '*'
+        if self.board.taken_pieces['Black'] == 12:
+            return '1-0'
+        if self.board.taken_pieces['Red'] == 12:
+            return '0-1'
+        # Otherwise the side to move has no legal moves and lost
+        return '0-1' if self.board.current_turn == 'Red' else '1-0'
+
+    def to_pdn(self, **tags):
+        """Exports the game played so far as a PDNGame record (call .to_pdn() for the text)."""
+        tags.setdefault('Red', 'AI' if 'Red' in self.agents else 'Human')
+        tags.setdefault('Black', 'AI' if 'Black' in self.agents else 'Human')
+        tags.setdefault('Event', f"Checkers4All {self.mode}")
+        return PDNGame.from_hops(self.turns, self.result(), **tags)
+
+    def legal_moves(self):
+        """All legal (piece_rc, target_rc, captured_piece) moves for the side to move."""
+        return self.board.get_all_legal_moves(self.board.current_turn)
+
+    def jumping_piece(self):
+        """Square of the piece that must continue an unfinished multi-jump, or None."""
+        return self.turns[-1][-1][1] if self._turn_open else None
+
+    # --- Moves ---
+    def play_move(self, piece_rc, target_rc, captured_piece=None):
+        """
+        Plays a single move (one hop of a multi-jump) for the side to move.
+        Returns: must_multijump (bool)
+        """
+        self._redo.clear() # A new move starts a new line; taken back turns are gone
+        return self._play_hop(piece_rc, target_rc, captured_piece)
+
+    def _play_hop(self, piece_rc, target_rc, captured_piece):
+        self.cancel_hint() # Any hint was for the previous position
+        must_multijump, status_msg, undo = self.board.make_move(piece_rc, target_rc, captured_piece)
+        self._record_hop(piece_rc, target_rc, must_multijump, undo)
+        self.status_message = status_msg
+        self._check_game_over()
+        return must_multijump
+
+    def _record_hop(self, piece_rc, target_rc, must_multijump, undo=None):
+        """Appends a hop to the move history, grouping multi-jump chains into one turn."""
+        captured_rc = None
+        if abs(target_rc[0] - piece_rc[0]) == 2:
+            captured_rc = ((piece_rc[0] + target_rc[0]) // 2, (piece_rc[1] + target_rc[1]) // 2)
+
+        if not self._turn_open:
+            self.turns.append([])
+            self._undo.append([])
+        self.turns[-1].append((piece_rc, target_rc, captured_rc))
+        self._undo[-1].append(undo)
+        self._turn_open = must_multijump
+
+    # --- Undo/Redo ---
+    def can_undo(self):
+        return bool(self.turns)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """
+        Takes back the last turn (a whole multi-jump chain, or the hops played
+        so far of an unfinished one). Turns played by agents are taken back
+        together with the human turn before them, so the human is to move again.
+        Returns: True if anything was undone.
+        """
+        if not self.turns:
+            return False
+        self._undo_turn()
+        while self.turns and self._agent_turn_with_human():
+            self._undo_turn()
+        self._after_history_change()
+        return True
+
+    def redo(self):
+        """
+        Replays the most recently undone turn, followed by the agents' turns
+        that were undone with it. Returns: True if anything was redone.
+        """
+        if not self._redo:
+            return False
+        self._redo_turn()
+        while self._redo and not self.game_over and self._agent_turn_with_human():
+            self._redo_turn()
+        self._after_history_change()
+        return True
+
+    def _agent_turn_with_human(self):
+        """True if an agent is to move in a game that also has a human side."""
+        return self.board.current_turn in self.agents and len(self.agents) < 2
+
+    def _undo_turn(self):
+        hops = self.turns.pop()
+        for undo in reversed(self._undo.pop()):
+            self.board.unmake_move(undo)
+        self._turn_open = False
+        self._redo.append(hops)
+
+    def _redo_turn(self):
+        for piece_rc, target_rc, captured_rc in self._redo.pop():
+            captured = self.board.get_piece_at(*captured_rc) if captured_rc else None
+            self._play_hop(piece_rc, target_rc, captured)
+
+    def _after_history_change(self):
+        """Resets game-over, AI timer and status after the position jumped."""
+        self.cancel_hint()
+        self.ai_timer.stop() # A pending AI move was searched for another position
+        self.game_over = False
+        if not self._check_game_over():
+            self.status_message = f"It's {self.board.current_turn}'s turn."
+
+    def _check_game_over(self):
+        msg, is_over = self.board.get_game_state()
+        if is_over:
+            self.game_over = True
+            self.status_message = msg
+        return is_over
+
+    # --- Hints ---
+    def start_hint(self, depth=HINT_DEPTH, num_pv=3):
+        """
+        Starts analyzing the current position for the side to move on a
+        background thread. self.hint is updated after every finished depth
+        (shallow results arrive almost immediately) until depth is reached,
+        a move is played or cancel_hint() is called. In the middle of a
+        multi-jump only the jumping piece's moves are analyzed.
+        """
+        self.cancel_hint()
+        color = self.board.current_turn
+        if color not in self._hint_agents:
+            self._hint_agents[color] = MinMaxAgent(color, depth, self._hint_table, eval_cache=self.eval_cache)
+        agent = self._hint_agents[color]
+        agent.stop_requested = False
+        board = self.board.deep_copy() # The game board keeps changing on the main thread
+        piece_rc = self.jumping_piece()
+
+        def publish(finished_depth, lines):
+            self.hint = (finished_depth, lines)
+
+        def run():
+            try:
+                agent.analyze(board, depth, num_pv, on_depth=publish, piece_rc=piece_rc)
+            except SearchAborted:
+                pass
+
+        self._hint_agent = agent
+        self._hint_thread = threading.Thread(target=run, name="checkers-hint", daemon=True)
+        self._hint_thread.start()
+
+    def cancel_hint(self):
+        """Stops a running hint search and forgets the current hint."""
+        if self._hint_thread is not None:
+            self._hint_agent.stop_requested = True
+            self._hint_thread.join()
+            self._hint_thread = None
+        self.hint = None
+
+    def hint_running(self):
+        return self._hint_thread is not None and self._hint_thread.is_alive()
+
+    # --- AI Control ---
+    def play_ai_move(self):
+        """
+        Runs the agent for the side to move and plays its move immediately.
+        Returns: True if a move was played.
+        """
+        agent = self.agents[self.board.current_turn]
+        agent.runAI(self.board, self.jumping_piece())
+        return self._apply_ai_move(agent)
+
+    def _apply_ai_move(self, agent):
+        best_val, best_move = agent.get_best_move()
+        if best_move:
+            piece_rc, target_rc, captured_piece = best_move
+            self.play_move(piece_rc, target_rc, captured_piece)
+            return True
+
+        self.status_message = "uh oh! no valid AI moves :()"
+        self._check_game_over()
+        return False
+
+    def update(self):
+        """
+        Advances timer-driven AI turns: the search runs once when the AI's turn
+        starts and the move is played after the AI delay has passed.
+        Returns: True if the board changed.
+        """
+        if not self.is_ai_turn():
+            return False
+
+        agent = self.agents[self.board.current_turn]
+        if not self.ai_timer.running:
+            self.ai_timer.start()
+            self._ai_turn_started = self.clock.get_ticks()
+            agent.runAI(self.board, self.jumping_piece())
+            return False
+
+        if self.ai_timer.is_finished():
+            self.ai_timer.stop()
+            profiler.record('ai_move', color=agent.color,
+                            latency_ms=round(self.clock.get_ticks() - self._ai_turn_started, 3))
+            return self._apply_ai_move(agent)
+        return False
+
+    def run_game(self, max_plies=None):
+        """
+        Plays agent moves until the game ends (every side must have an agent).
+
+        Args:
+            max_plies: Optional cap on the number of moves (hops) played, since
+                       king endgames can otherwise shuffle forever.
+        Returns: The final status message.
+        """
+        plies = 0
+        while not self.game_over and (max_plies is None or plies < max_plies):
+            if self.board.current_turn not in self.agents:
+                raise ValueError(f"No agent for {self.board.current_turn}; run_game needs agents for both colors.")
+            if not self.play_ai_move():
+                break
+            plies += 1
+        return self.status_message
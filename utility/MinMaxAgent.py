@@ -2,8 +2,29 @@
 import math
 import copy
 # We assume Piece and Board are correctly imported and accessible
+import hashlib
 from .Piece import Piece
-from .Board import Board
+from .Board import Board, SQUARE_INDEX
+from .AnalysisCache import EXACT, LOWER, UPPER, MemoryCache
+from .Symmetry import canonical_key, is_mirrored, mirror_move, mirror_square
+from .Zobrist import JUMPING_KEYS
+from .Profiler import profiler
+from .Evaluation import DEFAULT_EVALUATOR
+from .ProofNumberSearch import WIN, LOSS, UNKNOWN
+
+EVAL_VERSION = 3 # Bump whenever eval_score changes so cached scores are not reused
+AGENT_TO_MOVE = 0x9E3779B97F4A7C15 # Cache key salt: the agent (not its opponent) is to move
+SOLVER_MAX_PIECES = 6     # The solver runs before the search with this many pieces or fewer
+SOLVER_SUSPECT_SCORE = 200.0 # ... and after it when the search score is this lopsided (4 men)
+SOLVER_SHARE = 0.1        # Default solver budget per solve, as a share of the search's nodes
+SOLVER_MIN_NODES = 200    # ... but at least this many
+UNSOLVED_MEMORY = 4096    # Positions the solver failed on, remembered so they are not solved again
+
+class SearchAborted(Exception):
+    """Raised inside a search when stop_requested is set (e.g. a hint is no longer needed)."""
+
+class _NodeBudgetExhausted(Exception):
+    """Raised inside a budgeted search once node_budget nodes have been visited."""
 
 class MinMaxAgent:
     """
@@ -11,11 +32,60 @@ class MinMaxAgent:
     It works by simulating moves on copies of the Board object.
     """
     
-    def __init__(self, color, max_depth):
+    def __init__(self, color, max_depth, cache=None, result_cache=None, evaluator=None, solver=None,
+                 node_budget=None, eval_cache=None, solver_share=SOLVER_SHARE):
+        """
+        :param color: 'Red' or 'Black'
+        :param max_depth: Search depth in full moves (multi-jump hops do not count)
+        :param cache: Optional transposition table (e.g. a persistent AnalysisCache)
+                      with probe(key) / store(key, depth, score, bound, move)
+        :param result_cache: Optional cache of finished root results shared between
+                      games (ResultCache / SharedResultCache) with get(key, depth) / put(...)
+        :param evaluator: An Evaluation.Evaluator, e.g. a NeuralEvaluator
+                      (default: the shared PhasedEvaluator)
+        :param solver: Optional ProofNumberSearch run as a side search by runAI in
+                      low-material positions and when the search score suggests a
+                      decided game; proven results override the search
+        :param solver_share: Nodes per solve as a share of the search's node count
+                      (the previous runAI call's before the search, this call's after
+                      it), at least SOLVER_MIN_NODES and at most solver.max_nodes, so
+                      the side search stays a fraction of the move's time. None gives
+                      every solve the solver's full budget (e.g. for game analysis)
+        :param node_budget: Optional fixed effort per runAI call, in nodes. The search
+                      then deepens one full move at a time up to max_depth and stops
+                      once the budget is spent, playing the deepest finished iteration's
+                      move. Node counts do not depend on the machine, so the same
+                      position (and cache contents) gives the same move everywhere;
+                      latency is about node_budget / nodes per second of the host
+                      (see benchmarks/calibrate.py). Solver nodes count against
+                      the budget too, and self.nodes includes them
+        :param eval_cache: Optional EvalCache for leaf evaluations, which can be
+                      shared between agents and searches (batched evaluators score
+                      their leaves in batches instead)
+        """
         self.color = color # 'Black'
-        self.opponent_color = 'Red'
+        self.opponent_color = 'Red' if color == 'Black' else 'Black'
         self.max_depth = max_depth
         self.isCalculating = False
+        self.stop_requested = False # Set from another thread to abort analyze()
+        self.nodes = 0              # Positions visited by the last runAI/analyze call
+        self.node_budget = node_budget
+        self.completed_depth = None # Depth the last runAI call finished (< max_depth if the budget ran out)
+        self._node_limit = math.inf # Checked by _minmax; only finite inside a budgeted search
+        self.cache = cache
+        self.result_cache = result_cache
+        self.evaluator = evaluator or DEFAULT_EVALUATOR
+        self.eval_cache = eval_cache
+        self.solver = solver
+        self.solved = None          # WIN / LOSS if the solver proved the last runAI position
+        self.solver_share = solver_share
+        self._search_nodes = 0      # Nodes of the last search, which solver budgets are sized by
+        self._unsolved = set()      # Keys of positions the solver could not decide
+        # Cached scores are from the agent's point of view with this evaluation.
+        # eval_score is color-symmetric, so Red and Black agents share entries
+        # through canonical (mirrored) keys; only the evaluation is salted.
+        self.cache_salt = int.from_bytes(hashlib.blake2b(
+            f"eval:{EVAL_VERSION}:{self.evaluator.signature}".encode(), digest_size=8).digest(), 'little')
 
         self._score = None
         self._move = None
@@ -24,101 +94,358 @@ class MinMaxAgent:
     
     def eval_score(self, board):
         """
-        Evaluates the score of a given board state from the AI's perspective (Black).
-        Positive score favors Black, Negative score favors Red.
+        Evaluates the score of a given board state from the AI's perspective.
+        Positive scores favor this agent's color (see Evaluation.PhasedEvaluator).
         """
-        # Base Piece Values
-        REGULAR_PIECE_VAL = 50.0
-        KING_VAL = 100.0  # Must be significantly higher than regular
-        
-        # Positional/Safety Weights
-        ADVANCEMENT_BONUS = 2.0  # Reward for moving pieces closer to the king row
-        CENTER_CONTROL_BONUS = 5.0 # Reward for occupying central squares
-        THREAT_PENALTY = 20.0     # Large penalty for pieces that can be captured next turn
-        KING_ROW_BONUS = 15.0     # Bonus for regular pieces reaching the King Row's back row
+        if self.eval_cache is not None:
+            return self.eval_cache.evaluate(board, self.color, self.evaluator)
+        return self.evaluator.evaluate(board, self.color)
 
-        score = 0
-        
-        # Helper function to check if a piece is on a central square (rows 3, 4, 5 and cols 2, 3, 4, 5)
-        def is_central(r, c):
-            return 2 <= r <= 5 and 2 <= c <= 5
+    def runAI(self, current_board, piece_rc=None):
+        """
+        Public method to start the Minimax search.
 
-        for r in range(8):
-            for c in range(8):
-                piece = board.get_piece_at(r, c)
-                
-                if piece:
-                    # Determine the base value
-                    val = KING_VAL if piece.king else REGULAR_PIECE_VAL
-                    
-                    # --- Positional Heuristics ---
-                    
-                    # 1. Advancement Bonus (Moving closer to king row)
-                    if not piece.king:
-                        if piece.color == self.color: # Black (moves downwards, wants row 7)
-                            # Black row 0 to 7. We want row 7. Max bonus at r=7.
-                            val += r * ADVANCEMENT_BONUS
-                            
-                        else: # Red (moves upwards, wants row 0)
-                            # Red row 7 to 0. We want row 0. Max bonus at r=0.
-                            val += (7 - r) * ADVANCEMENT_BONUS
-                    
-                    # 2. Center Control Bonus
-                    if is_central(r, c):
-                        val += CENTER_CONTROL_BONUS
-
-                    # 3. King Row Home Defense Bonus (Important to prevent opponent kinging)
-                    # Pieces on the far back row (for Black, row 7; for Red, row 0)
-                    if not piece.king:
-                        if piece.color == self.color and r == 7:
-                            val += KING_ROW_BONUS
-                        elif piece.color == self.opponent_color and r == 0:
-                            val += KING_ROW_BONUS
-
-                    # --- Accumulate Score ---
-                    if piece.color == self.color: # Black (Maximizing)
-                        score += val
-                    else: # Red (Minimizing)
-                        score -= val
-        
-        # Check all Red pieces for possible jumps on Black pieces
-        for red_piece in board._get_player_pieces(self.opponent_color):
-            threats = board._check_jump_moves(red_piece)
-            
-            # If the Red piece can jump, it's a huge problem for Black
-            if threats:
-                # Iterate over all targets to see which Black piece is threatened
-                for target_rc, captured_piece in threats.items():
-                    if captured_piece and captured_piece.color == self.color:
-                        # Black piece is threatened, apply severe penalty
-                        # Note: The 'val' for the piece is already counted, so this is a penalty.
-                        score -= THREAT_PENALTY
-                        # We break after the first threat found to keep the calculation simpler, 
-                        # but in a more complex eval, you'd want to penalize each unique threatened piece.
-        
-        # 5. Piece Safety Bonus (Opponent piece is threatened)
-        # Check if the AI (Black) has a mandatory jump against the OPPONENT (Red)
-        for black_piece in board._get_player_pieces(self.color):
-            opportunities = board._check_jump_moves(black_piece)
-            
-            if opportunities:
-                # Reward for a jump opportunity (which should be mandatory)
-                score += 0.5 * THREAT_PENALTY # Reward is half the penalty value
-                        
-        return score
+        :param piece_rc: Optional square of the only piece that may move, e.g. the
+                         piece that has to continue a multi-jump. Restricted searches
+                         skip the result cache and the solver, whose moves are for
+                         the whole position.
+        """
+        self.nodes = 0
+        self.completed_depth = None
+        self.solved = None # Also on a result cache hit: the cache stores no proofs
+        if piece_rc is not None:
+            if self.node_budget is None:
+                self._score, self._move = self._minmax(current_board, self.max_depth, True, root=True,
+                                                       piece_rc=piece_rc)
+                self.completed_depth = self.max_depth
+            else:
+                self._score, self._move = self._budgeted_search(current_board, piece_rc)
+            return
 
-    def runAI(self, current_board):
-        """Public method to start the Minimax search."""
-        self._score, self._move = self._minmax(current_board, self.max_depth, True)
+        if self.result_cache is not None:
+            # Another game (or worker) may already have answered this position;
+            # budgeted results are kept apart, they may come from a shallower search
+            key = self._cache_key(current_board) ^ (self.node_budget or 0)
+            hit = self.result_cache.get(key, self.max_depth)
+            move = self._find_legal_move(current_board, self._from_cache_move(current_board, hit[1])) if hit else None
+            if move:
+                self._score, self._move = hit[0], move
+                return
+
+        with profiler.ai_search(self):
+            winning_move = self._side_search(current_board)
+            if winning_move is None:
+                solver_nodes = self.nodes
+                if self.node_budget is None:
+                    self._score, self._move = self._minmax(current_board, self.max_depth, True, root=True)
+                    self.completed_depth = self.max_depth
+                else:
+                    self._score, self._move = self._budgeted_search(current_board)
+                self._search_nodes = self.nodes - solver_nodes
+                if self.solved is None:
+                    winning_move = self._side_search(current_board, self._score)
+            if winning_move:
+                self._move = winning_move
+            if self.solved: # Proven results replace the heuristic score
+                self._score = math.inf if self.solved == WIN else -math.inf
+
+        if self.result_cache is not None and self._move:
+            self.result_cache.put(key, self.max_depth, self._score, self._to_cache_move(current_board, self._move))
     
+    def _budgeted_search(self, board, piece_rc=None):
+        """
+        Iterative deepening within self.node_budget: depth 1, 2, ... up to
+        max_depth, abandoning the iteration during which the budget runs out.
+        Depth 1 always finishes, so there is a move however small the budget.
+        Nodes the solver searched before (already in self.nodes) are part of
+        the budget.
+        Without a cache a private table is used, so every iteration starts
+        with the previous iteration's best moves. piece_rc restricts the
+        root moves as in _minmax.
+        Returns: (score, best_move) of the deepest finished iteration.
+        """
+        own_table = self.cache is None
+        if own_table:
+            self.cache = MemoryCache()
+        result = None
+        try:
+            for depth in range(1, self.max_depth + 1):
+                self._node_limit = self.node_budget if result else math.inf
+                try:
+                    result = self._minmax(board, depth, True, root=True, piece_rc=piece_rc)
+                except _NodeBudgetExhausted:
+                    break
+                self.completed_depth = depth
+                if math.isinf(result[0]): # Decided; deeper iterations cannot change it
+                    break
+        finally:
+            self._node_limit = math.inf
+            if own_table:
+                self.cache = None
+        return result
+
+    def _side_search(self, board, score=None):
+        """
+        Runs the solver before the search (score None) if few pieces are left,
+        or after it if the score looks decided but is not a proven ±inf yet.
+        Sets self.solved to WIN / LOSS when the solver proves the position.
+        Positions it could not decide are not tried again, so a failed solve
+        before the search also skips the one after it.
+        Returns: the winning move if a win was proven, else None (after a
+                 proven loss the search's move stands; it resists longest at its depth).
+        """
+        if self.solver is None:
+            return None
+        if score is None:
+            if 24 - board.taken_pieces['Red'] - board.taken_pieces['Black'] > SOLVER_MAX_PIECES:
+                return None
+        elif math.isinf(score) or abs(score) < SOLVER_SUSPECT_SCORE:
+            return None
+        key = board.zobrist_key
+        if key in self._unsolved:
+            return None
+
+        budget = None
+        if self.solver_share is not None:
+            # A node budget is the search's size; otherwise the last search's count stands in for it
+            search_nodes = self._search_nodes if self.node_budget is None else self.node_budget
+            budget = min(self.solver.max_nodes, max(SOLVER_MIN_NODES, int(search_nodes * self.solver_share)))
+        if self.node_budget is not None: # Solver nodes are part of the move's budget
+            left = self.node_budget - self.nodes
+            if left <= 0:
+                return None
+            budget = left if budget is None else min(budget, left)
+        result, move, nodes = self.solver.solve(board, self.color, budget)
+        self.nodes += nodes
+        if result == UNKNOWN:
+            if len(self._unsolved) >= UNSOLVED_MEMORY:
+                self._unsolved.clear()
+            self._unsolved.add(key)
+        if result == WIN and move:
+            self.solved = WIN
+            return move
+        if result == LOSS:
+            self.solved = LOSS
+        return None
+
     def get_best_move(self):
         """Public method to start the Minimax search."""
         
         return self._score, self._move
 
-    # ... (MinMaxAgent __init__, eval_score, runAI, get_best_move methods remain the same) ...
+    def score_turn(self, board, hops):
+        """
+        Scores one whole turn for the side to move (which must be this agent's color):
+        hops are its (piece_rc, target_rc, captured_piece) moves, all hops of a
+        multi-jump, scored with the same depth semantics as runAI so the result can
+        be compared to the best score.
+        """
+        for move in hops:
+            board = self._simulate(board, move)
+        if board.current_turn == self.color: # Unfinished multi-jump: the search continues it
+            score, _ = self._minmax(board, self.max_depth, True, piece_rc=hops[-1][1])
+        else:
+            score, _ = self._minmax(board, self.max_depth - 1, False)
+        return score
+
+    # --- Analysis ---
+
+    def analyze(self, board, depth=None, num_pv=3, on_depth=None, piece_rc=None):
+        """
+        Multi-PV analysis: the num_pv best moves for this agent's color (which
+        must be the side to move), each with its score and principal variation.
+
+        Searches with iterative deepening from depth 1 up to depth (default
+        max_depth). All root moves and all iterations share one transposition
+        table (self.cache, or a fresh MemoryCache), so each iteration starts
+        from the previous ordering and only the current top num_pv moves need
+        exact scores: the rest are searched against the num_pv-th best score
+        and fail low cheaply.
 
-    def _minmax(self, board, depth, is_maximizing_player, alpha=-math.inf, beta=math.inf):
+        :param on_depth: Optional callback(depth, lines) after every finished iteration,
+                         so callers can show shallow results while deeper ones are searched
+        :param piece_rc: Optional square of the only piece that may move, as in runAI
+        :returns: [(score, move, pv), ...] best first, where move is a legal move tuple
+                  and pv a list of (piece_rc, target_rc, captured_rc) hops starting with move
+        """
+        depth = depth or self.max_depth
+        self.nodes = 0
+        if self.cache is None:
+            self.cache = MemoryCache()
+        root_moves = board.get_all_legal_moves(self.color)
+        if piece_rc is not None:
+            root_moves = [move for move in root_moves if move[0] == piece_rc]
+        if not root_moves:
+            return []
+
+        lines = []
+        for iteration in range(1, depth + 1):
+            # Previous iteration's best moves first, in order
+            previous = [move for _, move, _ in lines]
+            root_moves = previous + [move for move in root_moves if move not in previous]
+
+            scored = []
+            for move in root_moves:
+                # Only moves that can still enter the top num_pv need an exact score
+                alpha = scored[num_pv - 1][0] if len(scored) >= num_pv else -math.inf
+                new_board = self._simulate(board, move)
+                if new_board.current_turn == board.current_turn: # Multi-jump continues
+                    score, _ = self._minmax(new_board, iteration, True, alpha, math.inf, piece_rc=move[1])
+                else:
+                    score, _ = self._minmax(new_board, iteration - 1, False, alpha, math.inf)
+                if len(scored) < num_pv or score > alpha:
+                    scored.append((score, move))
+                    scored.sort(key=lambda entry: entry[0], reverse=True)
+                    del scored[num_pv:]
+
+            self._store(board, iteration, scored[0][0], -math.inf, math.inf, scored[0][1], piece_rc)
+            lines = [(score, move, self._principal_variation(board, move, iteration)) for score, move in scored]
+            if on_depth:
+                on_depth(iteration, lines)
+        return lines
+
+    def _principal_variation(self, board, move, depth):
+        """Follows the best moves stored in the transposition table after move."""
+        pv = []
+        seen = set()
+        plies = 0
+        while move and plies <= depth and board.zobrist_key not in seen:
+            seen.add(board.zobrist_key)
+            pv.append((move[0], move[1], (move[2].row, move[2].col) if move[2] else None))
+            new_board = self._simulate(board, move)
+            piece_rc = None
+            if new_board.current_turn != board.current_turn:
+                plies += 1
+            else: # Multi-jump continues with the same piece
+                piece_rc = move[1]
+            board = new_board
+            entry = self.cache.probe(self._cache_key(board, piece_rc))
+            color = board.current_turn
+            move = None
+            if entry and entry[3]:
+                move_rc = self._from_cache_move(board, entry[3])
+                move = next((m for m in board.get_all_legal_moves(color) if (m[0], m[1]) == move_rc), None)
+        return pv
+
+    # --- Transposition Table ---
+
+    def _cache_key(self, board, piece_rc=None):
+        """
+        Key of the canonical position (see Symmetry), salted with the evaluation
+        version and with whether the agent is the side to move, since scores are
+        from the agent's point of view. piece_rc is the piece that must continue
+        a multi-jump, if any: only it may move, so the position is a different one.
+        """
+        key = canonical_key(board) ^ self.cache_salt
+        if piece_rc is not None:
+            index = SQUARE_INDEX[piece_rc]
+            key ^= JUMPING_KEYS[mirror_square(index) if is_mirrored(board) else index]
+        return key ^ AGENT_TO_MOVE if board.current_turn == self.color else key
+
+    @staticmethod
+    def _to_cache_move(board, move):
+        """A move of board as (piece_rc, target_rc) in the canonical position's coordinates."""
+        if not move:
+            return None
+        move = (move[0], move[1])
+        return mirror_move(move) if is_mirrored(board) else move
+
+    @staticmethod
+    def _from_cache_move(board, move_rc):
+        """Inverse of _to_cache_move (the mirror transform is its own inverse)."""
+        return mirror_move(move_rc) if move_rc and is_mirrored(board) else move_rc
+
+    def _probe(self, board, depth, alpha, beta, piece_rc=None):
+        """
+        Looks the position up in the cache.
+        Returns: (cutoff_score or None, alpha, beta, tt_move)
+        """
+        entry = self.cache.probe(self._cache_key(board, piece_rc))
+        if entry is None:
+            return None, alpha, beta, None
+        entry_depth, score, bound, tt_move = entry
+        tt_move = self._from_cache_move(board, tt_move)
+        if entry_depth >= depth:
+            if bound == EXACT:
+                return score, alpha, beta, tt_move
+            if bound == LOWER:
+                alpha = max(alpha, score)
+            elif bound == UPPER:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score, alpha, beta, tt_move
+        return None, alpha, beta, tt_move
+
+    def _store(self, board, depth, value, alpha, beta, best_move, piece_rc=None):
+        """Stores a search result with its bound type relative to the searched window."""
+        if value <= alpha:
+            bound = UPPER
+        elif value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.cache.store(self._cache_key(board, piece_rc), depth, value, bound, self._to_cache_move(board, best_move))
+
+    def _find_legal_move(self, board, move_rc):
+        """Maps a cached (piece_rc, target_rc) back to this board's legal move tuple."""
+        if move_rc:
+            for move in board.get_all_legal_moves(self.color):
+                if (move[0], move[1]) == move_rc:
+                    return move
+        return None
+
+    @staticmethod
+    def _order_moves(valid_moves, tt_move):
+        """Searches the cached best move first; it is the most likely to cause a cut-off."""
+        if tt_move:
+            for i, move in enumerate(valid_moves):
+                if (move[0], move[1]) == tt_move:
+                    return [move] + valid_moves[:i] + valid_moves[i + 1:]
+        return valid_moves
+
+    def _simulate(self, board, move):
+        """Returns a copy of board with move played on it."""
+        new_board = board.deep_copy()
+        piece_rc, target_rc, captured_piece = move
+        
+        # Retrieve the captured piece on the *new_board* for simulation
+        captured_piece_on_new_board = None
+        if captured_piece:
+            cap_r, cap_c = captured_piece.row, captured_piece.col
+            captured_piece_on_new_board = new_board.get_piece_at(cap_r, cap_c)
+        
+        new_board.move_piece(piece_rc, target_rc, captured_piece_on_new_board)
+        return new_board
+
+    def _children(self, board, depth, valid_moves):
+        """
+        Yields (move, new_board, leaf_score) for each move in order.
+
+        With a batched evaluator, the children one move before the horizon
+        (depth 1, turn ends) are scored in one evaluate_batch call up front,
+        from their masks (Board.masks_after) without copying the board; they
+        come with new_board None and their leaf_score. Every other child is
+        built lazily with leaf_score None, so moves cut off by alpha-beta cost
+        nothing.
+        """
+        if depth != 1 or not self.evaluator.batched:
+            for move in valid_moves:
+                yield move, self._simulate(board, move), None
+            return
+
+        masks = board.to_masks()
+        children = [board.masks_after(*move, masks=masks) for move in valid_moves]
+        scores = iter(self.evaluator.evaluate_batch([child[:3] for child in children if not child[3]], self.color))
+        for move, child in zip(valid_moves, children):
+            if child[3]: # Multi-jump continues: searched further at the same depth
+                yield move, self._simulate(board, move), None
+            else:
+                self.nodes += 1 # Counted like a depth 0 _minmax call
+                yield move, None, next(scores)
+
+    # --- Search ---
+
+    def _minmax(self, board, depth, is_maximizing_player, alpha=-math.inf, beta=math.inf, root=False, piece_rc=None):
         """
         The recursive Minimax function with Alpha-Beta Pruning.
         
@@ -127,11 +454,28 @@ class MinMaxAgent:
         :param is_maximizing_player: True if current turn is AI (Black), False if opponent (Red)
         :param alpha: The best value found so far for the maximizing player (Black)
         :param beta: The best value found so far for the minimizing player (Red)
+        :param root: True for the call made by runAI (a move must always be returned)
+        :param piece_rc: Square of the only piece that may move: the one continuing a multi-jump
         :returns: (score, best_move)
         """
+        self.nodes += 1
+        if self.stop_requested:
+            raise SearchAborted()
+        if self.nodes > self._node_limit:
+            raise _NodeBudgetExhausted()
+
         # Base case 1: Reached max depth
         if depth == 0:
             return self.eval_score(board), None
+
+        # Transposition table: reuse results from earlier (or other sessions') searches
+        tt_move = None
+        if self.cache is not None:
+            cutoff, probe_alpha, probe_beta, tt_move = self._probe(board, depth, alpha, beta, piece_rc)
+            if not root: # The root only takes the move: a narrowed window could fail every move there
+                if cutoff is not None:
+                    return cutoff, None
+                alpha, beta = probe_alpha, probe_beta
         
         # Base case 2: Game over (Terminal state)
         _, is_over = board.get_game_state()
@@ -144,6 +488,8 @@ class MinMaxAgent:
 
         color = self.color if is_maximizing_player else self.opponent_color
         valid_moves = board.get_all_legal_moves(color)
+        if piece_rc is not None:
+            valid_moves = [move for move in valid_moves if move[0] == piece_rc]
         
         if not valid_moves:
             # If no legal moves, the current player loses. Score depends on the winner.
@@ -152,32 +498,21 @@ class MinMaxAgent:
             else: # Red can't move, Black wins
                 return math.inf, None 
         
+        valid_moves = self._order_moves(valid_moves, tt_move)
         best_move = valid_moves[0] # Initialize with a fallback move
+        alpha_searched, beta_searched = alpha, beta # Window the result is classified against
 
         if is_maximizing_player: # Maximizing Player (Black)
             max_val = -math.inf 
             
-            for move in valid_moves:
-                
-                # --- Simulation ---
-                new_board = board.deep_copy() 
-                piece_rc, target_rc, captured_piece = move
-                
-                # Retrieve the pieces on the *new_board* for simulation
-                piece_on_new_board = new_board.get_piece_at(piece_rc[0], piece_rc[1])
-                captured_piece_on_new_board = None
-                if captured_piece:
-                    cap_r, cap_c = captured_piece.row, captured_piece.col
-                    captured_piece_on_new_board = new_board.get_piece_at(cap_r, cap_c)
-                
-                must_multijump, _ = new_board.move_piece(
-                    piece_rc, target_rc, captured_piece_on_new_board
-                )
+            for move, new_board, leaf_score in self._children(board, depth, valid_moves):
                 
                 # --- Recursion and Pruning ---
-                if must_multijump:
+                if leaf_score is not None:
+                    current_val = leaf_score # Scored together with its siblings
+                elif new_board.current_turn == board.current_turn: # Must multijump
                     # Same player, same depth, pass current alpha/beta
-                    current_val, _ = self._minmax(new_board, depth, True, alpha, beta)
+                    current_val, _ = self._minmax(new_board, depth, True, alpha, beta, piece_rc=move[1])
                 else:
                     # Switch player, decrease depth, pass current alpha/beta
                     current_val, _ = self._minmax(new_board, depth - 1, False, alpha, beta) 
@@ -192,31 +527,21 @@ class MinMaxAgent:
                     break # Beta cut-off: The minimizing player (Red) won't choose this path
                           # because they already found a better (lower) option elsewhere.
 
+            if self.cache is not None:
+                self._store(board, depth, max_val, alpha_searched, beta_searched, best_move, piece_rc)
             return max_val, best_move
 
         else: # Minimizing Player (Red)
             min_val = math.inf
             
-            for move in valid_moves:
+            for move, new_board, leaf_score in self._children(board, depth, valid_moves):
                 
-                # --- Simulation (Same logic as above) ---
-                new_board = board.deep_copy()
-                piece_rc, target_rc, captured_piece = move
-                
-                piece_on_new_board = new_board.get_piece_at(piece_rc[0], piece_rc[1])
-                captured_piece_on_new_board = None
-                if captured_piece:
-                    cap_r, cap_c = captured_piece.row, captured_piece.col
-                    captured_piece_on_new_board = new_board.get_piece_at(cap_r, cap_c)
-                
-                must_multijump, _ = new_board.move_piece(
-                    piece_rc, target_rc, captured_piece_on_new_board
-                )
-                
-                # --- Recursion and Pruning ---
-                if must_multijump:
+                # --- Recursion and Pruning (Same logic as above) ---
+                if leaf_score is not None:
+                    current_val = leaf_score
+                elif new_board.current_turn == board.current_turn: # Must multijump
                     # Same player, same depth, pass current alpha/beta
-                    current_val, _ = self._minmax(new_board, depth, False, alpha, beta)
+                    current_val, _ = self._minmax(new_board, depth, False, alpha, beta, piece_rc=move[1])
                 else:
                     # Switch player, decrease depth, pass current alpha/beta
                     current_val, _ = self._minmax(new_board, depth - 1, True, alpha, beta) # Next turn is Maximizing (Black)
@@ -231,4 +556,6 @@ class MinMaxAgent:
                     break # Alpha cut-off: The maximizing player (Black) won't choose this path
                           # because they already found a better (higher) option elsewhere.
                      
-            return min_val, best_move
\ No newline at end of file
+            if self.cache is not None:
+                self._store(board, depth, min_val, alpha_searched, beta_searched, best_move, piece_rc)
+            return min_val, best_move
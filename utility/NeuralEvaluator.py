@@ -0,0 +1,235 @@
+# checkers/ai/neural.py
+"""
+Small NNUE-style neural network evaluation.
+
+The network sees the position twice, once from each side ("perspectives"):
+128 binary inputs, 4 planes of 32 squares (own men, own kings, opponent men,
+opponent kings), where Black's perspective is the color-swapped mirror image
+(square i -> 31 - i, see Symmetry). Both perspectives share the weights:
+
+    acc_p   = b1 + sum of W1 rows of the active inputs        (int16 weights, int32 sums)
+    tower_p = w3 . crelu(W2 . crelu(acc_p / QA) + b2)          (float32)
+    score   = tower_red - tower_black                          (Red's point of view)
+
+so the evaluation is exactly color-symmetric, which the canonical cache keys
+of MinMaxAgent rely on. The first layer is integer arithmetic on purpose:
+its sums do not depend on the order pieces were added and removed in, so the
+accumulator can be updated incrementally (a move changes 2-4 inputs) and
+still give bit-identical scores to a full refresh.
+
+Weights are loaded from a .npz file written by train_evaluator.py:
+w1 int16 (128, H1), b1 int16 (H1,), w2 float32 (H1, H2), b2 float32 (H2,),
+w3 float32 (H2,) and qa (the int16 scale of the first layer). No weights
+are shipped: the networks trained so far play weaker than PhasedEvaluator,
+so this is a scaffold for experiments, not a replacement evaluation yet.
+
+Requires numpy (pip install numpy).
+"""
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from .Evaluation import Evaluator
+
+FEATURES = 4 * 32   # Input planes: own men, own kings, opponent men, opponent kings
+REFRESH_LIMIT = 8   # Changed inputs beyond which a full refresh is cheaper than an update
+DEFAULT_WEIGHTS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models', 'nnue.npz')
+
+# The input in Black's perspective that an input in Red's perspective maps to:
+# plane own <-> opponent (kind ^ 2), square i -> 31 - i
+MIRROR_FEATURE = np.array([(f // 32 ^ 2) * 32 + 31 - f % 32 for f in range(FEATURES)], dtype=np.intp)
+
+
+def planes(black, red, kings):
+    """The 4 input planes of Red's perspective as square masks (see Board.to_masks)."""
+    return red & ~kings, red & kings, black & ~kings, black & kings
+
+def features(black, red, kings):
+    """Active input indices of (Red's perspective, Black's perspective)."""
+    red_view = []
+    for kind, mask in enumerate(planes(black, red, kings)):
+        while mask:
+            low = mask & -mask
+            red_view.append(kind * 32 + low.bit_length() - 1)
+            mask ^= low
+    return red_view, MIRROR_FEATURE[red_view].tolist()
+
+def feature_matrix(black, red, kings):
+    """
+    Batched inputs: uint32 arrays of masks (N,) -> (N, 2, 128) uint8, with
+    Red's perspective at [:, 0] and Black's at [:, 1].
+    """
+    bits = np.arange(32, dtype=np.uint32)
+    black, red, kings = (np.asarray(m, dtype=np.uint32)[:, None] for m in (black, red, kings))
+    red_view = np.concatenate([(plane >> bits) & 1 for plane in planes(black, red, kings)], axis=1)
+    return np.stack([red_view, red_view[:, MIRROR_FEATURE]], axis=1).astype(np.uint8)
+
+
+class Accumulator:
+    """
+    First-layer sums of both perspectives, shape (2, H1) int32, for one position.
+
+    Follows the position through add() / remove() / move() of single pieces,
+    or jumps to any position with update(), which applies only the inputs that
+    changed since the last position (or refreshes from scratch if many did).
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self.values = np.empty((2, network.hidden), dtype=np.int32)
+        self.planes = None # Input planes of the position the values belong to
+        self.refresh(0, 0, 0)
+
+    def refresh(self, black, red, kings):
+        """Recomputes the sums of a position from scratch."""
+        red_view, _ = features(black, red, kings)
+        self.values[:] = self.network.b1
+        if red_view:
+            self.values += self.network.w1_pair[red_view].sum(axis=0, dtype=np.int32)
+        self.planes = planes(black, red, kings)
+
+    def update(self, black, red, kings):
+        """Moves the sums to another position, incrementally if it is close to the current one."""
+        new_planes = planes(black, red, kings)
+        added, removed = [], []
+        for kind, (old, new) in enumerate(zip(self.planes, new_planes)):
+            if old != new:
+                for indices, mask in ((added, new & ~old), (removed, old & ~new)):
+                    while mask:
+                        low = mask & -mask
+                        indices.append(kind * 32 + low.bit_length() - 1)
+                        mask ^= low
+        if len(added) + len(removed) > REFRESH_LIMIT:
+            self.refresh(black, red, kings)
+            return
+        w1_pair = self.network.w1_pair
+        for feature in added:
+            self.values += w1_pair[feature]
+        for feature in removed:
+            self.values -= w1_pair[feature]
+        self.planes = new_planes
+
+    # --- Single-piece updates (feature = plane * 32 + square, Red's perspective) ---
+    def add(self, feature):
+        self.values += self.network.w1_pair[feature]
+        self._toggle(feature)
+
+    def remove(self, feature):
+        self.values -= self.network.w1_pair[feature]
+        self._toggle(feature)
+
+    def move(self, from_feature, to_feature):
+        """A piece moving (or a man moving and being kinged: to_feature in the king plane)."""
+        self.values += self.network.w1_pair[to_feature] - self.network.w1_pair[from_feature]
+        self._toggle(from_feature)
+        self._toggle(to_feature)
+
+    def _toggle(self, feature):
+        kind, square = divmod(feature, 32)
+        self.planes = tuple(p ^ (1 << square) if k == kind else p for k, p in enumerate(self.planes))
+
+
+class NeuralEvaluator(Evaluator):
+    """MinMaxAgent evaluation by a small perspective network (see the module docstring)."""
+
+    batched = True
+
+    def __init__(self, w1, b1, w2, b2, w3, qa=64):
+        """
+        Args:
+            w1, b1: int16 first layer, (128, H1) and (H1,), scaled by qa.
+            w2, b2: float32 hidden layer, (H1, H2) and (H2,).
+            w3: float32 output weights, (H2,).
+            qa: Integer value of 1.0 in the first layer (its clipped-ReLU ceiling).
+        Raises: ValueError if the shapes do not fit together.
+        """
+        w1, b1 = np.asarray(w1, dtype=np.int16), np.asarray(b1, dtype=np.int16)
+        w2, b2, w3 = (np.asarray(a, dtype=np.float32) for a in (w2, b2, w3))
+        if w1.ndim != 2 or w1.shape[0] != FEATURES or b1.shape != w1.shape[1:]:
+            raise ValueError(f"First layer must be ({FEATURES}, H1) with an (H1,) bias, got {w1.shape} and {b1.shape}")
+        if w2.shape[0] != w1.shape[1] or b2.shape != w2.shape[1:] or w3.shape != w2.shape[1:]:
+            raise ValueError(f"Layer shapes do not fit: {w1.shape}, {w2.shape}, {b2.shape}, {w3.shape}")
+        self.hidden = w1.shape[1]
+        self.qa = int(qa)
+        self.w1, self.b1 = w1, b1
+        self.w2, self.b2, self.w3 = w2, b2, w3
+        # Row f holds the weights of input f for both perspectives, so one
+        # row addition updates both accumulators
+        self.w1_pair = np.stack([w1.astype(np.int32), w1[MIRROR_FEATURE].astype(np.int32)], axis=1)
+        # Inference copies of the float layers: the 1/qa scale folded into w2, and
+        # float64 so the int32 sums go through without an extra cast per call
+        self._w2 = w2.astype(np.float64) / self.qa
+        self._b2, self._w3 = b2.astype(np.float64), w3.astype(np.float64)
+        # Scores change with any weight, so the signature (part of the cache salt) hashes them all
+        digest = hashlib.blake2b(digest_size=8)
+        for array in (w1, b1, w2, b2, w3, np.int64(qa)):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        self.signature = f"nnue-{digest.hexdigest()}"
+        self._local = threading.local() # One accumulator per searching thread
+
+    def __repr__(self):
+        return f"NeuralEvaluator(128x{self.hidden}x{self.w2.shape[1]}x1, {self.signature})"
+
+    @classmethod
+    def load(cls, path=DEFAULT_WEIGHTS):
+        """
+        Loads weights written by train_evaluator.py (by default its --out path;
+        nothing is there until a network was trained). Raises OSError / KeyError / ValueError.
+        """
+        with np.load(path) as data:
+            return cls(data['w1'], data['b1'], data['w2'], data['b2'], data['w3'], int(data['qa']))
+
+    def save(self, path):
+        """Writes the weights in the format load() reads."""
+        np.savez(path, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2, w3=self.w3, qa=np.int64(self.qa))
+
+    # --- Evaluation ---
+    def accumulator(self):
+        """This thread's accumulator (created on first use)."""
+        accumulator = getattr(self._local, 'accumulator', None)
+        if accumulator is None:
+            accumulator = self._local.accumulator = Accumulator(self)
+        return accumulator
+
+    def _towers(self, values):
+        """(..., 2, H1) int32 sums -> (...,) scores from Red's point of view."""
+        # np.maximum / np.minimum rather than np.clip: same result, a fraction of the call overhead
+        hidden = np.minimum(np.maximum(values, 0), self.qa) @ self._w2
+        hidden += self._b2
+        np.maximum(hidden, 0.0, out=hidden)
+        np.minimum(hidden, 1.0, out=hidden)
+        towers = hidden @ self._w3
+        return towers[..., 0] - towers[..., 1]
+
+    def evaluate(self, board, color):
+        """Score of board from color's point of view, updating this thread's accumulator."""
+        accumulator = self.accumulator()
+        accumulator.update(*board.to_masks())
+        score = float(self._towers(accumulator.values))
+        return score if color == 'Red' else -score
+
+    def evaluate_batch(self, positions, color):
+        """
+        Scores of several (black, red, kings) mask triples (e.g. sibling leaves)
+        with one forward pass. Siblings differ in a few inputs, so their first
+        layer sums are still built incrementally from one another; only the
+        towers run batched.
+        """
+        if not positions:
+            return []
+        accumulator = self.accumulator()
+        values = np.empty((len(positions), 2, self.hidden), dtype=np.int32)
+        for i, masks in enumerate(positions):
+            accumulator.update(*masks)
+            values[i] = accumulator.values
+        scores = self._towers(values).tolist()
+        return scores if color == 'Red' else [-score for score in scores]
+
+    def evaluate_masks(self, black, red, kings, color='Red'):
+        """Batched scores of mask arrays (N,) (e.g. VectorEnv state) from color's point of view."""
+        inputs = feature_matrix(black, red, kings)
+        values = inputs.astype(np.int32) @ self.w1.astype(np.int32) + self.b1
+        scores = self._towers(values).astype(np.float64)
+        return scores if color == 'Red' else -scores
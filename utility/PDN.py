@@ -0,0 +1,250 @@
+# checkers/game/pdn.py
+"""
+PDN (Portable Draughts Notation) game records.
+
+Squares use the standard GameType 20 numbering of the dark squares, which
+starts on the first mover's side. Red moves first in this game, so Red's men
+start on squares 1-12 (square 1 is the right end of row 7, as seen on screen)
+and Black's on 21-32 (square 32 is the left end of row 0): standard archives
+replay with the first mover as Red. The tags are [Red] / [Black] instead of
+Black / White, and results read from Red's side: "1-0" is a Red win, "0-1"
+a Black win, "1/2-1/2" a draw and "*" an unfinished game.
+"""
+import re
+from .Board import Board, SQUARES, SQUARE_INDEX
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+_TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_MOVE_RE = re.compile(r'^(\d+)(?:[-x]\d+)+$')
+_MOVE_NUMBER_RE = re.compile(r'^\d+\.+$')
+
+
+# --- Square Numbering ---
+def rc_to_square(r, c):
+    """Converts a board (row, col) on a dark square to its PDN square number (1-32)."""
+    return 32 - SQUARE_INDEX[(r, c)]
+
+def square_to_rc(square):
+    """Converts a PDN square number (1-32) to a board (row, col)."""
+    if not 1 <= square <= 32:
+        raise ValueError(f"No square {square}")
+    return SQUARES[32 - square]
+
+
+class PDNGame:
+    """
+    A single game record: tags plus a list of turns. Each turn is the list of
+    squares the moving piece visits, e.g. [11, 15] or [15, 24, 31] for a double jump.
+    """
+
+    def __init__(self, tags=None, turns=None, result='*'):
+        self.tags = dict(tags or {})
+        self.turns = list(turns or [])
+        self.result = self.tags.get('Result', result)
+
+    def __repr__(self):
+        return f"PDNGame({self.tags.get('Red', '?')} vs {self.tags.get('Black', '?')}, {len(self.turns)} turns, {self.result})"
+
+    @classmethod
+    def from_hops(cls, turns, result='*', **tags):
+        """
+        Builds a record from GameController.turns, i.e. lists of
+        (piece_rc, target_rc, captured_rc) hops per turn.
+        Raises ValueError if a hop does not start where the previous hop of
+        its turn landed (a multi-jump continued by another piece).
+        """
+        pdn_turns = []
+        for hops in turns:
+            squares = [rc_to_square(*hops[0][0])]
+            for piece_rc, target_rc, _ in hops:
+                if rc_to_square(*piece_rc) != squares[-1]:
+                    raise ValueError(f"Hop {rc_to_square(*piece_rc)}-{rc_to_square(*target_rc)} does not "
+                                     f"continue turn {PDNGame.format_turn(squares, True)}")
+                squares.append(rc_to_square(*target_rc))
+            pdn_turns.append(squares)
+        tags.setdefault('Result', result)
+        return cls(tags, pdn_turns, result)
+
+    # --- Export ---
+    @staticmethod
+    def format_turn(squares, is_capture):
+        """Formats one turn as '9-14' or '22x15x6'."""
+        return ('x' if is_capture else '-').join(str(sq) for sq in squares)
+
+    def to_pdn(self):
+        """Returns the game as PDN text (tag pairs, a blank line, then movetext)."""
+        tags = {'Event': '?', 'Red': '?', 'Black': '?', 'GameType': '20'}
+        tags.update(self.tags)
+        tags['Result'] = self.result
+        lines = [f'[{key} "{value}"]' for key, value in tags.items()]
+        lines.append('')
+
+        tokens = []
+        for i, squares in enumerate(self.turns):
+            if i % 2 == 0:
+                tokens.append(f"{i // 2 + 1}.")
+            is_capture = abs(square_to_rc(squares[0])[0] - square_to_rc(squares[1])[0]) == 2
+            tokens.append(self.format_turn(squares, is_capture))
+        tokens.append(self.result)
+
+        # Wrap movetext at roughly 80 columns like most PDN writers do
+        line = ''
+        for token in tokens:
+            if line and len(line) + 1 + len(token) > 79:
+                lines.append(line)
+                line = token
+            else:
+                line = f"{line} {token}" if line else token
+        lines.append(line)
+        return '\n'.join(lines) + '\n\n'
+
+    # --- Replay ---
+    def replay(self, board=None):
+        """
+        Plays the game on a Board (the [FEN] tag position, if any, else the
+        starting position), yielding (board, color, hops) *before* each turn.
+        hops is the list of (piece_rc, target_rc, captured_piece) moves of that turn,
+        ready for Board.move_piece. The same Board object is reused and mutated.
+        """
+        if board is None:
+            board = Board.from_fen(self.tags['FEN']) if 'FEN' in self.tags else Board()
+        for squares in self.turns:
+            hops = expand_turn(board, squares)
+            yield board, board.current_turn, hops
+            for piece_rc, target_rc, captured_piece in hops:
+                board.move_piece(piece_rc, target_rc, captured_piece)
+
+
+def expand_turn(board, squares):
+    """
+    Converts a turn given as PDN squares into legal hops on board, filling in
+    intermediate landing squares when a capture is written short ('1x10').
+    Raises ValueError if the turn is not legal.
+    """
+    path = [square_to_rc(sq) for sq in squares]
+    piece = board.get_piece_at(*path[0])
+    if piece is None or piece.color != board.current_turn:
+        raise ValueError(f"No {board.current_turn} piece on square {squares[0]}")
+
+    # Simple move
+    if len(path) == 2 and abs(path[1][0] - path[0][0]) == 1:
+        if path[1] not in board.get_valid_moves(piece):
+            raise ValueError(f"Illegal move {squares[0]}-{squares[1]}")
+        return [(path[0], path[1], None)]
+
+    # Capture: search the jump chain through each written landing square
+    hops = _find_jump_chain(board.deep_copy(), path[0], path[1:])
+    if hops is None:
+        raise ValueError(f"Illegal capture {'x'.join(str(sq) for sq in squares)}")
+    return hops
+
+def _find_jump_chain(board, start_rc, waypoints):
+    """Depth-first search for a jump sequence from start_rc visiting every waypoint in order."""
+    if not waypoints:
+        return []
+    piece = board.get_piece_at(*start_rc)
+    for target_rc, captured_piece in board._check_jump_moves(piece).items():
+        remaining = waypoints[1:] if target_rc == waypoints[0] else waypoints
+        child = board.deep_copy()
+        must_multijump, _ = child.move_piece(start_rc, target_rc, child.get_piece_at(captured_piece.row, captured_piece.col))
+        if not remaining:
+            # The chain may only stop once no further jump is forced
+            if not must_multijump:
+                return [(start_rc, target_rc, captured_piece)]
+            continue
+        if not must_multijump:
+            continue
+        rest = _find_jump_chain(child, target_rc, remaining)
+        if rest is not None:
+            return [(start_rc, target_rc, captured_piece)] + rest
+    return None
+
+
+# --- Streaming Parser ---
+def _tokenize(lines):
+    """Yields ('tag', key, value) and ('token', text, None) items, skipping comments and variations."""
+    comment_depth = 0   # inside {...}
+    variation_depth = 0 # inside (...)
+    for line in lines:
+        if comment_depth == 0 and variation_depth == 0:
+            stripped = line.strip()
+            if stripped.startswith('%'):
+                continue # Escape/processing line
+            if stripped.startswith('['):
+                match = _TAG_RE.match(stripped)
+                if match:
+                    yield 'tag', match.group(1), match.group(2).replace('\\"', '"')
+                    continue
+
+        token = ''
+        for ch in line:
+            if comment_depth:
+                if ch == '}':
+                    comment_depth -= 1
+                continue
+            if ch == '{':
+                comment_depth += 1
+            elif ch == '(':
+                variation_depth += 1
+            elif ch == ')' and variation_depth:
+                variation_depth -= 1
+            elif variation_depth:
+                continue
+            elif ch.isspace():
+                if token:
+                    yield 'token', token, None
+                token = ''
+                continue
+            else:
+                token += ch
+                continue
+            # Comment/variation delimiters also end the current token
+            if token:
+                yield 'token', token, None
+            token = ''
+        if token and not comment_depth and not variation_depth:
+            yield 'token', token, None
+
+def iter_games(stream):
+    """
+    Lazily parses a (possibly huge) multi-game PDN stream, yielding PDNGame
+    objects one at a time. stream is any iterable of lines, e.g. an open file.
+    """
+    tags, turns, in_movetext = {}, [], False
+
+    for kind, text, value in _tokenize(stream):
+        if kind == 'tag':
+            if in_movetext:
+                # New header without a result token: close the previous game
+                yield PDNGame(tags, turns)
+                tags, turns, in_movetext = {}, [], False
+            tags[text] = value
+            continue
+
+        in_movetext = True
+        if text in RESULTS:
+            yield PDNGame(tags, turns, text)
+            tags, turns, in_movetext = {}, [], False
+            continue
+        if _MOVE_NUMBER_RE.match(text) or text.startswith('$'):
+            continue # Move numbers and NAGs
+
+        # Strip move strength annotations like '!', '?!' and move numbers glued to the move ('1.9-14')
+        move = text.rstrip('!?*').split('.')[-1]
+        if _MOVE_RE.match(move):
+            turns.append([int(sq) for sq in re.split(r'[-x]', move)])
+
+    if tags or turns:
+        yield PDNGame(tags, turns)
+
+def read_games(path):
+    """Opens a PDN file and yields its games one at a time."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from iter_games(f)
+
+def write_games(path, games, mode='a'):
+    """Appends (or writes, with mode='w') PDNGame records to a file."""
+    with open(path, mode, encoding='utf-8') as f:
+        for game in games:
+            f.write(game.to_pdn())
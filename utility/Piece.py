@@ -19,5 +19,10 @@ class Piece:
         self.king = True
         self.outline_color = (255, 255, 0) # King pieces have a yellow/gold outline
 
+    def unmake_king(self):
+        """Reverts a promotion (used when a kinging move is taken back)."""
+        self.king = False
+        self.outline_color = (255, 100, 100) if self.color == 'Red' else (100, 100, 100)
+
     def __repr__(self):
         return f'{self.color[0]}{"K" if self.king else ""}({self.row},{self.col})'
\ No newline at end of file
@@ -0,0 +1,225 @@
+# checkers/utility/profiler.py
+"""
+Optional timing and profiling instrumentation for the game loop and the AI.
+
+Everything goes through the module-level `profiler`, which does nothing until
+it is enabled, either with environment variables:
+
+    CHECKERS_PROFILE=profile_dir         (timings, written to profile_dir/timings.jsonl)
+    CHECKERS_PROFILE_SAMPLE_MS=5         (also sample the AI search every 5 ms)
+
+or with `python game.py --profile profile_dir [--sample-ms 5]`.
+
+When enabled it records, into an in-memory ring buffer and a JSON lines file:
+
+* one 'frame' record per main-loop iteration with the time spent waiting for
+  and handling events, in update() and in draw() (frames slower than
+  stutter_ms are flagged),
+* one 'ai_search' record per MinMaxAgent.runAI call,
+* one 'ai_move' record per AI move with the time from the start of the AI's
+  turn to the move being played (search plus the deliberate delay).
+
+The sampling profiler snapshots the searching thread's stack at a fixed
+interval during runAI and writes folded stacks (one 'frame;frame;... count'
+line per distinct stack) to profile_dir/ai_search.folded, the input format
+of flamegraph.pl, speedscope and similar tools.
+"""
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack on a background thread and counts folded stacks."""
+
+    def __init__(self, interval_ms=5):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter() # 'outer;...;inner' -> samples
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id=None, root=None):
+        """Starts sampling thread_id (default: the calling thread), prefixing stacks with root."""
+        target = thread_id if thread_id is not None else threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(target, root), name="checkers-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, target, root):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                if root:
+                    stack.append(root)
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        """The samples in folded-stack format, most frequent first."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """Ring buffer of timing records plus an optional JSON lines file and sampling profiler."""
+
+    def __init__(self, path=None, capacity=4096, sample_interval_ms=None, stutter_ms=50.0, enabled=True):
+        """
+        Args:
+            path: Directory for timings.jsonl and ai_search.folded (None: memory only).
+            capacity: Number of records kept in the ring buffer.
+            sample_interval_ms: Sample the AI search at this interval (None: no sampling).
+            stutter_ms: Frames slower than this are flagged as stutters.
+        """
+        self._lock = threading.Lock()
+        self._file = None
+        self._close_at_exit = False # Whether close() is registered with atexit yet
+        self._reset(path, capacity, sample_interval_ms, stutter_ms, enabled)
+
+    def _reset(self, path, capacity, sample_interval_ms, stutter_ms, enabled):
+        """Sets every setting and counter (see __init__) and opens the timings file."""
+        self.enabled = enabled
+        self.path = path
+        self.ring = deque(maxlen=capacity)
+        self.stutter_ms = stutter_ms
+        self.sampler = SamplingProfiler(sample_interval_ms) if sample_interval_ms else None
+        self.frames = 0
+        self.stutters = 0
+        self._start = time.perf_counter()
+        self._frame = {}
+        if enabled and path:
+            os.makedirs(path, exist_ok=True)
+            # Line buffered: the records just before a crash or kill are the interesting ones
+            self._file = open(os.path.join(path, 'timings.jsonl'), 'a', buffering=1, encoding='utf-8')
+            if not self._close_at_exit:
+                atexit.register(self.close)
+                self._close_at_exit = True
+
+    def __repr__(self):
+        if not self.enabled:
+            return "Profiler(disabled)"
+        return f"Profiler({self.path!r}, {self.frames} frames, {self.stutters} stutters)"
+
+    @classmethod
+    def from_environment(cls):
+        """Enabled by CHECKERS_PROFILE (directory) and/or CHECKERS_PROFILE_SAMPLE_MS; disabled otherwise."""
+        path = os.environ.get('CHECKERS_PROFILE')
+        sample_ms = os.environ.get('CHECKERS_PROFILE_SAMPLE_MS')
+        if not path and not sample_ms:
+            return cls(enabled=False)
+        return cls(path or None, sample_interval_ms=float(sample_ms) if sample_ms else None)
+
+    def configure(self, path=None, sample_interval_ms=None, capacity=4096, stutter_ms=50.0):
+        """Re-initializes this (usually the global) profiler as enabled, e.g. from a command-line flag."""
+        self.close()
+        with self._lock:
+            self._reset(path, capacity, sample_interval_ms, stutter_ms, True)
+
+    def close(self):
+        """Flushes the timings file and writes the folded AI stacks."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.sampler and self.sampler.stacks and self.path:
+            with open(os.path.join(self.path, 'ai_search.folded'), 'w', encoding='utf-8') as f:
+                f.write(self.sampler.folded())
+
+    # --- Recording ---
+    def record(self, kind, **fields):
+        """Appends one record to the ring buffer (and the file)."""
+        if not self.enabled:
+            return
+        fields['type'] = kind
+        fields['t'] = round(time.perf_counter() - self._start, 4)
+        with self._lock:
+            self.ring.append(fields)
+            if self._file is not None:
+                self._file.write(json.dumps(fields) + '\n')
+
+    @contextlib.contextmanager
+    def _timed_section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._frame[name] = self._frame.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def section(self, name):
+        """Context manager adding the time spent inside it to the current frame's `name` field."""
+        return self._timed_section(name) if self.enabled else _NULL_CONTEXT
+
+    def end_frame(self, **fields):
+        """Closes the current frame and records its section times."""
+        if not self.enabled:
+            return
+        frame = {f"{name}_ms": round(ms, 3) for name, ms in self._frame.items()}
+        frame['frame_ms'] = round(sum(ms for name, ms in self._frame.items() if name != 'wait'), 3)
+        if frame['frame_ms'] > self.stutter_ms:
+            frame['stutter'] = True
+            self.stutters += 1
+        self.frames += 1
+        self._frame = {}
+        self.record('frame', **frame, **fields)
+
+    @contextlib.contextmanager
+    def _ai_search(self, agent):
+        if self.sampler:
+            self.sampler.start(root=f"ai_search[{agent.color},depth={agent.max_depth}]")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            if self.sampler:
+                self.sampler.stop()
+            self.record('ai_search', color=agent.color, depth=agent.max_depth, ms=round(elapsed, 3))
+
+    def ai_search(self, agent):
+        """Context manager around one search: records its duration and samples it if enabled."""
+        return self._ai_search(agent) if self.enabled else _NULL_CONTEXT
+
+    # --- Reading ---
+    def snapshot(self, kind=None):
+        """A copy of the ring buffer, optionally only records of one type."""
+        with self._lock:
+            records = list(self.ring)
+        return [r for r in records if kind is None or r['type'] == kind]
+
+    def summary(self):
+        """Median / 95th percentile / max of every frame timing field and of the AI records."""
+        def stats(values):
+            values = sorted(values)
+            if not values:
+                return None
+            return {'count': len(values), 'p50': values[len(values) // 2],
+                    'p95': values[min(len(values) - 1, int(len(values) * 0.95))], 'max': values[-1]}
+
+        result = {}
+        frames = self.snapshot('frame')
+        for field in sorted({key for frame in frames for key in frame if key.endswith('_ms')}):
+            result[field] = stats([frame[field] for frame in frames if field in frame])
+        result['ai_search_ms'] = stats([r['ms'] for r in self.snapshot('ai_search')])
+        result['ai_move_latency_ms'] = stats([r['latency_ms'] for r in self.snapshot('ai_move')])
+        result['stutters'] = self.stutters
+        return result
+
+
+# The process-wide instrumentation; disabled unless the environment enables it
+profiler = Profiler.from_environment()
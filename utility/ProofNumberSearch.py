@@ -0,0 +1,247 @@
+# checkers/ai/proof_number.py
+"""
+Depth-first proof-number search (df-pn) for forced wins and losses.
+
+Alpha-beta only sees a forced win once the whole line fits in its depth.
+Proof-number search instead grows the tree towards the moves that look
+easiest to prove: every node carries a proof number (how many leaves still
+have to be shown won) and a disproof number (how many to show not won), and
+the search always expands the most-proving node. In positions with a forced
+result (king endgames, capture sequences) this typically settles the game
+with a fraction of the nodes alpha-beta needs at the corresponding depth.
+
+The search works on Board with make_move/unmake_move. Nodes where the
+attacker (the color the proof is for) is to move are OR nodes, the rest AND
+nodes; a multi-jump keeps the mover, so the node type comes from the side to
+move, not the ply. Only the jumping piece may continue a multi-jump, so those
+positions are keyed with it (Zobrist.JUMPING_KEYS). Proof and disproof numbers
+are kept in a bounded table keyed by Zobrist key; when it is full the entries
+that took the least work to compute are dropped (solved entries are kept while
+there are others to drop), which costs re-search but never correctness.
+
+Proven entries also keep the length of their proof (plies to the win along
+the proof tree), and solve() returns the winning move with the shortest one.
+Any proven move wins, but only following ever shorter proofs makes sure the
+win is actually reached instead of circling between won positions.
+
+The engine has no draw rule, so a repetition on the current path counts as
+"attacker does not win". Proofs are therefore always sound; a disproof only
+means the attacker could not force a win without repeating, so a LOSS is
+only reported when the opponent's win is proven.
+
+    solver = ProofNumberSearch(max_nodes=50_000)
+    result, move, nodes = solver.solve(board, 'Red')   # WIN / LOSS / UNKNOWN for Red
+    solver.solve(board, 'Red', max_nodes=2_000)        # A smaller budget for one call
+"""
+import time
+
+from .Board import SQUARE_INDEX
+from .Zobrist import JUMPING_KEYS
+
+WIN, LOSS, UNKNOWN = 'win', 'loss', 'unknown'
+INF = 1 << 30 # Proof / disproof number of a solved node
+BLACK_ATTACKS = 0x5DEECE66DA3B9C2F # Table key salt: proofs for Black are stored apart from proofs for Red
+
+class _BudgetExceeded(Exception):
+    """Raised inside the search when the node or time limit is reached."""
+
+
+class ProofNumberSearch:
+    """df-pn solver with a node/time budget and a memory-bounded transposition table."""
+
+    def __init__(self, max_nodes=50_000, time_limit=None, max_entries=200_000, max_plies=200):
+        """
+        Args:
+            max_nodes: Node budget per solve() call (both proof attempts together).
+            time_limit: Optional wall-clock budget per solve() call, in seconds.
+                        Node limits give the same answer on every machine; time limits do not.
+            max_entries: Size bound of the proof-number table (entries survive between calls).
+            max_plies: Lines longer than this are treated as not won.
+        """
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.max_entries = max_entries
+        self.max_plies = max_plies
+        self.table = {}  # key -> (proof number, disproof number, work, proof length)
+        self.nodes = 0   # Nodes searched by the last solve() call
+        self._node_limit = max_nodes
+        self._attacker = None
+        self._salt = 0
+        self._deadline = None
+        self._root_move = None # Proven move at the root of the last proof
+
+    def __repr__(self):
+        return f"ProofNumberSearch(max_nodes={self.max_nodes}, {len(self.table)} entries)"
+
+    # --- Public API ---
+    def solve(self, board, color=None, max_nodes=None):
+        """
+        Tries to prove a win for color (default: the side to move), then a win
+        for its opponent, within max_nodes (default: self.max_nodes). The board
+        is not modified.
+
+        Returns: (result, move, nodes) with result WIN / LOSS / UNKNOWN from
+            color's point of view, move the winning legal move of board (a
+            get_all_legal_moves tuple) when color is to move and wins, else None.
+        """
+        color = color or board.current_turn
+        opponent = 'Black' if color == 'Red' else 'Red'
+        self._start_budget(max_nodes)
+        result, move = UNKNOWN, None
+        if self._prove(board, color):
+            result = WIN
+            if board.current_turn == color and self._root_move:
+                move = next((m for m in board.get_all_legal_moves(color) if m[:2] == self._root_move[:2]), None)
+        elif self._prove(board, opponent):
+            result = LOSS
+        return result, move, self.nodes
+
+    def prove(self, board, attacker, max_nodes=None):
+        """
+        True if attacker can force a win, False if not (or if that cannot be
+        decided within the budget). The board is not modified.
+        """
+        self._start_budget(max_nodes)
+        return self._prove(board, attacker)
+
+    # --- Search ---
+    def _start_budget(self, max_nodes=None):
+        self.nodes = 0
+        self._node_limit = self.max_nodes if max_nodes is None else max_nodes
+        self._deadline = time.perf_counter() + self.time_limit if self.time_limit else None
+
+    def _prove(self, board, attacker):
+        self._attacker = attacker
+        self._salt = BLACK_ATTACKS if attacker == 'Black' else 0
+        self._root_move = None
+        try:
+            pn, _, _ = self._mid(board.deep_copy(), INF, INF, 0, set())
+        except _BudgetExceeded:
+            return False
+        return pn == 0
+
+    def _lookup(self, key):
+        entry = self.table.get(key ^ self._salt)
+        return (entry[0], entry[1]) if entry else (1, 1)
+
+    def _proof_length(self, key):
+        """Plies to the win along the stored proof of a proven position."""
+        return self.table[key ^ self._salt][3]
+
+    def _mid(self, board, pn_threshold, dn_threshold, ply, path, piece_rc=None):
+        """
+        Expands the node until its proof number reaches pn_threshold or its
+        disproof number dn_threshold. piece_rc is the piece that must continue
+        a multi-jump, if any.
+        Returns: (proof number, disproof number, path_dependent), where
+            path_dependent marks a disproof that relied on a repetition of the
+            current path; those are not stored, since from another path the
+            same position may well be won.
+        """
+        self.nodes += 1
+        if self.nodes > self._node_limit or (self._deadline and time.perf_counter() > self._deadline):
+            raise _BudgetExceeded()
+
+        key = _jump_key(board, piece_rc)
+        or_node = board.current_turn == self._attacker
+        moves = board.get_all_legal_moves(board.current_turn)
+        if piece_rc is not None:
+            moves = [move for move in moves if move[0] == piece_rc]
+        if not moves: # The side to move has lost
+            pn, dn = (INF, 0) if or_node else (0, INF)
+            self._store(key, pn, dn, 1, 0)
+            return pn, dn, False
+        if ply >= self.max_plies: # Too long to count as a forced win here
+            return INF, 0, True
+
+        # Child keys, to read their numbers from the table without replaying them,
+        # and this visit's path-dependent child results (None: read the table)
+        children = []
+        for move in moves:
+            must_multijump, _, undo = board.make_move(*move)
+            children.append((move, _jump_key(board, move[1] if must_multijump else None)))
+            board.unmake_move(undo)
+        local = [(INF, 0) if child_key in path else None for _, child_key in children] # Repetition: not won
+
+        start_nodes = self.nodes
+        path.add(key) # A budget abort leaves the private board copy and path behind
+        while True:
+            pn, dn, best, second, best_numbers = self._select(children, local, or_node)
+            if pn >= pn_threshold or dn >= dn_threshold:
+                break
+            child_pn, child_dn = best_numbers
+            if or_node:
+                child_pn_threshold = min(pn_threshold, second + 1)
+                child_dn_threshold = min(INF, dn_threshold - dn + child_dn)
+            else:
+                child_dn_threshold = min(dn_threshold, second + 1)
+                child_pn_threshold = min(INF, pn_threshold - pn + child_pn)
+            move = children[best][0]
+            must_multijump, _, undo = board.make_move(*move)
+            child_pn, child_dn, dependent = self._mid(board, child_pn_threshold, child_dn_threshold, ply + 1, path,
+                                                      move[1] if must_multijump else None)
+            board.unmake_move(undo)
+            local[best] = (child_pn, child_dn) if dependent else None
+        path.discard(key)
+
+        length = 0
+        if pn == 0:
+            # OR: the shortest proven child; AND: all children are proven, the defender picks the longest
+            lengths = [(self._proof_length(child_key), move) for move, child_key in children
+                       if self._lookup(child_key)[0] == 0]
+            length, move = min(lengths, key=lambda entry: entry[0]) if or_node else max(lengths, key=lambda entry: entry[0])
+            length += 1
+            if ply == 0 and or_node:
+                self._root_move = move
+        dependent = pn != 0 and any(numbers is not None for numbers in local)
+        if not (dependent and dn == 0):
+            self._store(key, pn, dn, self.nodes - start_nodes + 1, length)
+        return pn, dn, dependent
+
+    def _select(self, children, local, or_node):
+        """
+        Combines the children's numbers: an OR node needs one proven child
+        (pn = min, dn = sum), an AND node all of them (pn = sum, dn = min).
+        Returns (pn, dn, index of the most-proving child, the second smallest
+        deciding number, (pn, dn) of the chosen child).
+        """
+        total, smallest, second, best, best_numbers = 0, INF, INF, 0, (INF, INF)
+        for i, (_, child_key) in enumerate(children):
+            numbers = local[i] or self._lookup(child_key)
+            deciding, other = numbers if or_node else (numbers[1], numbers[0])
+            total = min(INF, total + other)
+            if deciding < smallest:
+                second, smallest, best, best_numbers = smallest, deciding, i, numbers
+            elif deciding < second:
+                second = deciding
+        if or_node:
+            return smallest, total, best, second, best_numbers
+        return total, smallest, best, second, best_numbers
+
+    def _store(self, key, pn, dn, work, length=0):
+        if len(self.table) >= self.max_entries:
+            self._collect()
+        self.table[key ^ self._salt] = (pn, dn, INF if pn == 0 or dn == 0 else work, length)
+
+    def _collect(self):
+        """
+        Drops the cheaper half of the unsolved entries (solved ones are kept).
+        If only solved entries are left, half of the table goes instead: the
+        proofs with the longest lines first (the least likely to be reached
+        again), then disproofs.
+        """
+        unsolved = sorted(entry[2] for entry in self.table.values() if entry[2] < INF)
+        if not unsolved:
+            ranked = sorted(self.table, key=lambda key: (self.table[key][0] == 0, self.table[key][3]), reverse=True)
+            for key in ranked[:len(ranked) // 2]:
+                del self.table[key]
+            return
+        cutoff = unsolved[len(unsolved) // 2]
+        self.table = {key: entry for key, entry in self.table.items() if entry[2] > cutoff}
+
+
+def _jump_key(board, piece_rc):
+    """Table key of board; in the middle of a multi-jump it includes the jumping piece."""
+    if piece_rc is None:
+        return board.zobrist_key
+    return board.zobrist_key ^ JUMPING_KEYS[SQUARE_INDEX[piece_rc]]
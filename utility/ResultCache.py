@@ -0,0 +1,228 @@
+# checkers/ai/result_cache.py
+"""
+Search-result caches shared between games.
+
+Unlike a transposition table, which holds intermediate nodes of one search,
+these caches store finished root answers: (position, agent configuration)
+-> (depth, score, best move). An agent that reaches a cached position at the
+same or a lower depth takes the answer without searching at all. Both
+classes expose the same get()/put()/stats() interface:
+
+* ResultCache: in-process LRU with a memory cap.
+* SharedResultCache: a fixed-size table in multiprocessing shared memory that
+  every worker process of a server attaches to by name. Buckets of 8 slots
+  are replaced least-recently-used first.
+"""
+import struct
+import sys
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+from .Board import SQUARE_INDEX, SQUARES
+
+NO_SQUARE = 0xFF
+_MASK64 = (1 << 64) - 1
+
+
+def _encode_move(move):
+    return (SQUARE_INDEX[move[0]], SQUARE_INDEX[move[1]]) if move else (NO_SQUARE, NO_SQUARE)
+
+def _decode_move(frm, to):
+    return (SQUARES[frm], SQUARES[to]) if frm != NO_SQUARE else None
+
+
+class ResultCache:
+    """In-process LRU cache of root search results, capped by (estimated) memory."""
+
+    ENTRY_BYTES = 200 # Rough cost of one OrderedDict entry with its key and value tuple
+
+    def __init__(self, max_mb=16):
+        self.max_entries = max(1, int(max_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        self._entries = OrderedDict() # key -> (depth, score, move)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, depth):
+        """Returns (score, move) if key was searched to at least depth, else None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < depth:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key, depth, score, move):
+        """Stores a result; a shallower result never replaces a deeper one."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > depth:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = (depth, score, move)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'capacity': self.max_entries,
+                'hits': self.hits, 'misses': self.misses, 'hit_rate': round(self.hit_rate(), 4)}
+
+
+class SharedResultCache:
+    """
+    Root search results in shared memory, usable from many processes at once.
+
+    The parent creates the cache (SharedResultCache(size_mb=...)) and passes
+    .name to its workers, which attach with SharedResultCache(name=...).
+    Slots are written locklessly with an XOR-folded key check (see
+    AnalysisCache), so a torn write reads back as a miss. Hit/miss counters
+    live in the shared header so stats() reports totals over all processes
+    (they are updated without locks and may undercount slightly).
+    """
+
+    _HEADER = struct.Struct('<4sIIIQQQ') # magic, slot count, ways, pad, tick, hits, misses
+    _HEADER_SIZE = 64
+    _SLOT = struct.Struct('<QdBBBxI')    # check, score, depth, from, to, last used tick
+    _DATA = struct.Struct('<QI')         # Folded into the check: score bits and depth/from/to
+    _MAGIC = b'CKRC'
+    WAYS = 8
+
+    def __init__(self, name=None, size_mb=16):
+        """
+        Args:
+            name: Attach to an existing cache created by another process.
+                  If None, a new shared memory block of size_mb is created.
+        """
+        self.owner = name is None
+        if self.owner:
+            slot_size = self._SLOT.size
+            buckets = max(1, (int(size_mb * 1024 * 1024) - self._HEADER_SIZE) // (slot_size * self.WAYS))
+            size = self._HEADER_SIZE + buckets * self.WAYS * slot_size
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+            self._HEADER.pack_into(self._shm.buf, 0, self._MAGIC, buckets * self.WAYS, self.WAYS, 0, 0, 0, 0)
+        else:
+            self._shm = _attach_untracked(name)
+
+        magic, slot_count, ways, _, _, _, _ = self._HEADER.unpack_from(self._shm.buf, 0)
+        if magic != self._MAGIC:
+            raise ValueError(f"Shared memory block {name!r} is not a result cache")
+        self.name = self._shm.name
+        self.slot_count = slot_count
+        self.bucket_count = slot_count // ways
+        self.local_hits = 0
+        self.local_misses = 0
+
+    def __repr__(self):
+        return f"SharedResultCache({self.name!r}, {self.slot_count} slots, hit rate {self.hit_rate():.1%})"
+
+    def close(self):
+        """Detaches; the creating process also frees the shared memory."""
+        if self._shm is None:
+            return
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    # --- Counters in the shared header ---
+    def _bump(self, field):
+        # field: 0 = tick, 1 = hits, 2 = misses (unsynchronized read-modify-write)
+        offset = 16 + 8 * field
+        value = struct.unpack_from('<Q', self._shm.buf, offset)[0] + 1
+        struct.pack_into('<Q', self._shm.buf, offset, value)
+        return value
+
+    def hit_rate(self):
+        _, _, _, _, _, hits, misses = self._HEADER.unpack_from(self._shm.buf, 0)
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def stats(self):
+        _, _, _, _, tick, hits, misses = self._HEADER.unpack_from(self._shm.buf, 0)
+        return {'name': self.name, 'capacity': self.slot_count, 'hits': hits, 'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                'local_hits': self.local_hits, 'local_misses': self.local_misses}
+
+    # --- Slot Access ---
+    def _bucket_offset(self, key):
+        return self._HEADER_SIZE + (key % self.bucket_count) * self.WAYS * self._SLOT.size
+
+    def _read(self, offset):
+        check, score, depth, frm, to, last_used = self._SLOT.unpack_from(self._shm.buf, offset)
+        if check == 0 and depth == 0:
+            return None
+        lo, hi = self._DATA.unpack_from(self._shm.buf, offset + 8)
+        return (check ^ lo ^ hi) & _MASK64, score, depth, frm, to, last_used
+
+    def _write(self, offset, key, depth, score, frm, to, tick):
+        self._SLOT.pack_into(self._shm.buf, offset, 0, score, min(depth, 255), frm, to, tick & 0xFFFFFFFF)
+        lo, hi = self._DATA.unpack_from(self._shm.buf, offset + 8)
+        struct.pack_into('<Q', self._shm.buf, offset, key ^ lo ^ hi)
+
+    def get(self, key, depth):
+        """Returns (score, move) if key was searched to at least depth, else None."""
+        key &= _MASK64
+        offset = self._bucket_offset(key)
+        slot_size = self._SLOT.size
+        for i in range(self.WAYS):
+            slot_offset = offset + i * slot_size
+            slot = self._read(slot_offset)
+            if slot and slot[0] == key and slot[2] >= depth:
+                # Refresh the LRU stamp; the tick is not folded into the check,
+                # so it can be rewritten on its own
+                struct.pack_into('<I', self._shm.buf, slot_offset + 20, self._bump(0) & 0xFFFFFFFF)
+                self._bump(1)
+                self.local_hits += 1
+                return slot[1], _decode_move(slot[3], slot[4])
+        self._bump(2)
+        self.local_misses += 1
+        return None
+
+    def put(self, key, depth, score, move):
+        """Stores a result, evicting the least recently used slot of the bucket."""
+        key &= _MASK64
+        offset = self._bucket_offset(key)
+        slot_size = self._SLOT.size
+        victim, oldest = None, None
+        for i in range(self.WAYS):
+            slot_offset = offset + i * slot_size
+            slot = self._read(slot_offset)
+            if slot is None:
+                victim = slot_offset
+                break
+            if slot[0] == key:
+                if slot[2] > depth:
+                    return # Keep the deeper result
+                victim = slot_offset
+                break
+            if oldest is None or slot[5] < oldest:
+                victim, oldest = slot_offset, slot[5]
+        frm, to = _encode_move(move)
+        self._write(victim, key, depth, score, frm, to, self._bump(0))
+
+
+def _attach_untracked(name):
+    """
+    Attaches to an existing shared memory block without registering it with
+    this process's resource tracker (which would otherwise unlink it when the
+    worker exits, or warn about a leak).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions always register; skip the registration instead of undoing
+    # it, since forked workers share the parent's tracker and an unregister
+    # there would drop the owner's own entry
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
@@ -0,0 +1,73 @@
+# checkers/game/symmetry.py
+"""
+Color-swap symmetry of checkers positions.
+
+Rotating the board by 180 degrees and swapping the colors of all pieces maps
+every position onto an equivalent one: Red men move up and Black men move
+down, so a rotated Red man moves exactly like a Black man, and the kinging
+rows swap too. With the side to move swapped as well, the mirrored position
+has the same game value for the mirrored side.
+
+On the 32 dark squares the rotation is simply square index i -> 31 - i
+(PDN square s -> 33 - s), so on bitmasks it is a 32-bit bit reversal.
+
+The canonical form of a position is the one with Red to move: Black-to-move
+positions are mirrored. Caches keyed by the canonical key store each pair of
+equivalent positions once, and moves read from them must be mapped back with
+mirror_move() when the probed position was mirrored.
+"""
+
+# Bit reversal of one byte, used to reverse 32-bit square masks
+_REVERSED_BYTE = [int(f"{b:08b}"[::-1], 2) for b in range(256)]
+
+def mirror_square(index):
+    """The square index (0-31) a square maps to under the 180 degree rotation."""
+    return 31 - index
+
+def mirror_rc(rc):
+    """(row, col) under the 180 degree rotation."""
+    return 7 - rc[0], 7 - rc[1]
+
+def mirror_move(move):
+    """Maps (piece_rc, target_rc) (or None) to the mirrored position."""
+    if not move:
+        return move
+    return mirror_rc(move[0]), mirror_rc(move[1])
+
+def mirror_mask(mask):
+    """Reverses a 32-bit square mask (bit i -> bit 31 - i)."""
+    return (_REVERSED_BYTE[mask & 0xFF] << 24 | _REVERSED_BYTE[(mask >> 8) & 0xFF] << 16
+            | _REVERSED_BYTE[(mask >> 16) & 0xFF] << 8 | _REVERSED_BYTE[(mask >> 24) & 0xFF])
+
+def mirror_masks(black, red, kings, black_to_move):
+    """Mirrors to_masks()-style masks: rotate, swap colors and the side to move."""
+    return mirror_mask(red), mirror_mask(black), mirror_mask(kings), not black_to_move
+
+def canonical_masks(black, red, kings, black_to_move):
+    """
+    Returns (black, red, kings, black_to_move, mirrored) of the canonical form
+    (always Red to move); mirrored tells whether the masks were transformed.
+    """
+    if black_to_move:
+        return (*mirror_masks(black, red, kings, black_to_move), True)
+    return black, red, kings, False, False
+
+def is_mirrored(board):
+    """True if board's canonical form is its mirror image (Black is to move)."""
+    return board.current_turn == 'Black'
+
+def canonical_key(board):
+    """
+    Zobrist key of board's canonical form, in O(1) (Board keeps the key of its
+    mirror image up to date next to its own key).
+    """
+    return board.mirror_key if board.current_turn == 'Black' else board.zobrist_key
+
+def canonical_board(board):
+    """Returns (canonical Board, mirrored)."""
+    from .Board import Board
+    black, red, kings = board.to_masks()
+    black, red, kings, black_to_move, mirrored = canonical_masks(black, red, kings, board.current_turn == 'Black')
+    if not mirrored:
+        return board.deep_copy(), False
+    return Board.from_masks(black, red, kings, 'Black' if black_to_move else 'Red'), True
@@ -1,29 +1,31 @@
-import pygame
-import sys
-import random
+from .Clock import MonotonicClock
 
 class Timer:
     """
-    A non-blocking timer class for Pygame that uses milliseconds (ms).
+    A non-blocking timer class that uses milliseconds (ms).
 
     This timer allows the main game loop to continue running (handling input, 
-    drawing, etc.) while waiting for a specific duration to pass.
+    drawing, etc.) while waiting for a specific duration to pass. It reads time
+    from a clock object instead of pygame, so it also works headless.
     """
 
-    def __init__(self, duration_ms: int):
+    def __init__(self, duration_ms: int, clock=None):
         """
         Initializes the timer with the target duration.
 
         Args:
             duration_ms: The length of the timer in milliseconds (e.g., 1000 for 1 second).
+            clock: Any object with a get_ticks() method returning milliseconds.
+                   Defaults to a MonotonicClock.
         """
         self.duration_ms = duration_ms
+        self.clock = clock if clock is not None else MonotonicClock()
         self.start_time = 0
         self.running = False
 
     def start(self):
         """Starts the timer by recording the current system time."""
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.clock.get_ticks()
         self.running = True
 
     def stop(self):
@@ -41,7 +43,7 @@ class Timer:
         if not self.running:
             return False
 
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         elapsed_time = current_time - self.start_time
 
         if elapsed_time >= self.duration_ms:
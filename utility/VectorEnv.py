@@ -0,0 +1,294 @@
+# checkers/ai/vector_env.py
+"""
+Batched checkers environment for self-play and training data generation.
+
+VectorEnv holds N games at once as NumPy arrays of 32-bit square masks (the
+same layout as Board.to_masks(): bit i is Board.SQUARES[i]) and generates
+legal moves, applies moves and detects finished games for all of them with
+array operations instead of one Board at a time.
+
+Actions are integers 0-127: from_square * 4 + direction, with directions
+(-1, -1), (-1, +1), (+1, -1), (+1, +1) in (row, col). Whether the move is a
+step or a jump follows from the position (captures are mandatory). The rules
+match Board: men move towards the opponent, a capture that can continue
+keeps the turn (the same piece must jump again) and a man is kinged on the
+far row when its move ends there.
+
+With canonical=True every game is presented from the side to move as if it
+were Red (Black-to-move positions are mirrored, see Symmetry), so one policy
+can play both colors. In that frame the mirror of action a is 127 - a.
+
+    env = VectorEnv(4096)
+    obs, info = env.reset(seed=0)
+    while True:
+        obs, reward, terminated, truncated, info = env.step(env.random_actions())
+
+Requires numpy (pip install numpy).
+"""
+import numpy as np
+
+from .Board import Board, SQUARES, SQUARE_INDEX
+
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+NO_SQUARE = 32 # Sentinel column: never occupied, never empty
+ACTIONS = 32 * 4
+
+RED_WINS, BLACK_WINS = 1, 2 # Values of info['winner'] (0: no winner)
+
+# NEIGHBOR[square, direction] / JUMP[square, direction]: the square one / two
+# steps away in that direction, or NO_SQUARE if it is off the board.
+NEIGHBOR = np.full((32, 4), NO_SQUARE, dtype=np.intp)
+JUMP = np.full((32, 4), NO_SQUARE, dtype=np.intp)
+for _i, (_r, _c) in enumerate(SQUARES):
+    for _d, (_dr, _dc) in enumerate(DIRECTIONS):
+        NEIGHBOR[_i, _d] = SQUARE_INDEX.get((_r + _dr, _c + _dc), NO_SQUARE)
+        JUMP[_i, _d] = SQUARE_INDEX.get((_r + 2 * _dr, _c + 2 * _dc), NO_SQUARE)
+
+# Bitboard form of NEIGHBOR: on the 32-square layout the index offset of a
+# neighbor only depends on the direction and the row parity, so "squares whose
+# neighbor in direction d is in mask" is two masked shifts per direction.
+# _SHIFTS[d] = ((source mask, offset), ...) for even and odd rows.
+_SHIFTS = []
+for _d in range(4):
+    _by_offset = {}
+    for _i in range(32):
+        if NEIGHBOR[_i, _d] != NO_SQUARE:
+            _by_offset.setdefault(int(NEIGHBOR[_i, _d]) - _i, []).append(_i)
+    _SHIFTS.append(tuple((np.uint32(sum(1 << i for i in squares)), offset)
+                         for offset, squares in _by_offset.items()))
+
+# Directions a man may use: Red moves up (row - 1), Black moves down
+_FORWARD = np.array([[True, True, False, False],   # Red
+                     [False, False, True, True]])  # Black
+_ALL = np.uint32(0xFFFFFFFF)
+
+_BITS = np.arange(32, dtype=np.uint32)
+_SQUARE_BITS = np.append(np.left_shift(np.uint32(1), _BITS), np.uint32(0)) # NO_SQUARE -> no bit
+_START_BLACK = np.uint32(0x00000FFF) # Rows 0-2 (PDN squares 21-32)
+_START_RED = np.uint32(0xFFF00000)   # Rows 5-7 (PDN squares 1-12)
+_RED_KING_ROW = np.uint32(0x0000000F)   # Row 0
+_BLACK_KING_ROW = np.uint32(0xF0000000) # Row 7
+
+
+def _from_neighbor(mask, d):
+    """Bitboard of the squares whose neighbor in direction d is in mask."""
+    result = np.zeros_like(mask)
+    for sources, offset in _SHIFTS[d]:
+        result |= ((mask >> np.uint32(offset)) if offset > 0 else (mask << np.uint32(-offset))) & sources
+    return result
+
+def _movers(own, opponent, empty, may_move):
+    """
+    Per direction: bitboards of own pieces that can jump / step that way.
+    may_move[d] masks the pieces allowed to use direction d (kings, or all men forwards).
+    """
+    jumps, steps = [], []
+    for d in range(4):
+        pieces = own & may_move[d]
+        free = _from_neighbor(empty, d)
+        jumps.append(pieces & _from_neighbor(opponent & free, d))
+        steps.append(pieces & free)
+    return jumps, steps
+
+def _planes(mask):
+    """(N,) uint32 masks -> (N, 33) bool planes; column NO_SQUARE is always False."""
+    planes = np.zeros((mask.shape[0], 33), dtype=bool)
+    planes[:, :32] = (mask[:, None] >> _BITS) & 1
+    return planes
+
+
+class VectorEnv:
+    """N independent checkers games stepped together (gymnasium-style reset/step)."""
+
+    def __init__(self, num_envs, max_turns=200, canonical=False, autoreset=True, seed=None):
+        """
+        Args:
+            num_envs: Number of games in the batch.
+            max_turns: Games still running after this many turns are truncated (draw).
+            canonical: Present observations, masks and actions from the side to move as Red.
+            autoreset: Restart finished games inside step() (their last observation
+                       is returned in info['final_observation']).
+            seed: Seed for random_actions().
+        """
+        self.num_envs = num_envs
+        self.max_turns = max_turns
+        self.canonical = canonical
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+
+        self.black = np.zeros(num_envs, dtype=np.uint32)
+        self.red = np.zeros(num_envs, dtype=np.uint32)
+        self.kings = np.zeros(num_envs, dtype=np.uint32)
+        self.black_to_move = np.zeros(num_envs, dtype=bool)
+        self.jumping = np.full(num_envs, -1, dtype=np.int8) # Square that must continue a multi-jump
+        self.turns = np.zeros(num_envs, dtype=np.int32)
+        self.done = np.zeros(num_envs, dtype=bool)
+        self.reset()
+
+    def __repr__(self):
+        return f"VectorEnv({self.num_envs} games, {int(self.done.sum())} finished)"
+
+    # --- Gym API ---
+    def reset(self, seed=None, indices=None):
+        """Puts all games (or the given indices) back to the starting position."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        if indices is None:
+            indices = slice(None)
+        self.black[indices] = _START_BLACK
+        self.red[indices] = _START_RED
+        self.kings[indices] = 0
+        self.black_to_move[indices] = False
+        self.jumping[indices] = -1
+        self.turns[indices] = 0
+        self.done[indices] = False
+        self._generate_moves()
+        return self.observe(), {'legal_mask': self.legal_mask()}
+
+    def step(self, actions):
+        """
+        Plays one action (one hop of a multi-jump) in every running game.
+        Actions of finished games are ignored.
+
+        Returns: (observation, reward, terminated, truncated, info) where
+            reward is +1 for games the moving side just won, else 0,
+            info['winner'] is RED_WINS / BLACK_WINS / 0 per game,
+            info['legal_mask'] is the mask for the next step.
+        Raises: ValueError if an action is illegal in a running game.
+        """
+        actions = np.asarray(actions, dtype=np.intp).reshape(self.num_envs)
+        if self.canonical:
+            actions = np.where(self.black_to_move, ACTIONS - 1 - actions, actions)
+        index = np.arange(self.num_envs)
+        active = ~self.done
+        illegal = active & ~self._mask.reshape(self.num_envs, ACTIONS)[index, np.clip(actions, 0, ACTIONS - 1)]
+        illegal |= active & ((actions < 0) | (actions >= ACTIONS))
+        if illegal.any():
+            raise ValueError(f"Illegal actions in games {np.flatnonzero(illegal)[:10].tolist()}")
+
+        square, direction = actions // 4 % 32, actions % 4
+        capture = active & self._capture
+        target = np.where(capture, JUMP[square, direction], NEIGHBOR[square, direction])
+        middle = NEIGHBOR[square, direction]
+        mover_black = self.black_to_move.copy()
+
+        # Move the piece (and its king flag); finished games get an empty move
+        from_bit = np.where(active, _SQUARE_BITS[square], 0).astype(np.uint32)
+        to_bit = np.where(active, _SQUARE_BITS[np.minimum(target, 31)], 0).astype(np.uint32)
+        move = from_bit | to_bit
+        self.black ^= np.where(mover_black, move, 0).astype(np.uint32)
+        self.red ^= np.where(~mover_black, move, 0).astype(np.uint32)
+        was_king = (self.kings & from_bit) != 0
+        self.kings ^= np.where(was_king, move, 0).astype(np.uint32)
+
+        # Remove the jumped piece
+        middle_bit = np.where(capture, _SQUARE_BITS[np.minimum(middle, 31)], 0).astype(np.uint32)
+        self.black &= ~np.where(~mover_black, middle_bit, 0).astype(np.uint32)
+        self.red &= ~np.where(mover_black, middle_bit, 0).astype(np.uint32)
+        self.kings &= ~middle_bit
+
+        # A capture continues if the same piece (still un-kinged) can jump again
+        opponent = np.where(mover_black, self.red, self.black)
+        empty = ~(self.black | self.red)
+        may_move = self._may_move(mover_black, np.where(was_king, _ALL, 0).astype(np.uint32))
+        jumps, _ = _movers(to_bit, opponent, empty, may_move)
+        continues = capture & ((jumps[0] | jumps[1] | jumps[2] | jumps[3]) != 0)
+
+        # Otherwise the turn ends: kinging, then the other side moves
+        ends = active & ~continues
+        king_row = np.where(mover_black, _BLACK_KING_ROW, _RED_KING_ROW)
+        self.kings |= np.where(ends & ~was_king & ((to_bit & king_row) != 0), to_bit, 0).astype(np.uint32)
+        self.black_to_move ^= ends
+        self.turns += ends
+        self.jumping = np.where(continues, target, -1).astype(np.int8)
+        self._generate_moves()
+
+        # The side to move loses when it has no legal move (or no pieces left)
+        terminated = ends & ~self._mask.any(axis=(1, 2))
+        truncated = ends & ~terminated & (self.turns >= self.max_turns)
+        reward = terminated.astype(np.float32)
+        winner = np.where(terminated, np.where(mover_black, BLACK_WINS, RED_WINS), 0).astype(np.int8)
+        self.done |= terminated | truncated
+
+        info = {'winner': winner}
+        finished = terminated | truncated
+        if self.autoreset and finished.any():
+            info['final_observation'] = self.observe()[finished]
+            self.reset(indices=np.flatnonzero(finished))
+        info['legal_mask'] = self.legal_mask()
+        return self.observe(), reward, terminated, truncated, info
+
+    # --- Moves ---
+    @staticmethod
+    def _may_move(black_to_move, kings):
+        """Per direction: the squares whose pieces may move that way (kings, plus men forwards)."""
+        forward = _FORWARD[black_to_move.astype(np.intp)]
+        return [kings | np.where(forward[:, d], _ALL, 0).astype(np.uint32) for d in range(4)]
+
+    def _generate_moves(self):
+        """Computes the legal moves (N, 32, 4) for the side to move of every game."""
+        side = self.black_to_move
+        own = np.where(side, self.black, self.red)
+        opponent = np.where(side, self.red, self.black)
+        empty = ~(self.black | self.red)
+        jumps, steps = _movers(own, opponent, empty, self._may_move(side, self.kings))
+
+        # In a multi-jump only the jumping piece may move
+        only = np.where(self.jumping >= 0, _SQUARE_BITS[self.jumping.astype(np.intp) % 33], _ALL).astype(np.uint32)
+        jumps = [j & only for j in jumps]
+
+        self._capture = (jumps[0] | jumps[1] | jumps[2] | jumps[3]) != 0
+        movers = np.where(self._capture, np.stack(jumps), np.stack(steps)) # (4, N)
+        movers[:, self.done] = 0
+        self._mask = ((movers.T[:, None, :] >> _BITS[None, :, None]) & 1).astype(bool) # (N, 32, 4)
+
+    def legal_mask(self):
+        """(N, 128) bool mask of legal actions (all False for finished games)."""
+        mask = self._mask.reshape(self.num_envs, ACTIONS)
+        if self.canonical:
+            mask = np.where(self.black_to_move[:, None], mask[:, ::-1], mask)
+        return mask
+
+    def random_actions(self):
+        """One uniformly random legal action per game (0 for finished games)."""
+        mask = self.legal_mask()
+        weights = 1 - self.rng.random(mask.shape, dtype=np.float32) # In (0, 1], so legal beats illegal
+        return np.argmax(mask * weights, axis=1)
+
+    # --- Observations ---
+    def observe(self):
+        """
+        (N, 4, 32) uint8 planes: red men, red kings, black men, black kings.
+        In canonical mode the side to move is always shown as Red.
+        """
+        red, black, kings = _planes(self.red)[:, :32], _planes(self.black)[:, :32], _planes(self.kings)[:, :32]
+        if self.canonical:
+            mirrored = self.black_to_move[:, None]
+            red, black = np.where(mirrored, black[:, ::-1], red), np.where(mirrored, red[:, ::-1], black)
+            kings = np.where(mirrored, kings[:, ::-1], kings)
+        obs = np.stack([red & ~kings, red & kings, black & ~kings, black & kings], axis=1)
+        return obs.astype(np.uint8)
+
+    # --- Interop with Board ---
+    def to_board(self, n):
+        """Game n as a Board (a pending multi-jump is not represented)."""
+        return Board.from_masks(int(self.black[n]), int(self.red[n]), int(self.kings[n]),
+                                'Black' if self.black_to_move[n] else 'Red')
+
+    def set_board(self, n, board):
+        """Loads a Board position into game n."""
+        self.black[n], self.red[n], self.kings[n] = board.to_masks()
+        self.black_to_move[n] = board.current_turn == 'Black'
+        self.jumping[n] = -1
+        self.turns[n] = 0
+        self.done[n] = False
+        self._generate_moves()
+
+    def move_of(self, n, action):
+        """(piece_rc, target_rc) of action in game n, taking the frame and captures into account."""
+        action = int(action)
+        if self.canonical and self.black_to_move[n]:
+            action = ACTIONS - 1 - action
+        square, direction = divmod(action, 4)
+        target = JUMP[square, direction] if self._capture[n] else NEIGHBOR[square, direction]
+        return SQUARES[square], SQUARES[target]
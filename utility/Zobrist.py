@@ -0,0 +1,49 @@
+# checkers/game/zobrist.py
+"""
+Zobrist hashing for checkers positions.
+
+Every (piece kind, square) pair gets a fixed random 64-bit number and the key
+of a position is the XOR of the numbers of all pieces on the board (plus one
+extra number when Black is to move). Moving a piece only needs a few XORs, so
+Board keeps its key up to date incrementally. The table is generated from a
+fixed seed so keys are identical across processes and sessions, which the
+persistent and shared caches rely on.
+"""
+import random
+
+_rng = random.Random(0x5EED_C4EC)
+
+# PIECE_KEYS[(color, king)][square_index] for the 32 dark squares (Board.SQUARES order)
+PIECE_KEYS = {
+    (color, king): [_rng.getrandbits(64) for _ in range(32)]
+    for color in ('Red', 'Black') for king in (False, True)
+}
+BLACK_TO_MOVE = _rng.getrandbits(64)
+
+# MIRROR_KEYS[(color, king)][i] is the number of the piece's mirror image (the
+# other color on square 31 - i, see Symmetry). Board XORs these next to
+# PIECE_KEYS to keep the key of its mirrored position up to date as well.
+MIRROR_KEYS = {
+    (color, king): [PIECE_KEYS[('Black' if color == 'Red' else 'Red', king)][31 - i] for i in range(32)]
+    for color in ('Red', 'Black') for king in (False, True)
+}
+
+# JUMPING_KEYS[i] marks a position in the middle of a multi-jump, where only
+# the piece on square i may move (see MinMaxAgent._cache_key). Drawn after the
+# piece keys, so those and the caches persisted with them are unchanged.
+JUMPING_KEYS = [_rng.getrandbits(64) for _ in range(32)]
+
+def piece_key(color, king, square_index):
+    """The Zobrist number of one piece on one square."""
+    return PIECE_KEYS[(color, king)][square_index]
+
+def hash_masks(black, red, kings, black_to_move):
+    """Computes a full key from to_masks()-style square bitmasks."""
+    key = BLACK_TO_MOVE if black_to_move else 0
+    for i in range(32):
+        bit = 1 << i
+        if black & bit:
+            key ^= PIECE_KEYS[('Black', bool(kings & bit))][i]
+        elif red & bit:
+            key ^= PIECE_KEYS[('Red', bool(kings & bit))][i]
+    return key